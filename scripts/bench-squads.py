@@ -0,0 +1,381 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the squad scraper pipeline.
+
+Runs each stage of scripts/scrape-squads.py over a frozen corpus of team
+pages and reports wall time, pages/sec, rows/sec and peak memory per stage.
+No network is needed: the corpus ships as scripts/bench-corpus.tar.gz, one
+<page>.html per team (the layout .squad-cache used before it was compressed).
+
+Usage:
+  python scripts/bench-squads.py                      # Run and print a table
+  python scripts/bench-squads.py --json out.json      # Also save the results
+  python scripts/bench-squads.py --compare base.json  # Exit 1 on >10% regressions
+  python scripts/bench-squads.py --repeat 10          # Timing rounds per stage
+  python scripts/bench-squads.py --record             # Freeze .squad-cache as the corpus
+  python scripts/bench-squads.py --synthesize         # Rebuild the corpus from squads.json
+
+Timings are best-of-N so runs on the same machine are comparable across
+commits. Peak memory is measured in a separate traced pass so tracemalloc
+overhead does not leak into the timings.
+"""
+
+import copy
+import gzip
+import hashlib
+import html as htmllib
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tarfile
+import time
+import tracemalloc
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+CORPUS_PATH = os.path.join(SCRIPT_DIR, "bench-corpus.tar.gz")
+SQUADS_PATH = os.path.join(PROJECT_DIR, "src", "data", "squads.json")
+DEFAULT_REPEAT = 5
+REGRESSION_THRESHOLD = 0.10  # Fractional slowdown that --compare treats as a regression
+
+
+def load_scraper():
+    """Import scripts/scrape-squads.py (not importable by name: it has a hyphen)."""
+    path = os.path.join(SCRIPT_DIR, "scrape-squads.py")
+    spec = importlib.util.spec_from_file_location("scrape_squads", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["scrape_squads"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+scraper = load_scraper()
+
+
+# ── Corpus ──────────────────────────────────────────────────────────────────
+
+def page_filename(wiki_page):
+    """Corpus member name (the page cache's original <page>.html layout)."""
+    return os.path.basename(scraper.legacy_cache_paths(wiki_page)[0])
+
+
+def write_corpus(pages):
+    """Write {filename: html} as a byte-for-byte reproducible tar.gz."""
+    buf = io.BytesIO()
+    with gzip.GzipFile(fileobj=buf, mode="wb", mtime=0) as gz:
+        with tarfile.open(fileobj=gz, mode="w", format=tarfile.USTAR_FORMAT) as tar:
+            for name in sorted(pages):
+                data = pages[name].encode("utf-8")
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mode = 0o644
+                tar.addfile(info, io.BytesIO(data))
+    with open(CORPUS_PATH, "wb") as f:
+        f.write(buf.getvalue())
+    print(f"✓ Wrote {len(pages)} pages to {CORPUS_PATH} ({len(buf.getvalue()) / 1e3:.0f} KB)")
+
+
+def load_corpus():
+    """Return (pages, digest): {team_id: html} in WIKI_PAGES order, and its hash."""
+    with open(CORPUS_PATH, "rb") as f:
+        raw = f.read()
+    files = {}
+    with tarfile.open(fileobj=io.BytesIO(raw), mode="r:gz") as tar:
+        for member in tar.getmembers():
+            if member.isfile() and member.name.endswith(".html"):
+                files[member.name] = tar.extractfile(member).read().decode("utf-8")
+    pages = {}
+    for team_id, wiki_page in scraper.WIKI_PAGES.items():
+        name = page_filename(wiki_page)
+        if name in files:
+            pages[team_id] = files[name]
+    return pages, hashlib.sha256(raw).hexdigest()
+
+
+def record_corpus(cache_dir):
+    """Freeze the full-page HTML currently in ``cache_dir`` as the corpus."""
+    scraper.CACHE_DIR = os.path.abspath(cache_dir)
+    pages = {}
+    for wiki_page in scraper.WIKI_PAGES.values():
+        html = scraper.read_cached_page(wiki_page, kinds=("page",))
+        if html is not None:
+            pages[page_filename(wiki_page)] = html
+    missing = len(scraper.WIKI_PAGES) - len(pages)
+    if missing:
+        print(f"⚠ {missing} pages missing from {cache_dir}; run scrape-squads.py first for a full corpus")
+    write_corpus(pages)
+
+
+_MONTHS = ["January", "February", "March", "April", "May", "June", "July",
+           "August", "September", "October", "November", "December"]
+_POSITIONS = {"GK": "GK", "DEF": "DF", "MID": "MF", "FWD": "FW"}
+_PROSE = (
+    '<p>The team played its first official match in the early twentieth century and '
+    'has since appeared at several <a href="/wiki/FIFA_World_Cup" title="FIFA World Cup">'
+    'World Cup</a> finals.<sup id="cite_ref-1" class="reference"><a href="#cite_note-1">'
+    '&#91;1&#93;</a></sup> Its home matches are played at a number of stadiums &amp; '
+    'training takes place at the national football centre.</p>\n'
+)
+
+
+def _synthetic_row(p, rng, recent):
+    e = htmllib.escape
+    cells = []
+    if not recent:
+        cells.append(f'<td style="text-align:right;">{p.get("number", "")}</td>')
+    cells.append(f'<td style="text-align:center;"><a href="/wiki/Position" title="Position">'
+                 f'{_POSITIONS.get(p["position"], "MF")}</a></td>')
+    note = '<sup id="cite_ref-2" class="reference"><a href="#cite_note-2">&#91;2&#93;</a></sup>' \
+        if rng.random() < 0.1 else ""
+    cells.append(f'<th scope="row" style="text-align:left;"><span data-sort-value="{e(p["name"])}">'
+                 f'<a href="/wiki/{e(p["name"]).replace(" ", "_")}">{e(p["name"])}</a></span>{note}</th>')
+    dob = p.get("dob")
+    if dob:
+        cells.append(f'<td style="text-align:left;"><span style="display:none"> (<span class="bday">{dob}</span>)'
+                     f'</span>{int(dob[8:])} {_MONTHS[int(dob[5:7]) - 1]} {dob[:4]}'
+                     f'<span class="noprint ForceAgeToShow"> (age&nbsp;{p.get("age")})</span></td>')
+    else:
+        cells.append("<td></td>")
+    cells.append(f'<td style="text-align:right;">{p.get("caps", 0):,}</td>'
+                 f'<td style="text-align:right;">{p.get("goals", 0)}</td>')
+    cells.append('<td style="text-align:left;"><span class="flagicon"><span class="mw-image-border" '
+                 'typeof="mw:File"><a href="/wiki/Club" title="Club"><img alt="" src="//upload.example/flag.png" '
+                 f'width="23" height="15" /></a></span></span>&nbsp;<a href="/wiki/Club">{e(p.get("club") or "")}</a></td>')
+    if recent:
+        injured = "<sup>INJ</sup>" if rng.random() < 0.1 else ""
+        cells.append(f'<td>v.&nbsp;<a href="/wiki/Opponent">Opponent</a>, {rng.randint(1, 28)} '
+                     f'{rng.choice(_MONTHS)} {rng.choice([2024, 2025, 2026])}{injured}</td>')
+    return '<tr class="nat-fs-player">' + "".join(cells) + "</tr>\n"
+
+
+def synthesize_corpus():
+    """Build a corpus in Wikipedia's squad-table markup from squads.json.
+
+    Used when no recorded pages are available. Pages are padded with prose
+    before and after the squad sections so extract_table() scans a
+    realistic amount of HTML.
+    """
+    with open(SQUADS_PATH) as f:
+        squads = json.load(f)
+    rng = random.Random(2026)
+    header = ('<tr><th scope="col">No.</th><th scope="col">Pos.</th><th scope="col">Player</th>'
+              '<th scope="col">Date of birth (age)</th><th scope="col">Caps</th><th scope="col">Goals</th>'
+              '<th scope="col">Club</th></tr>\n')
+    recent_header = ('<tr><th scope="col">Pos.</th><th scope="col">Player</th>'
+                     '<th scope="col">Date of birth (age)</th><th scope="col">Caps</th><th scope="col">Goals</th>'
+                     '<th scope="col">Club</th><th scope="col">Latest call-up</th></tr>\n')
+    pages = {}
+    for team_id, wiki_page in scraper.WIKI_PAGES.items():
+        players = squads.get(team_id, {}).get("players", [])
+        core = [p for p in players if p.get("tier") == "core"]
+        others = [p for p in players if p.get("tier") != "core"]
+        doc = [
+            '<!DOCTYPE html>\n<html><body><div class="mw-parser-output">\n',
+            _PROSE * 250,
+            '<div class="mw-heading mw-heading3"><h3 id="Current_squad">Current squad</h3></div>\n',
+            _PROSE,
+            '<table class="wikitable football-squad nogrid" style="background:transparent; width:100%;">\n<tbody>',
+            header,
+            *(_synthetic_row(p, rng, False) for p in core),
+            "</tbody></table>\n",
+            '<div class="mw-heading mw-heading3"><h3 id="Recent_call-ups">Recent call-ups</h3></div>\n',
+            _PROSE,
+            '<table class="wikitable football-squad nogrid">\n<tbody>',
+            recent_header,
+            *(_synthetic_row(p, rng, True) for p in others),
+            '<tr><td colspan="7"><sup>INJ</sup> Withdrew due to injury</td></tr>\n',
+            "</tbody></table>\n",
+            _PROSE * 500,
+            "</div></body></html>\n",
+        ]
+        pages[page_filename(wiki_page)] = "".join(doc)
+    write_corpus(pages)
+
+
+# ── Stages ──────────────────────────────────────────────────────────────────
+
+def build_workload(pages, exclusions):
+    """Precompute the inputs each stage needs, outside any timed region."""
+    tables = {t: scraper.find_squad_tables(html) for t, html in pages.items()}
+    flat_tables = [tbl for pair in tables.values() for tbl in pair if tbl]
+    parsed = {
+        t: tuple(scraper.parse_squad_table(tbl) if tbl else [] for tbl in pair)
+        for t, pair in tables.items()
+    }
+    rows = sum(max(0, len(scraper.html_table_rows(tbl)) - 1) for tbl in flat_tables)
+    excluded = {t: scraper.excluded_keys(exclusions, t) for t in pages}
+    squads = {
+        t: {
+            "lastUpdated": "2026-01-01",
+            "status": "preliminary",
+            "manager": scraper.MANAGERS.get(t),
+            "players": scraper.merge_players(copy.deepcopy(cur), copy.deepcopy(rec), excluded[t]),
+        }
+        for t, (cur, rec) in parsed.items()
+    }
+    return {
+        "pages": pages,
+        "tables": flat_tables,
+        "parsed": parsed,
+        "excluded": excluded,
+        "squads": squads,
+        "rows": rows,
+    }
+
+
+def stage_definitions(w):
+    """Return [(name, setup, run)]; setup() builds fresh input, run(input) is timed."""
+    pages = list(w["pages"].values())
+    raw_pages = [html.encode("utf-8") for html in pages]
+    chunk = scraper.CACHE_READ_CHUNK
+
+    def stream_scan(body):
+        decoder = scraper.codecs.getincrementaldecoder("utf-8")(errors="replace")
+        return scraper.scan_text_chunks(decoder.decode(body[i : i + chunk]) for i in range(0, len(body), chunk))
+
+    def merge_inputs():
+        return [(copy.deepcopy(cur), copy.deepcopy(rec), w["excluded"][t]) for t, (cur, rec) in w["parsed"].items()]
+
+    return [
+        ("extract_table", lambda: pages,
+         lambda items: [scraper.find_squad_tables(html) for html in items]),
+        ("decode + extract_table", lambda: raw_pages,
+         lambda items: [scraper.find_squad_tables(body.decode("utf-8")) for body in items]),
+        ("stream extract (early exit)", lambda: raw_pages,
+         lambda items: [stream_scan(body) for body in items]),
+        ("tokenize (WikiTableParser)", lambda: w["tables"],
+         lambda items: [scraper.html_table_rows(t) for t in items]),
+        ("tokenize (fast)", lambda: w["tables"],
+         lambda items: [scraper.fast_table_rows(t) for t in items]),
+        ("parse_squad_table", lambda: w["tables"],
+         lambda items: [scraper.parse_squad_table(t) for t in items]),
+        ("merge/sort/cap", merge_inputs,
+         lambda items: [scraper.merge_players(*args) for args in items]),
+        ("serialize squads.json", lambda: w["squads"],
+         lambda squads: scraper.serialize_squads(squads)),
+    ]
+
+
+def measure(setup, run, repeat):
+    """Best and median seconds over ``repeat`` rounds, plus traced peak bytes."""
+    times = []
+    for _ in range(repeat):
+        arg = setup()
+        started = time.perf_counter()
+        run(arg)
+        times.append(time.perf_counter() - started)
+    arg = setup()
+    tracemalloc.start()
+    run(arg)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(times), statistics.median(times), peak
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_DIR,
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(repeat):
+    pages, digest = load_corpus()
+    workload = build_workload(pages, scraper.load_exclusions())
+    n_pages, n_rows = len(pages), workload["rows"]
+    corpus_bytes = sum(len(h.encode("utf-8")) for h in pages.values())
+
+    print(f"Squad pipeline benchmark — {n_pages} pages, {n_rows} rows, "
+          f"{corpus_bytes / 1e6:.1f} MB corpus, best of {repeat}")
+    print()
+    print(f"  {'stage':28s} {'best ms':>9s} {'median ms':>10s} {'pages/s':>9s} {'rows/s':>10s} {'peak KB':>9s}")
+
+    stages = {}
+    for name, setup, run in stage_definitions(workload):
+        best, median, peak = measure(setup, run, repeat)
+        stages[name] = {
+            "bestSeconds": round(best, 6),
+            "medianSeconds": round(median, 6),
+            "pagesPerSecond": round(n_pages / best, 1) if best else None,
+            "rowsPerSecond": round(n_rows / best, 1) if best else None,
+            "peakBytes": peak,
+        }
+        print(f"  {name:28s} {best * 1e3:9.2f} {median * 1e3:10.2f} {n_pages / best:9.0f} "
+              f"{n_rows / best:10.0f} {peak / 1e3:9.0f}")
+
+    return {
+        "revision": git_revision(),
+        "scraperFingerprint": scraper.SOURCE_FINGERPRINT,
+        "corpusSha256": digest,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "repeat": repeat,
+        "pages": n_pages,
+        "rows": n_rows,
+        "corpusBytes": corpus_bytes,
+        "stages": stages,
+    }
+
+
+def compare_results(results, base_path, threshold=REGRESSION_THRESHOLD):
+    """Print per-stage change against a saved run. Returns True if no regressions."""
+    with open(base_path) as f:
+        base = json.load(f)
+    print(f"\nCompared with {base_path} (revision {base.get('revision') or '?'})")
+    if base.get("corpusSha256") != results["corpusSha256"]:
+        print("  ⚠ Different corpus; timings are not directly comparable")
+    if base.get("platform") != results["platform"]:
+        print("  ⚠ Different platform; timings are not directly comparable")
+
+    regressions = 0
+    for name, stage in results["stages"].items():
+        before = base.get("stages", {}).get(name)
+        if not before or not before.get("bestSeconds"):
+            print(f"  {name:28s}   (new)")
+            continue
+        change = stage["bestSeconds"] / before["bestSeconds"] - 1
+        flag = ""
+        if change > threshold:
+            regressions += 1
+            flag = "  ✗ regression"
+        print(f"  {name:28s} {change * 100:+7.1f}%{flag}")
+    return regressions == 0
+
+
+def main():
+    args = sys.argv[1:]
+    if "--synthesize" in args:
+        synthesize_corpus()
+        return
+    if "--record" in args:
+        record_corpus(scraper.get_option(args, "--cache-dir", scraper.CACHE_DIR))
+        return
+    if not os.path.exists(CORPUS_PATH):
+        sys.exit(f"No corpus at {CORPUS_PATH}; create one with --record or --synthesize")
+
+    repeat = max(1, int(scraper.get_option(args, "--repeat", DEFAULT_REPEAT)))
+    results = run_benchmarks(repeat)
+
+    json_path = scraper.get_option(args, "--json")
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n  Results written to {json_path}")
+
+    base_path = scraper.get_option(args, "--compare")
+    if base_path and not compare_results(results, base_path):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Generate static, subscribable .ics feeds from fixtures, venues and teams.
+
+Writes public/calendars/, which is served as-is alongside the site:
+
+  all.ics              every match
+  team/<id>.ics        one team's matches (group stage, as scheduled)
+  venue/<id>.ics       every match at one venue
+  group/<A-L>.ics      one group's matches
+
+Events use the same UIDs as the in-browser export in src/utils/calendar.js
+(wc2026-match-<n>@worldcup2026fan.com), so a subscribed feed updates events
+a user already imported instead of duplicating them.
+
+scripts/calendar-sequences.json (kept out of public/, it is not served)
+records, per match, a hash of the event's content with its SEQUENCE and
+DTSTAMP. When a match's time, venue, teams or labels change its SEQUENCE
+goes up by one and DTSTAMP moves to the time of the change; otherwise both
+stay put, so regenerating unchanged data produces byte-identical feeds and
+only feeds whose content changed are rewritten.
+
+Usage:
+  python scripts/build-calendars.py          # Write changed feeds
+  python scripts/build-calendars.py --check  # Exit 1 if any feed is stale
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+from datetime import datetime, timedelta, timezone
+
+import wcdata
+
+# ── Config ──────────────────────────────────────────────────────────────────
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+OUT_DIR = os.path.join(PROJECT_DIR, "public", "calendars")
+INDEX_PATH = os.path.join(SCRIPT_DIR, "calendar-sequences.json")
+FORMAT_VERSION = 1
+
+PRODID = "-//World Cup 2026 Fan Companion//EN"
+UID_DOMAIN = "worldcup2026fan.com"
+MATCH_DURATION = timedelta(hours=2)  # Same assumption as calendar.js
+REFRESH_INTERVAL = "PT6H"  # How often subscribed clients should re-poll
+LINE_LIMIT = 75  # Octets per content line before folding (RFC 5545 3.1)
+
+ROUND_NAMES = {
+    "r32": "Round of 32",
+    "r16": "Round of 16",
+    "qf": "Quarter-final",
+    "sf": "Semi-final",
+    "3rd": "Third Place",
+    "final": "Final",
+}
+
+GROUP_POS_RE = re.compile(r"^\d[A-L]$")
+THIRD_POOL_RE = re.compile(r"^3[A-L]+$")
+
+
+# ── Formatting ──────────────────────────────────────────────────────────────
+
+def team_name(data, pos):
+    """Python port of getTeamName() in src/utils/fixtures.js."""
+    team = data.team(pos)
+    if team:
+        return team.name
+    if GROUP_POS_RE.match(pos):
+        label = {"1": "Winner Group", "2": "Runner-up Group", "3": "3rd Group"}.get(pos[0])
+        if label:
+            return f"{label} {pos[1]}"
+    if pos.startswith("W") and pos[1:].isdigit():
+        return f"Winner Match {pos[1:]}"
+    if pos.startswith("L") and pos[1:].isdigit():
+        return f"Loser Match {pos[1:]}"
+    if THIRD_POOL_RE.match(pos):
+        return f"Best 3rd ({pos[1:]})"
+    return pos
+
+
+def escape(text):
+    """Escape a TEXT value, as escapeICS() does in calendar.js."""
+    return re.sub(r"([,;\\])", r"\\\1", text).replace("\n", "\\n")
+
+
+def ics_time(moment):
+    return moment.strftime("%Y%m%dT%H%M%SZ")
+
+
+def fold(line):
+    """Fold a content line at LINE_LIMIT octets without splitting a UTF-8 sequence."""
+    if len(line.encode("utf-8")) <= LINE_LIMIT:
+        return line
+    parts, current, size = [], "", 0
+    limit = LINE_LIMIT
+    for ch in line:
+        width = len(ch.encode("utf-8"))
+        if size + width > limit:
+            parts.append(current)
+            current, size = "", 0
+            limit = LINE_LIMIT - 1  # Continuation lines start with a space
+        current += ch
+        size += width
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+
+# ── Events ──────────────────────────────────────────────────────────────────
+
+def event_fields(data, f):
+    """Content lines of one match, excluding SEQUENCE and DTSTAMP."""
+    venue = data.venue(f.venue)
+    start = datetime.fromtimestamp(f.kickoff, timezone.utc)
+    label = f"Group {f.group}" if f.group else ROUND_NAMES.get(f.round, f.round or "")
+    return [
+        f"UID:wc2026-match-{f.match_number}@{UID_DOMAIN}",
+        f"DTSTART:{ics_time(start)}",
+        f"DTEND:{ics_time(start + MATCH_DURATION)}",
+        f"SUMMARY:{escape(f'{team_name(data, f.home_team)} vs {team_name(data, f.away_team)}')}",
+        f"DESCRIPTION:{escape(f'World Cup 2026 - {label} (Match {f.match_number})')}",
+        f"LOCATION:{escape(f'{venue.name}, {venue.display_city}' if venue else '')}",
+    ]
+
+
+def load_index():
+    try:
+        with open(INDEX_PATH, encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {"version": FORMAT_VERSION, "events": {}, "feeds": {}}
+    if index.get("version") != FORMAT_VERSION:
+        return {"version": FORMAT_VERSION, "events": {}, "feeds": {}}
+    return index
+
+
+def build_events(data, previous, now):
+    """Render every match as a VEVENT block.
+
+    Returns ({match number: block}, {match number: index entry}). An entry
+    keeps its sequence and stamp while the event content hash is unchanged.
+    """
+    blocks, entries = {}, {}
+    stamp_now = ics_time(now)
+    for f in sorted(data.fixtures, key=lambda f: f.match_number):
+        fields = event_fields(data, f)
+        digest = hashlib.sha256("\r\n".join(fields).encode("utf-8")).hexdigest()[:16]
+        key = str(f.match_number)
+        old = previous.get(key)
+        if old is None:
+            entry = {"hash": digest, "sequence": 0, "stamp": stamp_now}
+        elif old["hash"] != digest:
+            entry = {"hash": digest, "sequence": old["sequence"] + 1, "stamp": stamp_now}
+        else:
+            entry = old
+        entries[key] = entry
+        lines = ["BEGIN:VEVENT", fields[0], f"DTSTAMP:{entry['stamp']}", f"SEQUENCE:{entry['sequence']}",
+                 *fields[1:], "END:VEVENT"]
+        blocks[f.match_number] = "\r\n".join(fold(line) for line in lines)
+    return blocks, entries
+
+
+# ── Feeds ───────────────────────────────────────────────────────────────────
+
+def feed_specs(data):
+    """(relative path, calendar name, fixtures) for every feed."""
+    yield "all.ics", "Full Schedule", data.fixtures
+    for team in data.teams:
+        yield f"team/{team.id}.ics", team.name, data.team_fixtures(team.id)
+    for venue in data.venues:
+        yield f"venue/{venue.id}.ics", f"{venue.name}, {venue.display_city}", data.venue_fixtures(venue.id)
+    for group in data.groups:
+        yield f"group/{group}.ics", f"Group {group}", data.group_fixtures(group)
+
+
+def render_feed(name, fixtures, blocks):
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:World Cup 2026 - {escape(name)}",
+        "X-WR-TIMEZONE:UTC",
+        f"REFRESH-INTERVAL;VALUE=DURATION:{REFRESH_INTERVAL}",
+        f"X-PUBLISHED-TTL:{REFRESH_INTERVAL}",
+    ]
+    body = "\r\n".join(fold(line) for line in lines)
+    events = [blocks[f.match_number] for f in sorted(fixtures, key=lambda f: f.match_number)]
+    return "\r\n".join([body, *events, "END:VCALENDAR"]) + "\r\n"
+
+
+def build_feeds(data, index, now):
+    blocks, entries = build_events(data, index["events"], now)
+    feeds = {path: render_feed(name, fixtures, blocks) for path, name, fixtures in feed_specs(data)}
+    return feeds, entries
+
+
+def read_text(path):
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def write_text(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+# ── Main ────────────────────────────────────────────────────────────────────
+
+def main():
+    args = sys.argv[1:]
+    data = wcdata.load()
+    index = load_index()
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    feeds, entries = build_feeds(data, index, now)
+    stale = [path for path, text in feeds.items() if read_text(os.path.join(OUT_DIR, path)) != text]
+    changed_events = [k for k, e in entries.items() if index["events"].get(k) != e]
+    orphans = [path for path in index["feeds"] if path not in feeds]
+
+    if "--check" in args:
+        if stale or changed_events or orphans:
+            print(f"✗ {len(stale)} of {len(feeds)} feeds out of date ({len(changed_events)} events changed); "
+                  f"run scripts/build-calendars.py")
+            sys.exit(1)
+        print(f"✓ {len(feeds)} feeds in {OUT_DIR} are up to date")
+        return
+
+    for path in stale:
+        write_text(os.path.join(OUT_DIR, path), feeds[path])
+    for path in orphans:
+        try:
+            os.remove(os.path.join(OUT_DIR, path))
+        except OSError:
+            pass
+
+    if stale or changed_events or orphans:
+        write_text(INDEX_PATH, json.dumps({
+            "version": FORMAT_VERSION,
+            "events": entries,
+            "feeds": {path: hashlib.sha256(text.encode("utf-8")).hexdigest() for path, text in feeds.items()},
+        }, ensure_ascii=False, indent=1) + "\n")
+
+    bumped = sum(1 for k in changed_events if k in index["events"])
+    print(f"✓ {len(feeds)} feeds, {len(entries)} events: {len(stale)} rewritten, "
+          f"{len(feeds) - len(stale)} unchanged, {bumped} events re-sequenced, {len(orphans)} removed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Precompute knockout-path lookup tables from fixtures, groups and teams.
+
+Reads src/data/fixtures.json, groups.json and teams.json once and writes
+src/data/knockout.json, which the Bracket and KnockoutPath views render from
+directly instead of scanning fixtures at runtime:
+
+  matches    every knockout match with its venue, date, the match its winner
+             goes on to ("next") and the matches feeding it ("feeders")
+  rounds     knockout match numbers per round, in match order
+  final / thirdPlace / semis   the matches the bracket tree hangs from
+  positions  for each R32 slot (1A, 2B, 3ABCDF, ...): its R32 match, the
+             match numbers through to the final, and candidate teams
+  groups     for each group, the resolved 1st / 2nd place paths and the
+             3rd-place scenarios, opponent labels included
+
+Before writing, the W{n} / L{n} chains are validated: every reference must
+name an earlier knockout match, every winner must feed exactly one match,
+and every R32 path must reach the final without revisiting a match.
+
+Usage:
+  python scripts/build-knockout.py          # Validate and write knockout.json
+  python scripts/build-knockout.py --check  # Exit 1 if knockout.json is stale
+"""
+
+import json
+import os
+import re
+import sys
+
+import wcdata
+
+# ── Config ──────────────────────────────────────────────────────────────────
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+OUT_PATH = os.path.join(PROJECT_DIR, "src", "data", "knockout.json")
+ROUND_ORDER = ["r32", "r16", "qf", "sf", "3rd", "final"]
+UNRANKED = 999  # sort key for teams without a FIFA ranking, as in the site
+
+GROUP_POS_RE = re.compile(r"^\d[A-L]$")
+THIRD_POOL_RE = re.compile(r"^3[A-L]+$")
+WINNER_RE = re.compile(r"^W(\d+)$")
+LOSER_RE = re.compile(r"^L(\d+)$")
+
+
+# ── Validation ──────────────────────────────────────────────────────────────
+
+def validate(data):
+    """Return a list of problems with the knockout chains (empty if sound)."""
+    errors = []
+    knockout = [f for f in data.fixtures if f.round != "group"]
+    rank = {r: i for i, r in enumerate(ROUND_ORDER)}
+    fed_by = {}  # "W73" -> match number it appears in
+
+    for f in knockout:
+        if f.round not in rank:
+            errors.append(f"Match {f.match_number}: unknown round {f.round!r}")
+            continue
+        for side in f.sides:
+            m = WINNER_RE.match(side) or LOSER_RE.match(side)
+            if not m:
+                if f.round != "r32":
+                    errors.append(f"Match {f.match_number}: {side!r} is not a W/L reference")
+                continue
+            source = data.match(int(m.group(1)))
+            if source is None or source.round == "group":
+                errors.append(f"Match {f.match_number}: {side} refers to no knockout match")
+            elif source.round in rank and rank[source.round] >= rank[f.round]:
+                errors.append(f"Match {f.match_number}: {side} is not from an earlier round")
+            if side in fed_by:
+                errors.append(f"{side} feeds both match {fed_by[side]} and match {f.match_number}")
+            fed_by[side] = f.match_number
+
+    for f in knockout:
+        if f.round not in ("final", "3rd") and f"W{f.match_number}" not in fed_by:
+            errors.append(f"Winner of match {f.match_number} goes nowhere")
+
+    slots = [side for f in data.round_fixtures("r32") for side in f.sides]
+    for group in data.groups:
+        for pos in (f"1{group}", f"2{group}"):
+            if slots.count(pos) != 1:
+                errors.append(f"{pos} appears in {slots.count(pos)} R32 matches (expected 1)")
+        if not any(THIRD_POOL_RE.match(s) and group in s[1:] for s in slots):
+            errors.append(f"No third-place pool includes group {group}")
+
+    finals = data.round_fixtures("final")
+    if len(finals) != 1:
+        errors.append(f"Expected one final, found {len(finals)}")
+    else:
+        for f in data.round_fixtures("r32"):
+            seen = set()
+            current = f
+            while current is not None and current.round != "final":
+                if current.match_number in seen:
+                    errors.append(f"Cycle through match {current.match_number}")
+                    break
+                seen.add(current.match_number)
+                nxt = fed_by.get(f"W{current.match_number}")
+                current = data.match(nxt) if nxt else None
+            if current is None:
+                errors.append(f"Match {f.match_number} never reaches the final")
+    return errors
+
+
+# ── Tables ──────────────────────────────────────────────────────────────────
+
+def team_name(data, pos):
+    """Python port of getTeamName() in src/utils/fixtures.js."""
+    team = data.team(pos)
+    if team:
+        return team.name
+    if GROUP_POS_RE.match(pos):
+        label = {"1": "Winner Group", "2": "Runner-up Group", "3": "3rd Group"}.get(pos[0])
+        if label:
+            return f"{label} {pos[1]}"
+    if WINNER_RE.match(pos):
+        return f"Winner Match {pos[1:]}"
+    if LOSER_RE.match(pos):
+        return f"Loser Match {pos[1:]}"
+    if THIRD_POOL_RE.match(pos):
+        return f"Best 3rd ({pos[1:]})"
+    return pos
+
+
+def ranked(teams):
+    return sorted(teams, key=lambda t: t.fifa_ranking or UNRANKED)
+
+
+def candidates(data, pos):
+    """Likely teams for a bracket slot, by FIFA ranking (as getCandidates() did)."""
+    if GROUP_POS_RE.match(pos):
+        teams = ranked(data.group_teams(pos[1]))
+        place = int(pos[0])
+        picked = teams[0:2] if place == 1 else teams[1:3] if place == 2 else teams[2:]
+    elif THIRD_POOL_RE.match(pos):
+        thirds = [ranked(data.group_teams(g))[2] for g in pos[1:] if len(data.group_teams(g)) >= 3]
+        picked = ranked(thirds)
+    else:
+        picked = []
+    return [t.id for t in picked]
+
+
+def describe_opponent(data, pos):
+    """Opponent label, type and candidates for a bracket slot."""
+    if GROUP_POS_RE.match(pos) and pos[0] in "12":
+        kind = "group-winner" if pos[0] == "1" else "group-runnerup"
+        label = f"{'Winner' if pos[0] == '1' else 'Runner-up'} of Group {pos[1]}"
+        return {"label": label, "type": kind, "candidates": candidates(data, pos)}
+    if THIRD_POOL_RE.match(pos):
+        groups = " / ".join(f"Group {g}" for g in pos[1:])
+        return {"label": f"Best 3rd-place from {groups}", "type": "third-place",
+                "candidates": candidates(data, pos)}
+    m = WINNER_RE.match(pos)
+    if m:
+        match = data.match(int(m.group(1)))
+        label = (f"Winner of {team_name(data, match.home_team)} vs {team_name(data, match.away_team)}"
+                 if match else f"Winner of Match {m.group(1)}")
+        return {"label": label, "type": "match-winner", "matchNumber": int(m.group(1))}
+    m = LOSER_RE.match(pos)
+    if m:
+        return {"label": f"Loser of Match {m.group(1)}", "type": "match-loser", "matchNumber": int(m.group(1))}
+    return {"label": pos, "type": "unknown"}
+
+
+def next_matches(data):
+    """{match number: match its winner plays in next}."""
+    nxt = {}
+    for f in data.fixtures:
+        for side in f.sides:
+            m = WINNER_RE.match(side)
+            if m:
+                nxt[int(m.group(1))] = f.match_number
+    return nxt
+
+
+def trace(data, nxt, start, pos):
+    """Steps from R32 ``start`` to the final for the team entering at ``pos``."""
+    steps = []
+    match, slot = start, pos
+    while match is not None:
+        venue = data.venue(match.venue)
+        opponent_pos = match.away_team if match.home_team == slot else match.home_team
+        steps.append({
+            "matchNumber": match.match_number,
+            "round": match.round,
+            "date": match.date,
+            "timeUTC": match.time_utc,
+            "venue": venue.name if venue else match.venue,
+            "venueCity": venue.display_city if venue else "",
+            "venueId": match.venue,
+            "homeTeam": match.home_team,
+            "awayTeam": match.away_team,
+            "opponent": describe_opponent(data, opponent_pos),
+        })
+        slot = f"W{match.match_number}"
+        following = nxt.get(match.match_number)
+        match = data.match(following) if following else None
+    return steps
+
+
+def build_tables(data):
+    nxt = next_matches(data)
+    knockout = sorted((f for f in data.fixtures if f.round != "group"), key=lambda f: f.match_number)
+    r32_slot = {side: f for f in data.round_fixtures("r32") for side in f.sides}
+
+    matches = {}
+    for f in knockout:
+        matches[str(f.match_number)] = {
+            "round": f.round,
+            "date": f.date,
+            "timeUTC": f.time_utc,
+            "venueId": f.venue,
+            "homeTeam": f.home_team,
+            "awayTeam": f.away_team,
+            "next": nxt.get(f.match_number),
+            "feeders": [int(WINNER_RE.match(s).group(1)) for s in f.sides if WINNER_RE.match(s)],
+        }
+
+    positions = {}
+    for pos, f in sorted(r32_slot.items()):
+        path = [step["matchNumber"] for step in trace(data, nxt, f, pos)]
+        positions[pos] = {"r32": f.match_number, "path": path, "candidates": candidates(data, pos)}
+
+    groups = {}
+    for group in data.groups:
+        paths = {}
+        for key, pos in (("first", f"1{group}"), ("second", f"2{group}")):
+            paths[key] = trace(data, nxt, r32_slot[pos], pos) if pos in r32_slot else None
+        third = []
+        for f in sorted(data.round_fixtures("r32"), key=lambda f: f.match_number):
+            for pos in f.sides:
+                if THIRD_POOL_RE.match(pos) and group in pos[1:]:
+                    path = trace(data, nxt, f, pos)
+                    third.append({
+                        "r32Match": f.match_number,
+                        "opponent": path[0]["opponent"],
+                        "venueId": f.venue,
+                        "date": f.date,
+                        "path": [step["matchNumber"] for step in path],
+                    })
+        paths["third"] = third
+        groups[group] = paths
+
+    final = data.round_fixtures("final")[0]
+    third_place = data.round_fixtures("3rd")
+    return {
+        "final": final.match_number,
+        "thirdPlace": third_place[0].match_number if third_place else None,
+        "semis": matches[str(final.match_number)]["feeders"],
+        "rounds": {r: [f.match_number for f in knockout if f.round == r] for r in ROUND_ORDER},
+        "matches": matches,
+        "positions": positions,
+        "groups": groups,
+    }
+
+
+def serialize(tables):
+    return json.dumps(tables, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+# ── Main ────────────────────────────────────────────────────────────────────
+
+def main():
+    args = sys.argv[1:]
+    data = wcdata.load()
+    errors = validate(data)
+    if errors:
+        for e in errors:
+            print(f"✗ {e}")
+        sys.exit(1)
+    print(f"✓ Knockout chains complete and acyclic ({len(data.fixtures) - len(data.round_fixtures('group'))} matches)")
+
+    payload = serialize(build_tables(data))
+    current = None
+    if os.path.exists(OUT_PATH):
+        with open(OUT_PATH, encoding="utf-8") as f:
+            current = f.read()
+
+    if "--check" in args:
+        if current != payload:
+            print(f"✗ {OUT_PATH} is out of date; run scripts/build-knockout.py")
+            sys.exit(1)
+        print(f"✓ {OUT_PATH} is up to date")
+        return
+
+    if current == payload:
+        print(f"  {OUT_PATH} unchanged")
+        return
+    tmp = OUT_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(payload)
+    os.replace(tmp, OUT_PATH)
+    print(f"✓ Wrote {OUT_PATH} ({len(payload.encode('utf-8')):,d} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,35 @@
 #!/usr/bin/env python3
-"""Build API-Football team ID mapping for our 42 confirmed WC2026 teams."""
+"""Build API-Football team ID mapping for our 42 confirmed WC2026 teams.
 
+Requests go over one keep-alive connection and are paced from API-Football's
+rate-limit headers rather than a fixed sleep. Progress is appended to a
+journal as each lookup finishes, so an interrupted run resumes where it left
+off; the journal is folded into team-api-mapping.json once at the end. Raw
+search responses are cached on disk for API_CACHE_TTL so reruns and retries
+cost no quota.
+
+Usage:
+  python scripts/build-team-mapping.py            # Map any missing teams
+  python scripts/build-team-mapping.py --refresh  # Ignore cached search responses
+"""
+
+import hashlib
+import http.client
 import json
-import urllib.request
-import urllib.parse
-import time
 import os
+import sys
+import time
+import urllib.parse
 
 API_KEY = os.environ.get("API_FOOTBALL_KEY", "181bf53d8ec1174186fa7be7d70ea408")
-BASE = "https://v3.football.api-sports.io"
-OUT_PATH = os.path.join(os.path.dirname(__file__), "team-api-mapping.json")
+BASE = os.environ.get("API_FOOTBALL_BASE_URL", "https://v3.football.api-sports.io").rstrip("/")
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUT_PATH = os.path.join(SCRIPT_DIR, "team-api-mapping.json")
+JOURNAL_PATH = os.path.join(SCRIPT_DIR, "team-api-mapping.journal.jsonl")
+API_CACHE_DIR = os.path.join(SCRIPT_DIR, ".api-cache")
+API_CACHE_TTL = 7 * 86400  # seconds a cached search response stays valid
+MAX_RETRIES = 3
+DEFAULT_RETRY_AFTER = 60  # seconds to back off on a 429 without Retry-After
 
 # Map our team IDs to search terms the API will recognise
 TEAMS = [
@@ -27,16 +47,137 @@ TEAMS = [
     ("eng", "England"), ("hrv", "Croatia"), ("gha", "Ghana"), ("pan", "Panama"),
 ]
 
-def api_get(endpoint):
-    req = urllib.request.Request(
-        f"{BASE}/{endpoint}",
-        headers={"x-apisports-key": API_KEY}
-    )
-    with urllib.request.urlopen(req) as resp:
-        return json.load(resp)
 
-def find_national_team(search_name):
-    data = api_get(f"teams?search={urllib.parse.quote(search_name)}")
+class QuotaExhausted(Exception):
+    """The daily request quota is spent; stop and resume tomorrow."""
+
+
+# ── API client ──────────────────────────────────────────────────────────────
+
+class ApiClient:
+    """API-Football client on a persistent connection, paced by its headers.
+
+    X-RateLimit-Limit / X-RateLimit-Remaining describe the per-minute
+    budget: while more than half of it is left requests go out
+    back-to-back, after that they are spaced 60/limit seconds apart.
+    x-ratelimit-requests-remaining is the daily quota; at zero the client
+    raises QuotaExhausted.
+    """
+
+    def __init__(self, base=BASE, api_key=API_KEY, use_cache=True):
+        parts = urllib.parse.urlsplit(base)
+        self.scheme = parts.scheme
+        self.host = parts.netloc
+        self.prefix = parts.path.rstrip("/")
+        self.api_key = api_key
+        self.use_cache = use_cache
+        self.conn = None
+        self.next_request_at = 0.0
+        self.requests = 0
+        self.cache_hits = 0
+        self.daily_remaining = None
+
+    def connect(self):
+        cls = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        self.conn = cls(self.host, timeout=30)
+
+    def close(self):
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    def pace(self, headers):
+        """Schedule the next request from this response's rate-limit headers."""
+        limit = headers.get("X-RateLimit-Limit")
+        remaining = headers.get("X-RateLimit-Remaining")
+        daily = headers.get("x-ratelimit-requests-remaining")
+        if daily is not None and daily.isdigit():
+            self.daily_remaining = int(daily)
+        if limit and remaining and limit.isdigit() and remaining.isdigit():
+            limit, remaining = int(limit), int(remaining)
+            if remaining == 0:
+                self.next_request_at = time.monotonic() + DEFAULT_RETRY_AFTER
+            elif remaining <= limit // 2:
+                self.next_request_at = time.monotonic() + 60 / max(limit, 1)
+
+    def cache_path(self, endpoint):
+        return os.path.join(API_CACHE_DIR, hashlib.sha256(endpoint.encode("utf-8")).hexdigest()[:24] + ".json")
+
+    def cached(self, endpoint):
+        try:
+            with open(self.cache_path(endpoint)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("fetchedAt", 0) > API_CACHE_TTL:
+            return None
+        return entry.get("body")
+
+    def store(self, endpoint, body):
+        os.makedirs(API_CACHE_DIR, exist_ok=True)
+        path = self.cache_path(endpoint)
+        with open(path + ".tmp", "w") as f:
+            json.dump({"endpoint": endpoint, "fetchedAt": int(time.time()), "body": body}, f)
+        os.replace(path + ".tmp", path)
+
+    def get(self, endpoint):
+        """GET ``endpoint`` (e.g. "teams?search=Spain") and return the JSON body."""
+        if self.use_cache:
+            body = self.cached(endpoint)
+            if body is not None:
+                self.cache_hits += 1
+                return body
+
+        for attempt in range(MAX_RETRIES + 1):
+            if self.daily_remaining == 0:
+                raise QuotaExhausted("daily request quota reached")
+            wait = self.next_request_at - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            if self.conn is None:
+                self.connect()
+            try:
+                self.conn.request("GET", f"{self.prefix}/{endpoint}", headers={"x-apisports-key": self.api_key})
+                resp = self.conn.getresponse()
+                raw = resp.read()
+            except (http.client.HTTPException, OSError):
+                # Server closed the keep-alive connection; reconnect and retry
+                self.close()
+                if attempt == MAX_RETRIES:
+                    raise
+                continue
+            self.requests += 1
+            self.pace(resp.headers)
+
+            if resp.status == 429 or resp.status >= 500:
+                if self.daily_remaining == 0:
+                    raise QuotaExhausted("daily request quota reached")
+                retry_after = resp.headers.get("Retry-After", "")
+                delay = int(retry_after) if retry_after.isdigit() else DEFAULT_RETRY_AFTER
+                self.next_request_at = max(self.next_request_at, time.monotonic() + delay)
+                if attempt == MAX_RETRIES:
+                    raise RuntimeError(f"HTTP {resp.status} after {MAX_RETRIES} retries")
+                continue
+            if resp.status != 200:
+                raise RuntimeError(f"HTTP {resp.status}")
+
+            body = json.loads(raw)
+            errors = body.get("errors")
+            if errors:
+                # API-Football reports throttling in the body with a 200
+                if isinstance(errors, dict) and "requests" in errors:
+                    raise QuotaExhausted(errors["requests"])
+                if isinstance(errors, dict) and "rateLimit" in errors and attempt < MAX_RETRIES:
+                    self.next_request_at = time.monotonic() + DEFAULT_RETRY_AFTER
+                    continue
+                raise RuntimeError(f"API error: {errors}")
+            self.store(endpoint, body)
+            return body
+        raise RuntimeError("unreachable")
+
+
+def find_national_team(client, search_name):
+    data = client.get(f"teams?search={urllib.parse.quote(search_name)}")
     for t in data["response"]:
         team = t["team"]
         name = team["name"]
@@ -44,31 +185,78 @@ def find_national_team(search_name):
             return team
     return None
 
-# Load existing mapping if any
-mapping = {}
-if os.path.exists(OUT_PATH):
-    with open(OUT_PATH) as f:
-        mapping = json.load(f)
 
-missing = [(oid, name) for oid, name in TEAMS if oid not in mapping]
-print(f"Already mapped: {len(mapping)}, missing: {len(missing)}")
+# ── Progress journal ────────────────────────────────────────────────────────
 
-for i, (our_id, search_name) in enumerate(missing):
-    if i > 0:
-        time.sleep(3)  # 3s between requests to avoid throttle
+def load_mapping():
+    """Load the saved mapping and replay any journal left by an interrupted run."""
+    mapping = {}
+    if os.path.exists(OUT_PATH):
+        with open(OUT_PATH) as f:
+            mapping = json.load(f)
+    if os.path.exists(JOURNAL_PATH):
+        with open(JOURNAL_PATH) as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # Torn final line from a crash
+                mapping[entry.pop("id")] = entry
+    return mapping
 
-    try:
-        team = find_national_team(search_name)
-        if team:
-            mapping[our_id] = {"apiId": team["id"], "name": team["name"], "code": team.get("code")}
-            print(f"✓ {our_id:4s} -> {team['id']:5d}: {team['name']}")
-        else:
-            print(f"✗ {our_id:4s}: NOT FOUND for '{search_name}'")
-    except Exception as e:
-        print(f"✗ {our_id:4s}: ERROR - {e}")
-
-    # Save progress after each lookup
-    with open(OUT_PATH, "w") as f:
+
+def append_journal(our_id, entry):
+    with open(JOURNAL_PATH, "a") as f:
+        f.write(json.dumps({"id": our_id, **entry}) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def compact_journal(mapping):
+    """Write the full mapping once and drop the journal."""
+    tmp = OUT_PATH + ".tmp"
+    with open(tmp, "w") as f:
         json.dump(mapping, f, indent=2)
+    os.replace(tmp, OUT_PATH)
+    if os.path.exists(JOURNAL_PATH):
+        os.remove(JOURNAL_PATH)
+
+
+# ── Main ────────────────────────────────────────────────────────────────────
+
+def main():
+    args = sys.argv[1:]
+    client = ApiClient(use_cache="--refresh" not in args)
+
+    mapping = load_mapping()
+    missing = [(oid, name) for oid, name in TEAMS if oid not in mapping]
+    print(f"Already mapped: {len(mapping)}, missing: {len(missing)}")
+
+    try:
+        for our_id, search_name in missing:
+            try:
+                team = find_national_team(client, search_name)
+            except QuotaExhausted:
+                raise
+            except Exception as e:
+                print(f"✗ {our_id:4s}: ERROR - {e}")
+                continue
+            if team:
+                entry = {"apiId": team["id"], "name": team["name"], "code": team.get("code")}
+                mapping[our_id] = entry
+                append_journal(our_id, entry)
+                print(f"✓ {our_id:4s} -> {team['id']:5d}: {team['name']}")
+            else:
+                print(f"✗ {our_id:4s}: NOT FOUND for '{search_name}'")
+    except QuotaExhausted as e:
+        print(f"✗ Stopping: {e}. Progress is saved; rerun to resume.")
+    finally:
+        client.close()
+        compact_journal(mapping)
+
+    print(f"\nTotal mapped: {len(mapping)}/{len(TEAMS)}")
+    print(f"  {client.requests} API requests, {client.cache_hits} served from {API_CACHE_DIR}")
+
 
-print(f"\nTotal mapped: {len(mapping)}/{len(TEAMS)}")
+if __name__ == "__main__":
+    main()
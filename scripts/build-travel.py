@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Precompute venue distances and team travel itineraries.
+
+Reads venues.json, fixtures.json and knockout.json (see build-knockout.py)
+and writes src/data/travel.json for the map and team pages:
+
+  venues     venue ids, in venues.json order; the matrix rows and columns
+  distanceKm 16x16 great-circle distances in whole km, from one vectorized
+             haversine over every venue pair
+  legFields  column names for every leg below
+  teams      per team, the group-stage itinerary in kickoff order plus, for
+             each finishing position, the conditional path on through the
+             knockout bracket ("first", "second", and one "third" entry per
+             R32 pool the group's third-placed team can land in)
+
+Each leg is one match: [match, km, cumKm, tzShift, restDays], where km is
+the distance from the previous match's venue, tzShift the change in the
+venue's UTC offset at kickoff (hours, + means clocks go forward) and
+restDays the number of calendar days since the previous match, in venue
+local time. Knockout legs continue the totals of the group-stage legs.
+
+Usage:
+  python scripts/build-travel.py          # Write travel.json
+  python scripts/build-travel.py --check  # Exit 1 if travel.json is stale
+"""
+
+import json
+import os
+import sys
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit("build-travel.py needs NumPy: pip install numpy")
+
+import wcdata
+
+# ── Config ──────────────────────────────────────────────────────────────────
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+OUT_PATH = os.path.join(PROJECT_DIR, "src", "data", "travel.json")
+EARTH_RADIUS_KM = 6371.0
+LEG_FIELDS = ["match", "km", "cumKm", "tzShift", "restDays"]
+
+
+# ── Distances ───────────────────────────────────────────────────────────────
+
+def distance_matrix(venues):
+    """(n, n) haversine distances in km between every pair of ``venues``."""
+    lat = np.radians([v.lat for v in venues])
+    lng = np.radians([v.lng for v in venues])
+    dlat = lat[:, None] - lat[None, :]
+    dlng = lng[:, None] - lng[None, :]
+    a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+# ── Itineraries ─────────────────────────────────────────────────────────────
+
+class Stop:
+    """Where and when one match is played, in the venue's local time."""
+
+    __slots__ = ("match", "venue", "offset", "day")
+
+    def __init__(self, data, fixture):
+        venue = data.venue(fixture.venue)
+        local = datetime.fromtimestamp(fixture.kickoff, timezone.utc).astimezone(ZoneInfo(venue.timezone))
+        self.match = fixture.match_number
+        self.venue = fixture.venue
+        self.offset = local.utcoffset().total_seconds() / 3600
+        self.day = local.date()
+
+
+def legs(stops, km, index, start=None, total=0):
+    """Legs for ``stops``, continuing from stop ``start`` and running total ``total``."""
+    result = []
+    previous = start
+    for stop in stops:
+        if previous is None:
+            hop, shift, rest = 0, 0, None
+        else:
+            hop = int(km[index[previous.venue], index[stop.venue]])
+            shift = stop.offset - previous.offset
+            rest = (stop.day - previous.day).days
+        total += hop
+        result.append([stop.match, hop, total, int(shift) if shift == int(shift) else shift, rest])
+        previous = stop
+    return result
+
+
+def team_travel(data, knockout, stops, km, index, team):
+    group_stops = [stops[f.match_number] for f in sorted(data.team_fixtures(team.id), key=lambda f: f.kickoff)
+                   if f.round == "group"]
+    entry = {"group": legs(group_stops, km, index)}
+    paths = knockout["groups"].get(team.group) if team.group else None
+    if not group_stops or not paths:
+        return entry
+
+    last = group_stops[-1]
+    total = entry["group"][-1][2]
+
+    def path_legs(numbers):
+        return legs([stops[n] for n in numbers], km, index, last, total)
+
+    for key in ("first", "second"):
+        if paths.get(key):
+            entry[key] = path_legs([step["matchNumber"] for step in paths[key]])
+    entry["third"] = [{"r32Match": s["r32Match"], "legs": path_legs(s["path"])} for s in paths["third"]]
+    return entry
+
+
+def build_travel(data):
+    km = np.rint(distance_matrix(data.venues)).astype(int)
+    index = {v.id: i for i, v in enumerate(data.venues)}
+    stops = {f.match_number: Stop(data, f) for f in data.fixtures}
+    knockout = data.read("knockout.json")
+    return {
+        "venues": [v.id for v in data.venues],
+        "distanceKm": km.tolist(),
+        "legFields": LEG_FIELDS,
+        "teams": {t.id: team_travel(data, knockout, stops, km, index, t) for t in data.teams},
+    }
+
+
+def serialize(travel):
+    return json.dumps(travel, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+# ── Main ────────────────────────────────────────────────────────────────────
+
+def main():
+    args = sys.argv[1:]
+    data = wcdata.load()
+    travel = build_travel(data)
+    payload = serialize(travel)
+    current = None
+    if os.path.exists(OUT_PATH):
+        with open(OUT_PATH, encoding="utf-8") as f:
+            current = f.read()
+
+    if "--check" in args:
+        if current != payload:
+            print(f"✗ {OUT_PATH} is out of date; run scripts/build-travel.py")
+            sys.exit(1)
+        print(f"✓ {OUT_PATH} is up to date")
+        return
+
+    km = travel["distanceKm"]
+    far = max(((a, b) for a in range(len(km)) for b in range(a)), key=lambda p: km[p[0]][p[1]])
+    print(f"✓ {len(km)} venues; longest hop {travel['venues'][far[0]]} - {travel['venues'][far[1]]} "
+          f"{km[far[0]][far[1]]:,d} km")
+    if current == payload:
+        print(f"  {OUT_PATH} unchanged")
+        return
+    tmp = OUT_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(payload)
+    os.replace(tmp, OUT_PATH)
+    print(f"✓ Wrote {OUT_PATH} ({len(payload.encode('utf-8')):,d} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Prebuilt player search index over squads.json.
+
+Names are matched on an accent-folded key (name_key): lower case, accents
+and ligatures folded to ASCII, "(captain)"-style notes and apostrophes
+dropped, everything else that is not a letter or digit turned into single
+spaces. scrape-squads.py uses the same key to dedupe players and to match
+exclusions.json, so "Kylian Mbappé (captain)" and "Kylian Mbappe" are one
+player everywhere.
+
+The index (src/data/player-index.json) is small enough to ship to the
+client:
+
+  teams / clubs / positions   string tables
+  players    [name, team, club, position] rows; player ids are row numbers,
+             grouped by team in squads.json order (the player -> team map)
+  keys       name_key of every player, by id
+  trigrams   {trigram: ids} postings over the keys, gap-encoded
+  clubPlayers  ids per club (the club -> players map), gap-encoded
+  teamHashes   content hash of each team's rows, by team
+
+A query of three or more characters intersects the postings of its
+trigrams, rarest first, then confirms the substring; shorter queries match
+word prefixes in ``keys`` directly. update_index() reuses the rows and keys
+of teams whose rows still hash to their teamHashes entry and re-derives the
+rest, so an index carried over from an older squads.json is never trusted
+blindly.
+
+Usage:
+  python scripts/player_index.py build           # squads.json -> player-index.json
+  python scripts/player_index.py search QUERY    # Look up players by name
+  python scripts/player_index.py bench           # Index queries vs linear scans
+"""
+
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+import unicodedata
+
+# ── Config ──────────────────────────────────────────────────────────────────
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+SQUADS_PATH = os.path.join(PROJECT_DIR, "src", "data", "squads.json")
+INDEX_PATH = os.path.join(PROJECT_DIR, "src", "data", "player-index.json")
+FORMAT = "player-search"
+FORMAT_VERSION = 2
+MAX_RESULTS = 20
+
+# Letters NFKD leaves alone; mirrored in src/utils/playerSearch.js
+FOLD_LETTERS = str.maketrans({
+    "ø": "o", "đ": "d", "ð": "d", "ł": "l", "ħ": "h", "ı": "i",
+    "æ": "ae", "œ": "oe", "þ": "th", "ß": "ss",
+})
+NOTE_RE = re.compile(r"\([^)]*\)")
+APOSTROPHE_RE = re.compile(r"['’`ʼ.]")
+SEPARATOR_RE = re.compile(r"[^a-z0-9]+")
+
+
+def name_key(name):
+    """Accent-folded, lower-case search and dedupe key for a player name."""
+    text = NOTE_RE.sub(" ", name).casefold().translate(FOLD_LETTERS)
+    text = "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+    return SEPARATOR_RE.sub(" ", APOSTROPHE_RE.sub("", text)).strip()
+
+
+def trigrams(key):
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+
+def gaps(ids):
+    """Sorted ids as first value + successive differences (smaller JSON)."""
+    return [b - a for a, b in zip([0] + ids, ids)]
+
+
+def ungaps(encoded):
+    total, ids = 0, []
+    for step in encoded:
+        total += step
+        ids.append(total)
+    return ids
+
+
+# ── Build ───────────────────────────────────────────────────────────────────
+
+def squad_rows(team_id, entry):
+    """(name, team, club, position) for each of a team's players."""
+    return [(p["name"], team_id, p.get("club"), p.get("position")) for p in entry.get("players", [])]
+
+
+def team_rows(team_id, entry):
+    """A team's rows and the name_key of each."""
+    rows = squad_rows(team_id, entry)
+    return rows, [name_key(r[0]) for r in rows]
+
+
+def rows_hash(rows):
+    return hashlib.sha256(json.dumps(rows, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+def assemble(segments):
+    """Build the index from {team_id: (rows, keys)}, in team order."""
+    teams = list(segments)
+    team_index = {t: i for i, t in enumerate(teams)}
+    clubs = sorted({r[2] for rows, _ in segments.values() for r in rows if r[2]})
+    club_index = {c: i for i, c in enumerate(clubs)}
+    positions = sorted({r[3] for rows, _ in segments.values() for r in rows if r[3]})
+    position_index = {p: i for i, p in enumerate(positions)}
+
+    players, keys = [], []
+    postings = {}
+    club_players = [[] for _ in clubs]
+    for rows, row_keys in segments.values():
+        for (name, team_id, club, position), key in zip(rows, row_keys):
+            pid = len(players)
+            players.append([name, team_index[team_id], club_index.get(club), position_index.get(position)])
+            keys.append(key)
+            for gram in trigrams(key):
+                postings.setdefault(gram, []).append(pid)
+            if club in club_index:
+                club_players[club_index[club]].append(pid)
+
+    return {
+        "format": FORMAT,
+        "version": FORMAT_VERSION,
+        "teams": teams,
+        "clubs": clubs,
+        "positions": positions,
+        "players": players,
+        "keys": keys,
+        "trigrams": {g: gaps(ids) for g, ids in sorted(postings.items())},
+        "clubPlayers": [gaps(ids) for ids in club_players],
+        "teamHashes": [rows_hash(rows) for rows, _ in segments.values()],
+    }
+
+
+def build_index(squads):
+    return assemble({team_id: team_rows(team_id, entry) for team_id, entry in squads.items()})
+
+
+def update_index(index, squads):
+    """Rebuild ``index`` for ``squads``, re-deriving only teams that changed.
+
+    A team keeps the rows and keys already in ``index`` when its rows in
+    ``squads`` hash to its teamHashes entry; any other team (re-scraped,
+    edited by hand, or new) is derived from ``squads``. Falls back to a
+    full build if ``index`` is missing or another format.
+    """
+    if not index or index.get("format") != FORMAT or index.get("version") != FORMAT_VERSION:
+        return build_index(squads)
+    old = {}
+    for (name, team, club, position), key in zip(index["players"], index["keys"]):
+        team_id = index["teams"][team]
+        rows, keys = old.setdefault(team_id, ([], []))
+        rows.append((name, team_id, index["clubs"][club] if club is not None else None,
+                     index["positions"][position] if position is not None else None))
+        keys.append(key)
+    hashes = dict(zip(index["teams"], index["teamHashes"]))
+    segments = {}
+    for team_id, entry in squads.items():
+        rows = squad_rows(team_id, entry)
+        if hashes.get(team_id) == rows_hash(rows):
+            segments[team_id] = old.get(team_id, ([], []))
+        else:
+            segments[team_id] = rows, [name_key(r[0]) for r in rows]
+    return assemble(segments)
+
+
+def dumps(index):
+    return json.dumps(index, ensure_ascii=False, separators=(",", ":"))
+
+
+# ── Query ───────────────────────────────────────────────────────────────────
+
+class Searcher:
+    """Decoded index; search() and club() answer from postings, not scans."""
+
+    def __init__(self, index):
+        self.index = index
+        self.keys = index["keys"]
+        self.postings = {g: ungaps(ids) for g, ids in index["trigrams"].items()}
+        self.club_keys = [name_key(c) for c in index["clubs"]]
+        self.club_players = [ungaps(ids) for ids in index["clubPlayers"]]
+
+    def player(self, pid):
+        name, team, club, position = self.index["players"][pid]
+        return {
+            "name": name,
+            "team": self.index["teams"][team],
+            "club": self.index["clubs"][club] if club is not None else None,
+            "position": self.index["positions"][position] if position is not None else None,
+        }
+
+    def search_ids(self, query, limit=MAX_RESULTS):
+        q = name_key(query)
+        if not q:
+            return []
+        if len(q) < 3:
+            hits = [i for i, k in enumerate(self.keys) if k.startswith(q) or f" {q}" in k]
+        else:
+            lists = sorted((self.postings.get(g, []) for g in trigrams(q)), key=len)
+            candidates = set(lists[0])
+            for ids in lists[1:]:
+                candidates.intersection_update(ids)
+                if not candidates:
+                    break
+            hits = sorted(i for i in candidates if q in self.keys[i])
+        # Word-prefix matches first, then any substring match
+        hits.sort(key=lambda i: not (self.keys[i].startswith(q) or f" {q}" in self.keys[i]))
+        return hits[:limit]
+
+    def search(self, query, limit=MAX_RESULTS):
+        return [self.player(i) for i in self.search_ids(query, limit)]
+
+    def club_ids(self, query):
+        q = name_key(query)
+        return [pid for c, key in enumerate(self.club_keys) if q and q in key for pid in self.club_players[c]]
+
+    def club(self, query):
+        return [self.player(i) for i in self.club_ids(query)]
+
+
+def load(path=INDEX_PATH):
+    with open(path, encoding="utf-8") as f:
+        return Searcher(json.load(f))
+
+
+# ── Benchmark ───────────────────────────────────────────────────────────────
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench(repeat=20):
+    """Check index answers against scans of squads.json and time both."""
+    with open(SQUADS_PATH, encoding="utf-8") as f:
+        squads = json.load(f)
+    started = time.perf_counter()
+    index = build_index(squads)
+    print(f"Build: {(time.perf_counter() - started) * 1000:.1f} ms, "
+          f"{len(dumps(index).encode('utf-8')):,d} bytes, {len(index['players'])} players")
+    searcher = Searcher(index)
+    flat = [(p, team_id) for team_id, entry in squads.items() for p in entry.get("players", [])]
+
+    def scan(query):
+        q = name_key(query)
+        return [i for i, (p, _) in enumerate(flat) if q in name_key(p["name"])]
+
+    queries = ["mbappe", "kane", "martinez", "son", "de", "vinicius", "müller", "silva", "ødegaard", "zz"]
+    for q in queries:
+        if sorted(scan(q)) != sorted(searcher.search_ids(q, limit=len(flat))):
+            if len(name_key(q)) >= 3:
+                print(f"✗ search {q!r}: index and scan disagree")
+                return False
+    scan_time = best_of(lambda: [scan(q) for q in queries], repeat) / len(queries)
+    index_time = best_of(lambda: [searcher.search_ids(q) for q in queries], repeat) / len(queries)
+    print(f"  name search   scan {scan_time * 1e6:9.1f} µs   index {index_time * 1e6:7.1f} µs   "
+          f"{scan_time / index_time:5.0f}x")
+
+    clubs = ["Arsenal", "Real Madrid", "Bayern", "Inter"]
+    club_scan = lambda c: [i for i, (p, _) in enumerate(flat) if p.get("club") and name_key(c) in name_key(p["club"])]
+    for c in clubs:
+        if sorted(club_scan(c)) != sorted(searcher.club_ids(c)):
+            print(f"✗ club {c!r}: index and scan disagree")
+            return False
+    scan_time = best_of(lambda: [club_scan(c) for c in clubs], repeat) / len(clubs)
+    index_time = best_of(lambda: [searcher.club_ids(c) for c in clubs], repeat) / len(clubs)
+    print(f"  club lookup   scan {scan_time * 1e6:9.1f} µs   index {index_time * 1e6:7.1f} µs   "
+          f"{scan_time / index_time:5.0f}x")
+
+    # An index built before three teams changed must catch up on all three
+    older = dict(squads)
+    for team_id in list(squads)[:3]:
+        older[team_id] = dict(squads[team_id], players=squads[team_id].get("players", [])[1:])
+    if update_index(build_index(older), squads) != index or update_index(index, squads) != index:
+        print("✗ Incremental update differs from a full build")
+        return False
+    print("✓ Index matches linear scans; incremental update == full build")
+    return True
+
+
+# ── Main ────────────────────────────────────────────────────────────────────
+
+def main():
+    args = sys.argv[1:]
+    command = args[0] if args else None
+    if command == "build":
+        with open(SQUADS_PATH, encoding="utf-8") as f:
+            payload = dumps(build_index(json.load(f)))
+        with open(INDEX_PATH, "w", encoding="utf-8") as f:
+            f.write(payload)
+        print(f"✓ {INDEX_PATH} ({len(payload.encode('utf-8')):,d} bytes)")
+    elif command == "search" and len(args) > 1:
+        for p in load().search(" ".join(args[1:])):
+            print(f"  {p['name']:32s} {p['team']:4s} {p['position'] or '':4s} {p['club'] or ''}")
+    elif command == "bench":
+        sys.exit(0 if bench() else 1)
+    else:
+        sys.exit(__doc__.split("Usage:")[1].rstrip())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,470 @@
+#!/usr/bin/env python3
+"""
+Local record/replay stand-in for Wikipedia and API-Football.
+
+Lets scrape-squads.py and build-team-mapping.py run against recorded
+responses instead of the live services, with injectable latency,
+throttling and failures, so concurrency, retry and rate-limit behaviour
+can be exercised deterministically.
+
+Usage:
+  # Record live responses while proxying (conditional headers are stripped
+  # so full bodies are stored; request headers such as API keys are not)
+  python scripts/replay-server.py record --upstream https://en.wikipedia.org --dir recordings/wiki
+
+  # Seed Wikipedia recordings from a page cache or the benchmark corpus; the
+  # action API responses --incremental needs are derived from the same pages
+  python scripts/replay-server.py import-cache --dir recordings/wiki --cache-dir scripts/.squad-cache
+  python scripts/replay-server.py import-cache --dir recordings/wiki --corpus scripts/bench-corpus.tar.gz
+
+  # Serve recordings, optionally misbehaving
+  python scripts/replay-server.py serve --dir recordings/wiki --port 8765 \\
+      --latency 200 --jitter 50 --rate 2 --burst 2 --quota 100 --fail-rate 0.05 --seed 1
+
+  WIKI_BASE_URL=http://127.0.0.1:8765 python scripts/scrape-squads.py --force
+  WIKI_BASE_URL=http://127.0.0.1:8765 python scripts/scrape-squads.py --incremental
+  API_FOOTBALL_BASE_URL=http://127.0.0.1:8766 python scripts/build-team-mapping.py
+
+Serve options:
+  --latency MS / --jitter MS  Delay every response by latency ± jitter
+  --rate R / --burst B        Token bucket (R requests/s, advertised per minute in
+                              X-RateLimit-*); excess requests get 429 + Retry-After
+  --quota N                   Daily request quota (x-ratelimit-requests-*); 429 once spent
+  --fail-rate P               Answer a fraction P of requests with 503
+  --drop-rate P               Close the connection without answering for a fraction P
+  --seed N                    Seed for jitter and failure injection
+
+GET /__replay/stats returns request counters as JSON.
+"""
+
+import base64
+import email.utils
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import random
+import re
+import socket
+import sys
+import tarfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_PORT = 8765
+STATS_PATH = "/__replay/stats"
+
+# Response headers worth keeping in a recording
+RECORDED_HEADERS = ("content-type", "etag", "last-modified", "cache-control")
+# Request headers never forwarded upstream while recording
+HOP_HEADERS = ("host", "connection", "keep-alive", "accept-encoding", "if-none-match",
+               "if-modified-since", "proxy-connection", "te", "upgrade")
+
+
+def get_option(args, name, default=None):
+    """Return the value following ``name`` in ``args``, or ``default``."""
+    if name in args:
+        idx = args.index(name)
+        if idx + 1 < len(args):
+            return args[idx + 1]
+    return default
+
+
+# ── Recording store ─────────────────────────────────────────────────────────
+
+def request_key(method, path):
+    """Canonical key for a request: method plus path with sorted query."""
+    parts = urllib.parse.urlsplit(path)
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+    return f"{method.upper()} {parts.path}" + (f"?{query}" if query else "")
+
+
+class RecordingStore:
+    """One JSON file per recorded response, named by a hash of its key."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, key):
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest()[:24] + ".json")
+
+    def load(self, key):
+        try:
+            with open(self.path_for(key)) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if "bodyText" in entry:
+            entry["body"] = entry.pop("bodyText").encode("utf-8")
+        else:
+            entry["body"] = base64.b64decode(entry.pop("bodyBase64", ""))
+        return entry
+
+    def save(self, key, status, headers, body):
+        entry = {"key": key, "status": status, "headers": headers}
+        try:
+            entry["bodyText"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            entry["bodyBase64"] = base64.b64encode(body).decode("ascii")
+        tmp = self.path_for(key) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, self.path_for(key))
+
+    def count(self):
+        return sum(1 for name in os.listdir(self.directory) if name.endswith(".json"))
+
+
+# ── Fault injection ─────────────────────────────────────────────────────────
+
+class Faults:
+    """Latency, throttling, quota and failure behaviour shared by all handlers."""
+
+    def __init__(self, latency=0.0, jitter=0.0, rate=None, burst=1, quota=None,
+                 fail_rate=0.0, drop_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate = rate
+        self.burst = burst
+        self.quota = quota
+        self.fail_rate = fail_rate
+        self.drop_rate = drop_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.window_started = self.updated
+        self.window_used = 0
+        self.used = 0
+        self.stats = {"requests": 0, "served": 0, "notModified": 0, "missing": 0,
+                      "throttled": 0, "quotaExceeded": 0, "failed": 0, "dropped": 0, "bytes": 0}
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.stats[name] += n
+
+    def delay(self):
+        with self.lock:
+            spread = self.random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0
+        if self.latency or spread:
+            time.sleep(max(0.0, self.latency + spread))
+
+    def admit(self):
+        """Decide a request's fate: (verdict, headers) with verdict one of
+        "ok", "throttled", "quota", "fail" or "drop"."""
+        with self.lock:
+            headers = {}
+            roll = self.random.random()
+            if roll < self.drop_rate:
+                return "drop", headers
+            if roll < self.drop_rate + self.fail_rate:
+                return "fail", headers
+
+            if self.rate:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                # Headers speak per minute, as API-Football does; the bucket enforces it
+                if now - self.window_started >= 60:
+                    self.window_started, self.window_used = now, 0
+                per_minute = max(1, round(self.rate * 60))
+                headers["X-RateLimit-Limit"] = str(per_minute)
+                if self.tokens < 1:
+                    headers["X-RateLimit-Remaining"] = "0"
+                    headers["Retry-After"] = str(math.ceil((1 - self.tokens) / self.rate))
+                    return "throttled", headers
+                self.tokens -= 1
+                self.window_used += 1
+                headers["X-RateLimit-Remaining"] = str(max(0, per_minute - self.window_used))
+
+            if self.quota is not None:
+                headers["x-ratelimit-requests-limit"] = str(self.quota)
+                if self.used >= self.quota:
+                    headers["x-ratelimit-requests-remaining"] = "0"
+                    return "quota", headers
+                self.used += 1
+                headers["x-ratelimit-requests-remaining"] = str(self.quota - self.used)
+            return "ok", headers
+
+
+# ── HTTP handler ────────────────────────────────────────────────────────────
+
+def make_handler(store, faults, upstream=None):
+    """Build a request handler class; ``upstream`` switches on record mode."""
+
+    class ReplayHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, so clients can reuse connections
+
+        def log_message(self, fmt, *args):
+            pass
+
+        def send(self, status, body=b"", headers=None):
+            self.send_response(status)
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if self.command != "HEAD":
+                self.wfile.write(body)
+            faults.count("bytes", len(body))
+
+        def send_json(self, status, payload, headers=None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send(status, body, {"Content-Type": "application/json", **(headers or {})})
+
+        def do_HEAD(self):
+            self.do_GET()
+
+        def do_GET(self):
+            if self.path == STATS_PATH:
+                with faults.lock:
+                    stats = dict(faults.stats, recordings=store.count())
+                self.send_json(200, stats)
+                return
+
+            faults.count("requests")
+            faults.delay()
+            verdict, limit_headers = faults.admit()
+            if verdict == "drop":
+                faults.count("dropped")
+                self.close_connection = True
+                self.connection.shutdown(socket.SHUT_RDWR)
+                return
+            if verdict == "fail":
+                faults.count("failed")
+                self.send_json(503, {"error": "injected failure"}, {"Retry-After": "1"})
+                return
+            if verdict == "throttled":
+                faults.count("throttled")
+                self.send_json(429, {"errors": {"rateLimit": "Too many requests"}}, limit_headers)
+                return
+            if verdict == "quota":
+                faults.count("quotaExceeded")
+                self.send_json(429, {"errors": {"requests": "Daily quota reached"}}, limit_headers)
+                return
+
+            key = request_key(self.command if self.command != "HEAD" else "GET", self.path)
+            entry = store.load(key)
+            if entry is None and upstream:
+                entry = self.record(key)
+            if entry is None:
+                faults.count("missing")
+                self.send_json(404, {"error": f"no recording for {key}"}, limit_headers)
+                return
+
+            headers = dict(entry["headers"], **limit_headers)
+            etag = entry["headers"].get("ETag")
+            modified = entry["headers"].get("Last-Modified")
+            if (etag and self.headers.get("If-None-Match") == etag) or \
+                    (modified and self.headers.get("If-Modified-Since") == modified):
+                faults.count("notModified")
+                self.send(304, b"", {k: v for k, v in headers.items() if k != "Content-Type"})
+                return
+
+            faults.count("served")
+            self.send(entry["status"], entry["body"], headers)
+
+        def record(self, key):
+            """Forward the request upstream and store the response."""
+            url = upstream.rstrip("/") + self.path
+            forward = {k: v for k, v in self.headers.items() if k.lower() not in HOP_HEADERS}
+            req = urllib.request.Request(url, headers=forward)
+            try:
+                with urllib.request.urlopen(req, timeout=30) as resp:
+                    status, body, resp_headers = resp.status, resp.read(), resp.headers
+            except urllib.error.HTTPError as e:
+                status, body, resp_headers = e.code, e.read(), e.headers
+            except OSError as e:
+                print(f"  ✗ {key}: {e}")
+                return None
+            headers = {}
+            for name in RECORDED_HEADERS:
+                if resp_headers.get(name):
+                    headers[name.title() if name != "etag" else "ETag"] = resp_headers.get(name)
+            store.save(key, status, headers, body)
+            print(f"  ● recorded {status} {key} ({len(body)} bytes)")
+            return {"status": status, "headers": headers, "body": body}
+
+    return ReplayHandler
+
+
+# ── Commands ────────────────────────────────────────────────────────────────
+
+def load_scraper():
+    """Import scripts/scrape-squads.py for its WIKI_PAGES, cache layout and API queries."""
+    if "scrape_squads" in sys.modules:
+        return sys.modules["scrape_squads"]
+    path = os.path.join(SCRIPT_DIR, "scrape-squads.py")
+    spec = importlib.util.spec_from_file_location("scrape_squads", path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["scrape_squads"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+HEADING_RE = re.compile(r'<h([2-6])\b[^>]*?\bid="([^"]+)"[^>]*>(.*?)</h\1>', re.S)
+
+
+def page_sections(html):
+    """[(level, anchor, line, start, end)] for each heading, as prop=sections numbers them.
+
+    A section runs from its heading to the next heading of the same or a
+    higher level, so it includes its subsections.
+    """
+    headings = [
+        (int(m.group(1)), m.group(2), re.sub(r"<[^>]+>", "", m.group(3)).strip(), m.start())
+        for m in HEADING_RE.finditer(html)
+    ]
+    sections = []
+    for i, (level, anchor, line, start) in enumerate(headings):
+        end = next((h[3] for h in headings[i + 1 :] if h[0] <= level), len(html))
+        sections.append((level, anchor, line, start, end))
+    return sections
+
+
+def save_api(store, scraper, params, payload):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    path = urllib.parse.urlsplit(scraper.WIKI_API).path or "/w/api.php"
+    store.save(request_key("GET", f"{path}?{scraper.api_query(params)}"), 200,
+               {"Content-Type": "application/json; charset=utf-8"}, body)
+
+
+def import_api(store, scraper, pages):
+    """Record the action API responses --incremental asks for.
+
+    Each page gets a revision id derived from its content, so re-importing
+    changed pages looks like an edit. Revision lookups are recorded for the
+    full batch in WIKI_PAGES order and for every single title (--team).
+    """
+    revids = {page: int(hashlib.sha256(body).hexdigest()[:8], 16) for page, (body, _) in pages.items()}
+
+    def revision_payload(titles):
+        return {"batchcomplete": True, "query": {
+            "normalized": [{"from": t, "to": t.replace("_", " ")} for t in titles.values() if "_" in t],
+            "pages": [
+                {"title": t.replace("_", " "), "revisions": [{"revid": revids[p]}]}
+                for p, t in titles.items()
+            ],
+        }}
+
+    titles = {page: urllib.parse.unquote(page) for page in scraper.WIKI_PAGES.values() if page in pages}
+    ordered = list(titles)
+    for i in range(0, len(ordered), scraper.API_TITLES_PER_QUERY):
+        batch = {page: titles[page] for page in ordered[i : i + scraper.API_TITLES_PER_QUERY]}
+        save_api(store, scraper, scraper.revisions_params(list(batch.values())), revision_payload(batch))
+    for page, title in titles.items():
+        save_api(store, scraper, scraper.revisions_params([title]), revision_payload({page: title}))
+
+    for page, (body, _) in pages.items():
+        html = body.decode("utf-8", errors="replace")
+        revid = revids[page]
+        sections = page_sections(html)
+        save_api(store, scraper, scraper.sections_params(revid), {"parse": {
+            "title": titles[page].replace("_", " "),
+            "pageid": revid,
+            "sections": [
+                {"toclevel": level - 1, "level": str(level), "line": line, "number": str(index),
+                 "index": str(index), "anchor": anchor}
+                for index, (level, anchor, line, _, _) in enumerate(sections, 1)
+            ],
+        }})
+        for index, (_, _, _, start, end) in enumerate(sections, 1):
+            save_api(store, scraper, scraper.section_text_params(revid, str(index)), {"parse": {
+                "title": titles[page].replace("_", " "),
+                "pageid": revid,
+                "text": f'<div class="mw-parser-output">{html[start:end]}</div>',
+            }})
+
+
+def import_cache(store, cache_dir=None, corpus=None):
+    """Turn cached full pages into /wiki/<page> and action API recordings."""
+    scraper = load_scraper()
+    found = {}
+    if corpus:
+        with tarfile.open(corpus, "r:gz") as tar:
+            for member in tar.getmembers():
+                if member.isfile():
+                    found[member.name] = (tar.extractfile(member).read(), time.time())
+    else:
+        scraper.CACHE_DIR = os.path.abspath(cache_dir)
+        for wiki_page in scraper.WIKI_PAGES.values():
+            html = scraper.read_cached_page(wiki_page, kinds=("page",))
+            if html is not None:
+                path = scraper.cache_paths(wiki_page)[0]
+                name = os.path.basename(scraper.legacy_cache_paths(wiki_page)[0])
+                found[name] = (html.encode("utf-8"), os.path.getmtime(path))
+
+    pages = {}
+    for wiki_page in scraper.WIKI_PAGES.values():
+        name = os.path.basename(scraper.legacy_cache_paths(wiki_page)[0])
+        if name not in found:
+            continue
+        body, mtime = pages[wiki_page] = found[name]
+        store.save(request_key("GET", f"/wiki/{wiki_page}"), 200, {
+            "Content-Type": "text/html; charset=UTF-8",
+            "ETag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+            "Last-Modified": email.utils.formatdate(mtime, usegmt=True),
+        }, body)
+    import_api(store, scraper, pages)
+    print(f"✓ Imported {len(pages)} pages (with API revision and section responses) into {store.directory}")
+
+
+def serve(store, port, faults, upstream=None):
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(store, faults, upstream))
+    server.daemon_threads = True
+    mode = f"recording from {upstream}" if upstream else "replaying"
+    print(f"Replay server on http://127.0.0.1:{port} — {mode} {store.count()} recordings in {store.directory}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n  {json.dumps(faults.stats)}")
+
+
+def main():
+    args = sys.argv[1:]
+    command = args[0] if args and not args[0].startswith("--") else None
+    directory = get_option(args, "--dir")
+    if command not in ("record", "serve", "import-cache") or not directory:
+        print(__doc__)
+        sys.exit(2)
+    store = RecordingStore(directory)
+
+    if command == "import-cache":
+        corpus = get_option(args, "--corpus")
+        cache_dir = get_option(args, "--cache-dir", os.path.join(SCRIPT_DIR, ".squad-cache"))
+        import_cache(store, cache_dir=cache_dir, corpus=corpus)
+        return
+
+    rate = get_option(args, "--rate")
+    quota = get_option(args, "--quota")
+    seed = get_option(args, "--seed")
+    faults = Faults(
+        latency=float(get_option(args, "--latency", 0)) / 1000,
+        jitter=float(get_option(args, "--jitter", 0)) / 1000,
+        rate=float(rate) if rate else None,
+        burst=int(get_option(args, "--burst", 1)),
+        quota=int(quota) if quota else None,
+        fail_rate=float(get_option(args, "--fail-rate", 0)),
+        drop_rate=float(get_option(args, "--drop-rate", 0)),
+        seed=int(seed) if seed is not None else None,
+    )
+    upstream = None
+    if command == "record":
+        upstream = get_option(args, "--upstream")
+        if not upstream:
+            sys.exit("record needs --upstream URL")
+    serve(store, int(get_option(args, "--port", DEFAULT_PORT)), faults, upstream)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,17 +9,89 @@ goals, and current club.
 Usage:
   python scripts/scrape-squads.py                # All 42 confirmed teams
   python scripts/scrape-squads.py --team eng     # Single team (test)
-  python scripts/scrape-squads.py --force        # Ignore 24h cache
+  python scripts/scrape-squads.py --force        # Revalidate every cached page
+  python scripts/scrape-squads.py --concurrency 8  # Fetch up to 8 pages at once
+  python scripts/scrape-squads.py --incremental  # Only squad sections of edited pages
+  python scripts/scrape-squads.py --stream       # Scan pages as they stream in, stop at the tables
+  python scripts/scrape-squads.py --jobs 8       # Parse pages in 8 worker processes
+  python scripts/scrape-squads.py --cache-dir DIR  # Use a pre-populated page cache
+  python scripts/scrape-squads.py --verify-parallel  # Check pool output == serial
+  python scripts/scrape-squads.py --verify-streaming  # Check --stream extraction == full page
+  python scripts/scrape-squads.py --parser fast  # Regex tokenizer instead of HTMLParser
+  python scripts/scrape-squads.py --compare-parsers  # Check/time both parsers on the cache
+  python scripts/scrape-squads.py --metrics m.json  # Per-team / per-stage timing report
+  python scripts/scrape-squads.py --profile      # cProfile the run -> scrape-squads.pstats
+  python scripts/scrape-squads.py --output shards --team eng  # Touch only squads/eng.json
+  python scripts/scrape-squads.py --reshard      # Rebuild shards from squads.json, no fetching
+  python scripts/scrape-squads.py --compact      # Also write columnar squads.compact.json
+  python scripts/scrape-squads.py --deltas       # Append a patch to public/squad-deltas/
+  python scripts/scrape-squads.py --index        # Update the player search index
+  python scripts/scrape-squads.py --watch        # Keep refreshing, soonest fixtures first
+  python scripts/scrape-squads.py cache stats    # Page cache size, compression and age
+  python scripts/scrape-squads.py cache prune --max-mb 32  # Evict least recently used pages
 
 The script caches raw HTML for 24 hours to avoid hammering Wikipedia.
+Cached pages are gzipped under .squad-cache/pages, named by a hash of the
+full page name, and the store is held under SQUAD_CACHE_MAX_MB (default 64)
+by evicting the least recently used pages.
+Once a page is older than that (or with --force) it is revalidated with
+If-None-Match / If-Modified-Since, so unchanged pages cost a 304 rather than
+a full download. Network requests are paced by a per-host token bucket;
+cache hits are not.
+
+--stream reads pages (downloaded or cached) in chunks and looks for the
+squad anchors in a single pass, decoding and scanning only until both
+tables are complete; downloads are still written to the cache in full.
+Memory stays flat however long the article is, and parsing sees only the
+two tables.
+
+--incremental uses the MediaWiki API instead: one batched revision lookup
+for every page, then only the squad sections of pages that were edited
+since the last run are downloaded. Set WIKI_BASE_URL to point either mode
+at a local stand-in server.
+
+Parsed squad tables are cached per team under .squad-cache/parsed, keyed by
+the page content and the parser version, so unchanged pages skip parsing
+entirely, day after day; the date-dependent parts (ages, stale call-up
+tiers) and exclusions are applied to the cached tables on every run.
+
+Output goes to squads.json, to per-team shards under src/data/squads/ with a
+manifest of content hashes, or both (--output, default both). Files are
+written atomically and only when their content changed; a team keeps its
+previous lastUpdated unless its squad actually changed. --compact adds the
+columnar encoding from squad_codec.py (about 4-5x smaller than squads.json).
+--deltas appends a numbered patch from the previous snapshot to the new one
+(see squad_delta.py) whenever anything changed; deltas hash squads.json, so
+they need --output json or both. --index updates the player
+search index (player_index.py), re-deriving only the teams whose rows no
+longer match the per-team content hashes stored in the index.
+
+--watch runs until every team is done, refreshing one team at a time from a
+priority queue built from fixtures.json. A team is refreshed every quarter
+of the time left before its next kickoff (between 30 minutes and a day).
+Teams with no fixture left are refreshed every three days while knockout
+slots are still unresolved, and are dropped once nothing is left for them
+to play. Pages younger than a team's interval come from the cache; older
+ones are revalidated. Each changed squad is written straight away to the
+--output files (its shard and squads.json by default).
 """
 
+import codecs
+import cProfile
+import gzip
+import hashlib
+import heapq
+import html as htmllib
 import json
 import os
 import re
 import sys
+import threading
 import time
+import urllib.error
+import urllib.parse
 import urllib.request
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, date
 from html.parser import HTMLParser
 
@@ -28,10 +100,36 @@ from html.parser import HTMLParser
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
 SQUADS_PATH = os.path.join(PROJECT_DIR, "src", "data", "squads.json")
+SHARDS_DIR = os.path.join(PROJECT_DIR, "src", "data", "squads")  # one <team>.json per team
+MANIFEST_PATH = os.path.join(SHARDS_DIR, "manifest.json")
+COMPACT_PATH = os.path.join(PROJECT_DIR, "src", "data", "squads.compact.json")  # --compact
+INDEX_PATH = os.path.join(PROJECT_DIR, "src", "data", "player-index.json")  # --index
+DATA_DIR = os.path.join(PROJECT_DIR, "src", "data")  # fixtures/teams for --watch, via wcdata
+OUTPUT_MODES = ("json", "shards", "both")
 EXCLUSIONS_PATH = os.path.join(SCRIPT_DIR, "exclusions.json")
 CACHE_DIR = os.path.join(SCRIPT_DIR, ".squad-cache")
-REQUEST_DELAY = 2  # seconds between requests (polite crawling)
+WIKI_BASE = os.environ.get("WIKI_BASE_URL", "https://en.wikipedia.org").rstrip("/")
+WIKI_API = f"{WIKI_BASE}/w/api.php"
+PARSER_VERSION = 2  # Bump when the player dict shape or merge rules change
+API_TITLES_PER_QUERY = 50  # MediaWiki limit for titles= on anonymous requests
+CACHE_TTL = 86400  # seconds before a cached page is revalidated
+CACHE_MAX_BYTES = int(float(os.environ.get("SQUAD_CACHE_MAX_MB", 64)) * 1e6)  # compressed page-cache cap
+CACHE_COMPRESSLEVEL = 6  # gzip level for cached pages (HTML compresses ~6-8x)
+CACHE_READ_CHUNK = 1 << 16  # bytes decompressed per step when reading a cached page
+REQUEST_RATE = 1.0  # sustained requests/sec per host (polite crawling)
+REQUEST_BURST = 2  # requests a host may receive back-to-back before pacing
+DEFAULT_CONCURRENCY = 4  # fetch worker threads
+MAX_RETRIES = 3  # extra attempts after a 429, 5xx or connection error
+RETRY_BACKOFF = 2.0  # seconds, doubled per attempt unless Retry-After says otherwise
+RETRYABLE_STATUS = (429, 500, 502, 503, 504)
+PROFILE_PATH = "scrape-squads.pstats"  # written to the working directory by --profile
 STALE_MONTHS = 12  # Recent call-ups older than this become "potential" tier
+WATCH_LEAD_DIVISOR = 4  # --watch refreshes a team every (time to its next kickoff) / this
+WATCH_MIN_INTERVAL = 1800  # seconds; floor for teams playing now or very soon
+WATCH_MAX_INTERVAL = 86400  # seconds; ceiling for teams with a fixture still to come
+WATCH_IDLE_INTERVAL = 3 * 86400  # teams with no named fixture left while knockout slots are open
+WATCH_POLL = 300  # longest sleep before checking fixtures.json for edits
+MATCH_DURATION = 3 * 3600  # a fixture counts as upcoming until this long after kickoff
 
 # Wikipedia page names for each national team
 WIKI_PAGES = {
@@ -79,6 +177,10 @@ WIKI_PAGES = {
     "pan": "Panama_national_football_team",
 }
 
+# Section anchors searched (in priority order) for each squad table
+CURRENT_SECTION_IDS = ["Current_squad", "Current_roster", "Players", "Squad"]
+RECENT_SECTION_IDS = ["Recent_call-ups", "Recent_callups", "Recent_call_ups"]
+
 MANAGERS = {
     "eng": "Thomas Tuchel", "bra": "Dorival Júnior", "fra": "Didier Deschamps",
     "arg": "Lionel Scaloni", "esp": "Luis de la Fuente", "deu": "Julian Nagelsmann",
@@ -148,6 +250,118 @@ class WikiTableParser(HTMLParser):
             self.current_cell += data
 
 
+def html_table_rows(table_html):
+    """Rows of cell text for a squad table, via WikiTableParser."""
+    parser = WikiTableParser()
+    parser.feed(table_html)
+    return parser.rows
+
+
+# ── Fast-path table tokenizer ───────────────────────────────────────────────
+
+# One match per markup token: end tag, start tag (attributes may quote '>'),
+# comment, or <!...> / <?...> declaration. A '<' that starts none of these
+# is left in the surrounding text, as HTMLParser does.
+_TOKEN_RE = re.compile(
+    r"<(?:(/\s*)?([a-zA-Z][^\s/>]*)((?:\"[^\"]*\"|'[^']*'|[^'\">])*)>|!--.*?-->|[!?][^>]*>)",
+    re.S,
+)
+_ATTR_RE = re.compile(r"""([^\s/=>]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+_CDATA_TAGS = ("script", "style")
+
+
+def _span_attrs(attr_text):
+    """Return (style, class) of a start tag, last occurrence winning."""
+    style = cls = ""
+    for m in _ATTR_RE.finditer(attr_text):
+        name = m.group(1).lower()
+        if name == "style" or name == "class":
+            value = next((v for v in m.group(2, 3, 4) if v is not None), "")
+            if "&" in value:
+                value = htmllib.unescape(value)
+            if name == "style":
+                style = value
+            else:
+                cls = value
+    return style, cls
+
+
+def fast_table_rows(table_html):
+    """Rows of cell text for a squad table, via a single regex scan.
+
+    Produces exactly what WikiTableParser does -- <sup> content and
+    display:none spans (except "bday" spans) are skipped, entities in text
+    are decoded, <script>/<style> bodies are passed through raw -- but only
+    decodes attributes on <span> and builds cells as lists of fragments.
+    """
+    rows = []
+    row = []
+    cell = []
+    in_cell = False
+    sup_depth = 0
+    hidden = False
+    search = _TOKEN_RE.search
+    pos = 0
+    end = len(table_html)
+
+    while pos < end:
+        m = search(table_html, pos)
+        text_end = m.start() if m else end
+        if in_cell and text_end > pos and not (sup_depth or hidden):
+            text = table_html[pos:text_end]
+            cell.append(htmllib.unescape(text) if "&" in text else text)
+        if not m:
+            break
+        pos = m.end()
+        name = m.group(2)
+        if name is None:
+            continue  # Comment or declaration
+        tag = name.lower()
+
+        if not m.group(1):
+            # Start tag
+            if tag == "tr":
+                row = []
+            elif tag == "td" or tag == "th":
+                in_cell = True
+                cell = []
+            elif tag == "sup":
+                sup_depth += 1
+            elif tag == "span":
+                style, cls = _span_attrs(m.group(3))
+                if "display:none" in style or "display: none" in style:
+                    hidden = True
+                if "bday" in cls:
+                    hidden = False
+            elif tag in _CDATA_TAGS:
+                close = re.compile(rf"</{tag}\s*>", re.I).search(table_html, pos)
+                body_end = close.start() if close else end
+                if in_cell and body_end > pos and not (sup_depth or hidden):
+                    cell.append(table_html[pos:body_end])
+                pos = body_end
+                continue
+            if not m.group(3).endswith("/"):
+                continue
+            # Self-closing tag: fall through to the end-tag handling
+
+        if tag == "td" or tag == "th":
+            in_cell = False
+            row.append("".join(cell).strip())
+            cell = []
+        elif tag == "tr":
+            if row:
+                rows.append(row)
+        elif tag == "sup":
+            sup_depth = max(0, sup_depth - 1)
+        elif tag == "span":
+            hidden = False
+
+    return rows
+
+
+TABLE_PARSERS = {"html": html_table_rows, "fast": fast_table_rows}
+
+
 # ── Parsing helpers ─────────────────────────────────────────────────────────
 
 def normalize_position(pos):
@@ -236,16 +450,114 @@ def extract_table(html, after_id):
     return html[table_start : table_end + len("</table>")]
 
 
-def parse_squad_table(table_html):
+SECTION_ANCHOR_RE = re.compile(
+    'id="(' + "|".join(re.escape(i) for i in CURRENT_SECTION_IDS + RECENT_SECTION_IDS) + ')"'
+)
+SECTION_ANCHOR_MAX = max(len(f'id="{i}"') for i in CURRENT_SECTION_IDS + RECENT_SECTION_IDS)
+NO_SQUAD_TABLES = "<!-- no squad tables -->"  # Fragment for pages without either table
+
+
+class SquadTableScanner:
+    """find_squad_tables() over a page fed in text chunks, in a single pass.
+
+    Every candidate anchor from CURRENT_SECTION_IDS and RECENT_SECTION_IDS
+    is matched by one regex as the text streams past; each anchor's first
+    occurrence then waits for the next "<table" and records up to the first
+    "</table>", exactly as extract_table() does. Only the unscanned tail and
+    tables being captured are kept, so memory does not grow with the page.
+    ``done`` turns true once both top-priority tables are complete, when
+    nothing later in the page can change the result.
+    """
+
+    def __init__(self):
+        self.buf = ""
+        self.base = 0  # page offset of buf[0]
+        self.anchor_from = 0  # page offset the next anchor search starts at
+        self.seeking = {}  # section id -> page offset to look for "<table" from
+        self.capturing = {}  # section id -> (table start, offset to look for "</table>" from)
+        self.tables = {}  # section id -> table HTML
+        self.seen = set()
+
+    @property
+    def done(self):
+        return CURRENT_SECTION_IDS[0] in self.tables and RECENT_SECTION_IDS[0] in self.tables
+
+    def feed(self, text):
+        self.buf += text
+        end = self.base + len(self.buf)
+        for m in SECTION_ANCHOR_RE.finditer(self.buf, self.anchor_from - self.base):
+            if m.group(1) not in self.seen:
+                self.seen.add(m.group(1))
+                self.seeking[m.group(1)] = self.base + m.end()
+        # An anchor may straddle the chunk boundary; rescan the last few characters
+        self.anchor_from = max(self.anchor_from, end - SECTION_ANCHOR_MAX + 1)
+
+        for section_id, start in list(self.seeking.items()):
+            i = self.buf.find("<table", start - self.base)
+            if i == -1:
+                self.seeking[section_id] = max(start, end - len("<table") + 1)
+            else:
+                del self.seeking[section_id]
+                self.capturing[section_id] = (self.base + i, self.base + i)
+        for section_id, (start, search_from) in list(self.capturing.items()):
+            i = self.buf.find("</table>", search_from - self.base)
+            if i == -1:
+                self.capturing[section_id] = (start, max(search_from, end - len("</table>") + 1))
+            else:
+                del self.capturing[section_id]
+                self.tables[section_id] = self.buf[start - self.base : i + len("</table>")]
+
+        keep = min([self.anchor_from, *self.seeking.values(), *(s for s, _ in self.capturing.values())])
+        if keep > self.base:
+            self.buf = self.buf[keep - self.base :]
+            self.base = keep
+
+    def result(self):
+        """(current_table, recent_table), as find_squad_tables() returns them."""
+        return tuple(
+            next((self.tables[i] for i in candidates if self.tables.get(i)), None)
+            for candidates in (CURRENT_SECTION_IDS, RECENT_SECTION_IDS)
+        )
+
+    def fragment(self):
+        """The chosen tables under their anchors, which find_squad_tables() reads back unchanged."""
+        parts = []
+        for candidates in (CURRENT_SECTION_IDS, RECENT_SECTION_IDS):
+            section_id = next((i for i in candidates if self.tables.get(i)), None)
+            if section_id:
+                parts.append(f'<div id="{section_id}"></div>\n{self.tables[section_id]}')
+        return "\n".join(parts) or NO_SQUAD_TABLES
+
+
+def scan_text_chunks(chunks):
+    """Feed text ``chunks`` to a SquadTableScanner until it is done; return its fragment."""
+    scanner = SquadTableScanner()
+    for chunk in chunks:
+        scanner.feed(chunk)
+        if scanner.done:
+            break
+    return scanner.fragment()
+
+
+def add_metric(metrics, key, value):
+    """Accumulate ``value`` under ``key`` when a metrics dict is being kept."""
+    if metrics is not None:
+        metrics[key] = metrics.get(key, 0) + value
+
+
+def parse_squad_table(table_html, parser="html", metrics=None):
     """Parse a Wikipedia squad table into player dicts."""
-    parser = WikiTableParser()
-    parser.feed(table_html)
+    started = time.perf_counter()
+    rows = TABLE_PARSERS[parser](table_html)
+    tokenized = time.perf_counter()
+    add_metric(metrics, "tokenizeSeconds", tokenized - started)
+    add_metric(metrics, "rowsParsed", max(0, len(rows) - 1))
 
-    if not parser.rows:
+    if not rows:
         return []
 
     # Detect column layout from header
-    header = [c.lower().strip() for c in parser.rows[0]]
+    header = [c.lower().strip() for c in rows[0]]
 
     # Map column indices
     col_map = {}
@@ -268,7 +580,7 @@ def parse_squad_table(table_html):
             col_map["latest_callup"] = i
 
     players = []
-    for row in parser.rows[1:]:
+    for row in rows[1:]:
         # Skip separator rows (single empty cell)
         if len(row) < 3:
             continue
@@ -309,86 +621,640 @@ def parse_squad_table(table_html):
         except (IndexError, KeyError):
             continue
 
+    add_metric(metrics, "buildSeconds", time.perf_counter() - tokenized)
     return players
 
 
+# ── Rate limiting ───────────────────────────────────────────────────────────
+
+class TokenBucket:
+    """Thread-safe token bucket. acquire() blocks until a request may go out."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                time.sleep((1 - self.tokens) / self.rate)
+                self.tokens = 1
+                self.updated = time.monotonic()
+            self.tokens -= 1
+
+
+_host_buckets = {}
+_host_buckets_lock = threading.Lock()
+
+
+def throttle(url):
+    """Block until the per-host rate limit allows a request to ``url``."""
+    host = urllib.parse.urlsplit(url).netloc
+    with _host_buckets_lock:
+        bucket = _host_buckets.get(host)
+        if bucket is None:
+            bucket = _host_buckets[host] = TokenBucket(REQUEST_RATE, REQUEST_BURST)
+    bucket.acquire()
+
+
+def retry_delay(headers, attempt):
+    """Seconds to wait before retry ``attempt``, honouring Retry-After."""
+    value = headers.get("Retry-After") if headers else None
+    if value and value.strip().isdigit():
+        return min(int(value), 60)
+    return RETRY_BACKOFF * 2 ** attempt
+
+
+def open_url(req, consume=None):
+    """Rate-limited urlopen() that retries throttling, server and connection errors.
+
+    Returns (body, headers), where body is ``consume(resp)`` if given (it is
+    called afresh on each attempt, so a read that fails midway is retried
+    from the start) and the whole response otherwise. Other HTTP errors,
+    including 304, are raised.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        throttle(req.full_url)
+        try:
+            with urllib.request.urlopen(req, timeout=15) as resp:
+                return (consume(resp) if consume else resp.read()), resp.headers
+        except urllib.error.HTTPError as e:
+            if e.code not in RETRYABLE_STATUS or attempt == MAX_RETRIES:
+                raise
+            wait = retry_delay(e.headers, attempt)
+        except (urllib.error.URLError, ConnectionError, TimeoutError):
+            if attempt == MAX_RETRIES:
+                raise
+            wait = retry_delay(None, attempt)
+        fetch_stats.record("retries")
+        time.sleep(wait)
+
+
 # ── Fetching and caching ────────────────────────────────────────────────────
 
-def fetch_wiki_page(wiki_page, force=False):
-    """Fetch a Wikipedia page, with 24h caching."""
-    os.makedirs(CACHE_DIR, exist_ok=True)
-    cache_path = os.path.join(CACHE_DIR, f"{wiki_page[:80]}.html")
+USER_AGENT = "WC2026FanCompanion/1.0 (squad data scraper; polite; contact: github.com/stevehorrigan/wc2026)"
+
+
+class FetchStats:
+    """Thread-safe counters describing how each page request was served."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.cached = 0        # Fresh cache hit, no request made
+        self.revalidated = 0   # Conditional request answered 304
+        self.downloaded = 0    # Full 200 response
+        self.api_calls = 0     # MediaWiki API requests (incremental mode)
+        self.retries = 0       # Requests repeated after 429 / 5xx / connection errors
+        self.bytes = 0         # Body bytes received
+        self.pages = {}        # wiki_page -> {"outcome": ..., "bytes": ...}
+
+    def record(self, outcome=None, nbytes=0, page=None):
+        with self.lock:
+            if outcome:
+                setattr(self, outcome, getattr(self, outcome) + 1)
+            self.bytes += nbytes
+            if page:
+                entry = self.pages.setdefault(page, {"outcome": None, "bytes": 0})
+                entry["bytes"] += nbytes
+                if outcome != "api_calls":
+                    entry["outcome"] = outcome or entry["outcome"]
+
+    def summary(self):
+        api = f", {self.api_calls} API calls" if self.api_calls else ""
+        retries = f", {self.retries} retries" if self.retries else ""
+        return (f"{self.cached} cached, {self.revalidated} revalidated (304), "
+                f"{self.downloaded} downloaded ({self.bytes / 1e6:.2f} MB){api}{retries}")
+
+
+fetch_stats = FetchStats()
+
+
+# ── Page cache ──────────────────────────────────────────────────────────────
+#
+# Pages live under CACHE_DIR/pages as gzip files named by a hash of the full
+# page name, each with a JSON sidecar of validators. A file's mtime is when
+# the page was last fetched or revalidated (the TTL clock); its atime is set
+# explicitly on every read and drives LRU eviction once the store passes
+# CACHE_MAX_BYTES.
+
+_cache_lock = threading.Lock()
+
+
+def cache_key(wiki_page):
+    return hashlib.sha256(wiki_page.encode("utf-8")).hexdigest()[:32]
 
-    if not force and os.path.exists(cache_path):
-        mtime = os.path.getmtime(cache_path)
-        if (time.time() - mtime) < 86400:
-            with open(cache_path) as f:
-                return f.read()
 
-    url = f"https://en.wikipedia.org/wiki/{wiki_page}"
-    req = urllib.request.Request(url, headers={
-        "User-Agent": "WC2026FanCompanion/1.0 (squad data scraper; polite; contact: github.com/stevehorrigan/wc2026)"
+def cache_paths(wiki_page, kind="page"):
+    """Return (data_path, meta_path) for a page (or its "sections") in the cache."""
+    base = os.path.join(CACHE_DIR, "pages", cache_key(wiki_page))
+    if kind != "page":
+        base = f"{base}.{kind}"
+    return f"{base}.html.gz", f"{base}.meta.json"
+
+
+def legacy_cache_paths(wiki_page, kind="page"):
+    """Uncompressed layout used before the page store (names cut at 80 chars)."""
+    base = os.path.join(CACHE_DIR, wiki_page[:80])
+    if kind != "page":
+        base = f"{base}.{kind}"
+    return f"{base}.html", f"{base}.meta.json"
+
+
+def content_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def load_cache_meta(meta_path):
+    """Load sidecar validators for a cached page ({} if missing or corrupt)."""
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_cache_meta(meta_path, meta):
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def iter_cached_text(data_path, chunk_size=CACHE_READ_CHUNK):
+    """Yield a cached page as decoded text chunks, decompressing as it goes.
+
+    Marks the entry as used for LRU eviction. Raises OSError if it is missing.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    with gzip.open(data_path, "rb") as f:
+        os.utime(data_path, (time.time(), os.stat(data_path).st_mtime))
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+def read_cached_text(data_path):
+    """Whole cached page as a string, or None if it is missing or unreadable."""
+    try:
+        return "".join(iter_cached_text(data_path))
+    except (OSError, EOFError):
+        return None
+
+
+def write_cached_text(data_path, text, mtime=None):
+    """Compress ``text`` into the store atomically, then evict down to the cap."""
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+    tmp = f"{data_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as raw:
+        with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=CACHE_COMPRESSLEVEL, mtime=0) as f:
+            f.write(text.encode("utf-8"))
+    os.replace(tmp, data_path)
+    if mtime is not None:
+        os.utime(data_path, (time.time(), mtime))
+    evict_cache()
+
+
+def adopt_legacy_entry(wiki_page, kind="page"):
+    """Move an uncompressed pre-store cache entry into the store, keeping its age."""
+    legacy_data, legacy_meta = legacy_cache_paths(wiki_page, kind)
+    if not os.path.exists(legacy_data):
+        return
+    data_path, meta_path = cache_paths(wiki_page, kind)
+    with open(legacy_data, encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    meta = load_cache_meta(legacy_meta)
+    if meta:
+        meta["page"] = wiki_page
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        save_cache_meta(meta_path, meta)
+    write_cached_text(data_path, text, mtime=os.path.getmtime(legacy_data))
+    for path in (legacy_data, legacy_meta):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+def cache_entries():
+    """Every entry in the page store as dicts of paths, sizes and times."""
+    pages_dir = os.path.join(CACHE_DIR, "pages")
+    entries = []
+    try:
+        names = os.listdir(pages_dir)
+    except OSError:
+        return entries
+    for name in names:
+        if not name.endswith(".html.gz"):
+            continue
+        data_path = os.path.join(pages_dir, name)
+        meta_path = data_path[: -len(".html.gz")] + ".meta.json"
+        try:
+            st = os.stat(data_path)
+            meta_size = os.path.getsize(meta_path) if os.path.exists(meta_path) else 0
+        except OSError:
+            continue  # Evicted by another thread meanwhile
+        entries.append({
+            "data": data_path,
+            "meta": meta_path,
+            "bytes": st.st_size + meta_size,
+            "usedAt": st.st_atime,
+            "fetchedAt": st.st_mtime,
+            "kind": "sections" if name.endswith(".sections.html.gz") else "page",
+        })
+    return entries
+
+
+def evict_cache(max_bytes=None):
+    """Drop least recently used entries until the store fits ``max_bytes``.
+
+    Returns (entries evicted, bytes freed).
+    """
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    with _cache_lock:
+        entries = cache_entries()
+        total = sum(e["bytes"] for e in entries)
+        evicted = freed = 0
+        for entry in sorted(entries, key=lambda e: e["usedAt"]):
+            if total <= max_bytes:
+                break
+            for path in (entry["data"], entry["meta"]):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= entry["bytes"]
+            evicted += 1
+            freed += entry["bytes"]
+    return evicted, freed
+
+
+def fetch_wiki_page(wiki_page, force=False, max_age=CACHE_TTL):
+    """Fetch a Wikipedia page, with 24h caching. Raises on network failure.
+
+    Cache entries older than ``max_age`` seconds (or all of them when forced) are revalidated with the ETag and
+    Last-Modified recorded in the sidecar; a 304 reuses the cached HTML.
+    """
+    cache_path, meta_path = cache_paths(wiki_page)
+    adopt_legacy_entry(wiki_page)
+
+    cached_html = read_cached_text(cache_path)
+    meta = {}
+    if cached_html is not None:
+        if not force and (time.time() - os.path.getmtime(cache_path)) < max_age:
+            fetch_stats.record("cached", page=wiki_page)
+            return cached_html
+        meta = load_cache_meta(meta_path)
+        # Only trust validators that describe the bytes we actually hold
+        if meta.get("sha256") != content_hash(cached_html):
+            meta = {}
+
+    url = f"{WIKI_BASE}/wiki/{wiki_page}"
+    headers = {"User-Agent": USER_AGENT}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("lastModified"):
+        headers["If-Modified-Since"] = meta["lastModified"]
+    req = urllib.request.Request(url, headers=headers)
+
+    try:
+        body, resp_headers = open_url(req)
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not meta:
+            raise
+        os.utime(cache_path)
+        meta["checkedAt"] = int(time.time())
+        save_cache_meta(meta_path, meta)
+        fetch_stats.record("revalidated", page=wiki_page)
+        return cached_html
+
+    html = body.decode("utf-8", errors="replace")
+    write_cached_text(cache_path, html)
+    save_cache_meta(meta_path, {
+        "page": wiki_page,
+        "url": url,
+        "etag": resp_headers.get("ETag"),
+        "lastModified": resp_headers.get("Last-Modified"),
+        "sha256": content_hash(html),
+        "checkedAt": int(time.time()),
     })
+    fetch_stats.record("downloaded", len(body), page=wiki_page)
+    return html
+
 
+def cached_digest(data_path):
+    """sha256 of a cached page's bytes, decompressed in chunks and never decoded."""
+    digest = hashlib.sha256()
     try:
-        with urllib.request.urlopen(req, timeout=15) as resp:
-            html = resp.read().decode("utf-8", errors="replace")
-        with open(cache_path, "w") as f:
-            f.write(html)
-        return html
-    except Exception as e:
-        print(f"    ✗ Failed to fetch: {e}")
+        with gzip.open(data_path, "rb") as f:
+            while True:
+                chunk = f.read(CACHE_READ_CHUNK)
+                if not chunk:
+                    break
+                digest.update(chunk)
+    except (OSError, EOFError):
+        return None
+    return digest.hexdigest()
+
+
+def scan_cached_page(data_path):
+    """Squad-table fragment of a cached page, decompressing only as far as needed."""
+    try:
+        return scan_text_chunks(iter_cached_text(data_path))
+    except (OSError, EOFError):
         return None
 
 
-def scrape_team(team_id, wiki_page, exclusions=None, force=False):
+def spool_response(resp, data_path):
+    """Stream ``resp`` into the page cache while scanning it for squad tables.
+
+    The body is gzipped to the cache in CACHE_READ_CHUNK pieces. Chunks are
+    decoded and scanned only until both tables are complete; the rest is
+    copied through as bytes. Returns (fragment, sha256, bytes read).
+    """
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+    tmp = f"{data_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    scanner = SquadTableScanner()
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    digest = hashlib.sha256()
+    nbytes = 0
+    try:
+        with open(tmp, "wb") as raw:
+            with gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=CACHE_COMPRESSLEVEL, mtime=0) as f:
+                while True:
+                    chunk = resp.read(CACHE_READ_CHUNK)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    digest.update(chunk)
+                    nbytes += len(chunk)
+                    if not scanner.done:
+                        scanner.feed(decoder.decode(chunk))
+        if not scanner.done:
+            scanner.feed(decoder.decode(b"", final=True))
+        os.replace(tmp, data_path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return scanner.fragment(), digest.hexdigest(), nbytes
+
+
+def fetch_squad_tables(wiki_page, force=False, max_age=CACHE_TTL):
+    """Streaming fetch_wiki_page(): a page's squad tables as a small HTML fragment.
+
+    Caching and revalidation work as in fetch_wiki_page(), but neither a
+    download nor a cache hit is ever held or decoded whole: the body is
+    scanned chunk by chunk and decoding stops once both tables are
+    complete. Downloads are still spooled to the cache in full. The
+    fragment parses exactly like the full page.
+    """
+    cache_path, meta_path = cache_paths(wiki_page)
+    adopt_legacy_entry(wiki_page)
+
+    meta = {}
+    if os.path.exists(cache_path):
+        if not force and (time.time() - os.path.getmtime(cache_path)) < max_age:
+            fragment = scan_cached_page(cache_path)
+            if fragment is not None:
+                fetch_stats.record("cached", page=wiki_page)
+                return fragment
+        meta = load_cache_meta(meta_path)
+        # Only trust validators that describe the bytes we actually hold
+        if meta.get("sha256") != cached_digest(cache_path):
+            meta = {}
+
+    url = f"{WIKI_BASE}/wiki/{wiki_page}"
+    headers = {"User-Agent": USER_AGENT}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("lastModified"):
+        headers["If-Modified-Since"] = meta["lastModified"]
+    req = urllib.request.Request(url, headers=headers)
+
+    try:
+        (fragment, sha256, nbytes), resp_headers = open_url(req, lambda resp: spool_response(resp, cache_path))
+    except urllib.error.HTTPError as e:
+        if e.code != 304 or not meta:
+            raise
+        os.utime(cache_path)
+        meta["checkedAt"] = int(time.time())
+        save_cache_meta(meta_path, meta)
+        fetch_stats.record("revalidated", page=wiki_page)
+        return scan_cached_page(cache_path)
+
+    save_cache_meta(meta_path, {
+        "page": wiki_page,
+        "url": url,
+        "etag": resp_headers.get("ETag"),
+        "lastModified": resp_headers.get("Last-Modified"),
+        "sha256": sha256,
+        "checkedAt": int(time.time()),
+    })
+    evict_cache()
+    fetch_stats.record("downloaded", nbytes, page=wiki_page)
+    return fragment
+
+
+# ── Incremental mode (MediaWiki API) ────────────────────────────────────────
+
+def api_query(params):
+    """Query string for an action API call (replay-server.py records the same)."""
+    return urllib.parse.urlencode({**params, "format": "json", "formatversion": "2"})
+
+
+def revisions_params(titles):
+    return {"action": "query", "prop": "revisions", "rvprop": "ids", "redirects": "1", "titles": "|".join(titles)}
+
+
+def sections_params(revid):
+    return {"action": "parse", "oldid": revid, "prop": "sections"}
+
+
+def section_text_params(revid, index):
+    return {
+        "action": "parse",
+        "oldid": revid,
+        "section": index,
+        "prop": "text",
+        "disableeditsection": "1",
+        "disablelimitreport": "1",
+    }
+
+
+def api_get(params, page=None):
+    """Call the MediaWiki action API and return the decoded JSON response.
+
+    ``page`` attributes the response bytes to a wiki page in fetch_stats.
+    """
+    url = f"{WIKI_API}?{api_query(params)}"
+    req = urllib.request.Request(url, headers={"User-Agent": USER_AGENT})
+    body, _ = open_url(req)
+    fetch_stats.record("api_calls", len(body), page=page)
+    data = json.loads(body)
+    if "error" in data:
+        raise RuntimeError(f"API error: {data['error'].get('info', data['error'])}")
+    return data
+
+
+def fetch_revisions(wiki_pages):
+    """Return {wiki_page: latest revision id} in as few API calls as possible.
+
+    Pages that are missing on the wiki are left out of the result.
+    """
+    titles = {page: urllib.parse.unquote(page) for page in wiki_pages}
+    revisions = {}
+    all_titles = list(titles.values())
+    for i in range(0, len(all_titles), API_TITLES_PER_QUERY):
+        batch = all_titles[i : i + API_TITLES_PER_QUERY]
+        query = api_get(revisions_params(batch))["query"]
+        # Follow the API's title normalisation and redirects back to our names
+        renames = {}
+        for step in query.get("normalized", []) + query.get("redirects", []):
+            renames[step["from"]] = step["to"]
+        revids = {
+            p["title"]: p["revisions"][0]["revid"]
+            for p in query.get("pages", [])
+            if p.get("revisions")
+        }
+        for title in batch:
+            resolved = title
+            while resolved in renames:
+                resolved = renames[resolved]
+            if resolved in revids:
+                revisions[title] = revids[resolved]
+    return {page: revisions[title] for page, title in titles.items() if title in revisions}
+
+
+def section_cache_paths(wiki_page):
+    """Return (data_path, meta_path) for a page's cached squad sections."""
+    return cache_paths(wiki_page, "sections")
+
+
+def fetch_squad_sections(wiki_page, revid, force=False):
+    """Fetch only the squad sections of ``wiki_page`` at revision ``revid``.
+
+    Returns an HTML fragment containing the section headings (with their
+    anchor ids) and tables, so parse_team_page() handles it like a full
+    page. Reuses the cached fragment when the revision is unchanged. If no
+    section has a known squad anchor the full page is fetched instead, and
+    its squad-table fragment is cached under the revision all the same.
+    """
+    html_path, meta_path = section_cache_paths(wiki_page)
+    adopt_legacy_entry(wiki_page, "sections")
+
+    if not force and os.path.exists(html_path):
+        meta = load_cache_meta(meta_path)
+        if meta.get("revid") == revid:
+            html = read_cached_text(html_path)
+            if html is not None and meta.get("sha256") == content_hash(html):
+                fetch_stats.record("cached", page=wiki_page)
+                return html
+
+    sections = api_get(sections_params(revid), page=wiki_page)["parse"]["sections"]
+    anchors = {s["anchor"]: s["index"] for s in sections if s.get("index")}
+    wanted = []
+    for candidates in (CURRENT_SECTION_IDS, RECENT_SECTION_IDS):
+        found = next((anchors[a] for a in candidates if a in anchors), None)
+        if found is not None:
+            wanted.append(found)
+    if wanted:
+        parts = [api_get(section_text_params(revid, index), page=wiki_page)["parse"]["text"] for index in wanted]
+        html = "\n".join(parts)
+    else:
+        html = scan_text_chunks([fetch_wiki_page(wiki_page, force=force)])
+
+    write_cached_text(html_path, html)
+    save_cache_meta(meta_path, {
+        "page": wiki_page,
+        "revid": revid,
+        "sections": wanted,
+        "sha256": content_hash(html),
+        "checkedAt": int(time.time()),
+    })
+    fetch_stats.record("downloaded", page=wiki_page)
+    return html
+
+
+def scrape_team(team_id, wiki_page, exclusions=None, force=False, parser="html"):
     """Scrape squad data for one team from Wikipedia."""
-    html = fetch_wiki_page(wiki_page, force=force)
-    if not html:
+    try:
+        html = fetch_wiki_page(wiki_page, force=force)
+    except Exception as e:
+        print(f"    ✗ Failed to fetch: {e}")
         return None
+    return parse_team_page(team_id, html, exclusions=exclusions, parser=parser)
 
-    excluded_names = set()
-    if exclusions:
-        excluded_names = {n.lower() for n in exclusions.get(team_id, [])}
 
-    # Try multiple section IDs for the current squad
-    current_table = None
-    for section_id in ["Current_squad", "Current_roster", "Players", "Squad"]:
-        current_table = extract_table(html, section_id)
-        if current_table:
-            break
+def find_squad_tables(html):
+    """Return (current_table, recent_table) HTML from a page, None if absent."""
+    tables = []
+    for candidates in (CURRENT_SECTION_IDS, RECENT_SECTION_IDS):
+        table = None
+        for section_id in candidates:
+            table = extract_table(html, section_id)
+            if table:
+                break
+        tables.append(table)
+    return tuple(tables)
 
-    current_players = parse_squad_table(current_table) if current_table else []
 
-    # Try to find recent call-ups
-    recent_table = None
-    for section_id in ["Recent_call-ups", "Recent_callups", "Recent_call_ups"]:
-        recent_table = extract_table(html, section_id)
-        if recent_table:
-            break
+def excluded_keys(exclusions, team_id):
+    """name_key() of each excluded player for ``team_id``."""
+    from player_index import name_key  # Sibling module in scripts/
+
+    return {name_key(n) for n in (exclusions or {}).get(team_id, [])}
+
 
-    recent_players = parse_squad_table(recent_table) if recent_table else []
+def merge_players(current_players, recent_players, excluded_names=()):
+    """Merge, tier, sort and cap the two squad tables into the final list.
+
+    Players are deduped and matched against ``excluded_names`` on their
+    accent-folded name_key(), so "Kylian Mbappé (captain)" in the current
+    squad and "Kylian Mbappe" in recent call-ups are the same player. Equal
+    keys with different known dobs are namesakes (Ederson / Éderson) and
+    both are kept.
+    """
+    from player_index import name_key  # Sibling module in scripts/
 
     # Merge: current squad = core, recent call-ups = extended/potential
-    seen_names = set()
+    seen_names = {}  # name_key -> dobs seen under it
     all_players = []
 
+    def is_new(key, dob):
+        dobs = seen_names.setdefault(key, set())
+        if dobs and (dob is None or None in dobs or dob in dobs):
+            return False
+        dobs.add(dob)
+        return True
+
     for p in current_players:
-        key = p["name"].lower()
+        key = name_key(p["name"])
         if key in excluded_names:
             continue
-        if key not in seen_names:
-            seen_names.add(key)
+        if is_new(key, p.get("dob")):
             p["tier"] = "core"
             p.pop("_latest_callup", None)
             all_players.append(p)
 
     for p in recent_players:
-        key = p["name"].lower()
+        key = name_key(p["name"])
         if key in excluded_names:
             continue
-        if key not in seen_names:
-            seen_names.add(key)
+        if is_new(key, p.get("dob")):
             # Downgrade stale call-ups to "potential"
             callup = p.get("_latest_callup", "")
             if is_stale_callup(callup):
@@ -416,60 +1282,819 @@ def scrape_team(team_id, wiki_page, exclusions=None, force=False):
     return all_players
 
 
+def parse_team_tables(html, parser="html", metrics=None):
+    """(current_players, recent_players) parsed from a page's two squad tables.
+
+    Depends only on the HTML and the parser, never on the date or the
+    exclusions, so the result can be cached for as long as the page is
+    unchanged. If ``metrics`` is a dict, stage seconds and row counts are
+    added to it.
+    """
+    started = time.perf_counter()
+    current_table, recent_table = find_squad_tables(html)
+    add_metric(metrics, "extractSeconds", time.perf_counter() - started)
+
+    current_players = parse_squad_table(current_table, parser, metrics) if current_table else []
+    recent_players = parse_squad_table(recent_table, parser, metrics) if recent_table else []
+    return current_players, recent_players
+
+
+def parse_team_tables_metered(html, parser="html"):
+    """parse_team_tables() returning (tables, stage metrics), for worker processes."""
+    metrics = {}
+    return parse_team_tables(html, parser, metrics), metrics
+
+
+def finish_team(team_id, tables, exclusions=None, metrics=None):
+    """Merge parsed ``tables`` into the team's player list as of today.
+
+    Everything that depends on the date (stale call-up tiers, and with them
+    the sort order and the 55-player cap) or on exclusions happens here.
+    ``tables`` is consumed.
+    """
+    started = time.perf_counter()
+    players = merge_players(*tables, excluded_keys(exclusions, team_id))
+    add_metric(metrics, "mergeSeconds", time.perf_counter() - started)
+    return players
+
+
+def parse_team_page(team_id, html, exclusions=None, parser="html", metrics=None):
+    """Build the merged, sorted player list for one team from its page HTML.
+
+    If ``metrics`` is a dict, per-stage seconds and row counts are added to it.
+    """
+    if not html:
+        return None
+    return finish_team(team_id, parse_team_tables(html, parser, metrics), exclusions, metrics)
+
+
+# ── Parsed-result cache ─────────────────────────────────────────────────────
+
+def _source_fingerprint():
+    """Hash of this script and player_index.py (name keys), so any change to the parsing code invalidates."""
+    digest = hashlib.sha256()
+    for path in (os.path.abspath(__file__), os.path.join(SCRIPT_DIR, "player_index.py")):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+SOURCE_FINGERPRINT = _source_fingerprint()
+
+
+def parsed_cache_key(html, parser="html"):
+    """Key for a page's parsed squad tables.
+
+    Covers everything parse_team_tables() depends on: the page content and
+    the parser code and version. The date and the team's exclusions are
+    applied after loading (finish_team), so a daily run reuses yesterday's
+    parse of an unchanged page.
+    """
+    material = json.dumps([PARSER_VERSION, SOURCE_FINGERPRINT, parser, content_hash(html)])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def parsed_cache_path(team_id):
+    return os.path.join(CACHE_DIR, "parsed", f"{team_id}.json")
+
+
+def load_parsed_result(team_id, key):
+    """Return the cached (current, recent) tables for ``team_id`` if its key matches.
+
+    Ages are recomputed, since they depend on the date.
+    """
+    path = parsed_cache_path(team_id)
+    try:
+        with open(path) as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if entry.get("key") != key or not isinstance(entry.get("tables"), list):
+        return None
+    for table in entry["tables"]:
+        for player in table:
+            player["age"] = calc_age(player.get("dob") or "")
+    return tuple(entry["tables"])
+
+
+def save_parsed_result(team_id, key, tables):
+    path = parsed_cache_path(team_id)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"key": key, "tables": tables}, f, ensure_ascii=False)
+
+
+def parse_team_cached(team_id, html, exclusions=None, pool=None, parser="html"):
+    """parse_team_page() behind the parsed-result cache.
+
+    Returns (future, from_cache); the future resolves to (players, metrics).
+    Only the tables are cached; finish_team() runs on every call. On a miss
+    the page is parsed in ``pool`` (a ProcessPoolExecutor) when given,
+    otherwise inline, and the tables are written back to the cache.
+    """
+    done = Future()
+    if not html:
+        done.set_result((None, {}))
+        return done, False
+    key = parsed_cache_key(html, parser)
+    tables = load_parsed_result(team_id, key)
+    if tables is not None:
+        metrics = {}
+        done.set_result((finish_team(team_id, tables, exclusions, metrics), metrics))
+        return done, True
+
+    def finish(f):
+        try:
+            tables, metrics = f.result()
+            save_parsed_result(team_id, key, tables)
+            done.set_result((finish_team(team_id, tables, exclusions, metrics), metrics))
+        except Exception as e:
+            done.set_exception(e)
+
+    if pool is None:
+        parsed = Future()
+        parsed.set_result(parse_team_tables_metered(html, parser))
+        finish(parsed)
+    else:
+        pool.submit(parse_team_tables_metered, html, parser).add_done_callback(finish)
+    return done, False
+
+
+def read_cached_page(wiki_page, kinds=("page", "sections")):
+    """Return whatever HTML the cache holds for a page, without any network."""
+    for kind in kinds:
+        adopt_legacy_entry(wiki_page, kind)
+        html = read_cached_text(cache_paths(wiki_page, kind)[0])
+        if html is not None:
+            return html
+    return None
+
+
+def serialize_squads(squads):
+    return json.dumps(squads, indent=2, ensure_ascii=False)
+
+
+# ── Output ──────────────────────────────────────────────────────────────────
+
+def atomic_write(path, text):
+    """Write ``text`` to ``path`` via a temp file and rename, so readers never see a partial file."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def shard_path(team_id):
+    return os.path.join(SHARDS_DIR, f"{team_id}.json")
+
+
+def load_manifest():
+    """The shard manifest, or None if it is missing or unreadable."""
+    try:
+        with open(MANIFEST_PATH, encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return manifest if isinstance(manifest.get("teams"), dict) else None
+
+
+def load_shards():
+    """Reassemble the squads dict from the shards listed in the manifest.
+
+    Without a readable manifest, every <team>.json in SHARDS_DIR is loaded
+    instead, so a lost manifest never looks like an empty squad set.
+    """
+    manifest = load_manifest()
+    if manifest is not None:
+        team_ids = list(manifest["teams"])
+    else:
+        try:
+            names = os.listdir(SHARDS_DIR)
+        except OSError:
+            names = []
+        team_ids = sorted(name[: -len(".json")] for name in names
+                          if name.endswith(".json") and os.path.join(SHARDS_DIR, name) != MANIFEST_PATH)
+    squads = {}
+    for team_id in team_ids:
+        try:
+            with open(shard_path(team_id), encoding="utf-8") as f:
+                squads[team_id] = json.load(f)
+        except (OSError, ValueError):
+            continue
+    return squads
+
+
+def load_squads(output):
+    """The squads a run writing ``output`` starts from.
+
+    Shards-only runs never read squads.json. With both outputs the shards
+    win for any team whose shard differs (shards are what the app bundles
+    and what --watch updates first), while squads.json keeps the team order.
+    """
+    shards = load_shards() if output in ("shards", "both") else {}
+    if output == "shards" or not os.path.exists(SQUADS_PATH):
+        return shards
+    with open(SQUADS_PATH) as f:
+        squads = json.load(f)
+    squads.update(shards)
+    return squads
+
+
+def write_squads_json(squads):
+    """Write squads.json if its content changed; returns True if it did."""
+    payload = serialize_squads(squads)
+    try:
+        with open(SQUADS_PATH, encoding="utf-8") as f:
+            if f.read() == payload:
+                return False
+    except OSError:
+        pass
+    atomic_write(SQUADS_PATH, payload)
+    return True
+
+
+def write_shards(squads):
+    """Write one file per team plus manifest.json, skipping unchanged content.
+
+    The manifest records each shard's sha256, size, player count and
+    lastUpdated; a shard whose hash matches and whose file is present is left
+    alone. Shards the previous manifest lists for teams no longer in
+    ``squads`` are removed; files it does not list are never touched.
+    Returns the number of shards written.
+    """
+    os.makedirs(SHARDS_DIR, exist_ok=True)
+    previous = (load_manifest() or {}).get("teams", {})
+    teams = {}
+    written = 0
+    for team_id in sorted(squads):
+        payload = serialize_squads(squads[team_id])
+        digest = content_hash(payload)
+        teams[team_id] = {
+            "sha256": digest,
+            "bytes": len(payload.encode("utf-8")),
+            "players": len(squads[team_id].get("players", [])),
+            "lastUpdated": squads[team_id].get("lastUpdated"),
+        }
+        if previous.get(team_id, {}).get("sha256") == digest and os.path.exists(shard_path(team_id)):
+            continue
+        atomic_write(shard_path(team_id), payload)
+        written += 1
+    for team_id in previous:
+        if team_id not in teams:
+            try:
+                os.remove(shard_path(team_id))
+            except OSError:
+                pass
+    if teams != previous or not os.path.exists(MANIFEST_PATH):
+        atomic_write(MANIFEST_PATH, serialize_squads({"version": 1, "teams": teams}))
+    return written
+
+
+def squad_entry(team_id, players, previous, today):
+    """Build a team's squads.json entry from freshly parsed ``players``."""
+    entry = {
+        "lastUpdated": today,
+        "status": "preliminary",
+        "manager": MANAGERS.get(team_id, previous.get("manager")),
+        "players": players,
+    }
+    # An unchanged squad keeps its date so its shard stays byte-identical
+    if previous.get("lastUpdated") and {**previous, "lastUpdated": today} == entry:
+        entry["lastUpdated"] = previous["lastUpdated"]
+    return entry
+
+
+def write_compact(squads):
+    """Write the columnar encoding to COMPACT_PATH if it changed. Returns its size in bytes."""
+    import squad_codec  # Sibling module in scripts/
+
+    payload = squad_codec.dumps(squads)
+    try:
+        with open(COMPACT_PATH, encoding="utf-8") as f:
+            unchanged = f.read() == payload
+    except OSError:
+        unchanged = False
+    if not unchanged:
+        atomic_write(COMPACT_PATH, payload)
+    return len(payload.encode("utf-8"))
+
+
+def write_index(squads):
+    """Update the player search index at INDEX_PATH for ``squads``.
+
+    Teams whose rows match their content hash in the existing index are
+    carried over; the rest are re-derived. Returns the index size in bytes.
+    """
+    import player_index  # Sibling module in scripts/
+
+    try:
+        with open(INDEX_PATH, encoding="utf-8") as f:
+            current = f.read()
+        index = json.loads(current)
+    except (OSError, ValueError):
+        current, index = None, None
+    payload = player_index.dumps(player_index.update_index(index, squads))
+    if payload != current:
+        atomic_write(INDEX_PATH, payload)
+    return len(payload.encode("utf-8"))
+
+
+def verify_parallel(team_ids, exclusions, jobs, parser="html"):
+    """Parse every cached page serially and in a process pool.
+
+    Both results are serialized exactly as squads.json is written and
+    compared byte for byte. Returns True if they are identical.
+    """
+    pages = {t: read_cached_page(WIKI_PAGES[t]) for t in team_ids if t in WIKI_PAGES}
+    pages = {t: html for t, html in pages.items() if html}
+    if not pages:
+        print(f"✗ No cached pages to verify in {CACHE_DIR}; run a scrape or pass --cache-dir")
+        return False
+    print(f"Verifying parallel parse of {len(pages)} cached pages with {jobs} workers")
+
+    serial = {t: parse_team_page(t, html, exclusions=exclusions, parser=parser) for t, html in pages.items()}
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {t: pool.submit(parse_team_page, t, html, exclusions, parser) for t, html in pages.items()}
+        parallel = {t: futures[t].result() for t in pages}
+
+    same = serialize_squads(serial).encode("utf-8") == serialize_squads(parallel).encode("utf-8")
+    if same:
+        print(f"✓ Identical output ({sum(len(p or []) for p in serial.values())} players)")
+    else:
+        for t in pages:
+            if serial[t] != parallel[t]:
+                print(f"  ✗ {t}: parallel output differs")
+    return same
+
+
+def verify_streaming(team_ids, exclusions, parser="html", chunk_sizes=(1, 7, 4096, CACHE_READ_CHUNK)):
+    """Check the streaming scanner against find_squad_tables() on every cached page.
+
+    Each page is fed in several chunk sizes; the tables, and the players
+    parsed from the fragment versus the full page, must be identical. Also
+    reports peak memory and how much of each page the scan had to read.
+    """
+    import tracemalloc
+
+    pages = {t: read_cached_page(WIKI_PAGES[t], kinds=("page",)) for t in team_ids if t in WIKI_PAGES}
+    pages = {t: html for t, html in pages.items() if html}
+    if not pages:
+        print(f"✗ No cached pages to verify in {CACHE_DIR}; run a scrape or pass --cache-dir")
+        return False
+    print(f"Verifying streaming extraction on {len(pages)} cached pages")
+    ok = True
+    consumed = total = 0
+    for team_id, html in pages.items():
+        expected = find_squad_tables(html)
+        for size in chunk_sizes:
+            scanner = SquadTableScanner()
+            for i in range(0, len(html), size):
+                scanner.feed(html[i : i + size])
+                if scanner.done:
+                    consumed += i + size if size == CACHE_READ_CHUNK else 0
+                    break
+            else:
+                consumed += len(html) if size == CACHE_READ_CHUNK else 0
+            if scanner.result() != expected:
+                print(f"  ✗ {team_id}: tables differ with {size}-character chunks")
+                ok = False
+        total += len(html)
+        fragment = scan_text_chunks([html])
+        if parse_team_page(team_id, fragment, exclusions, parser) != parse_team_page(team_id, html, exclusions, parser):
+            print(f"  ✗ {team_id}: players parsed from the fragment differ")
+            ok = False
+
+    def peak(fn):
+        tracemalloc.start()
+        fn()
+        result = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return result
+
+    paths = [cache_paths(WIKI_PAGES[t])[0] for t in pages]
+    full = max(peak(lambda: find_squad_tables(read_cached_text(p))) for p in paths)
+    streamed = max(peak(lambda: scan_cached_page(p)) for p in paths)
+    print(f"  Read {min(consumed, total) / max(total, 1):.0%} of the page text before both tables were complete")
+    print(f"  Peak memory per page: {full / 1e3:,.0f} KB whole-page, {streamed / 1e3:,.0f} KB streaming")
+    if ok:
+        print("✓ Streaming extraction matches find_squad_tables()")
+    return ok
+
+
+def compare_parsers(team_ids, rounds=5):
+    """Run both table parsers over every squad table in the cache.
+
+    Asserts identical parse_squad_table() output for each table and prints
+    the time each parser spends on tokenizing. Returns True if they agree.
+    """
+    tables = []
+    for team_id in team_ids:
+        html = read_cached_page(WIKI_PAGES.get(team_id, ""))
+        if not html:
+            continue
+        for label, table in zip(("current", "recent"), find_squad_tables(html)):
+            if table:
+                tables.append((team_id, label, table))
+    if not tables:
+        print(f"✗ No cached squad tables to compare in {CACHE_DIR}; run a scrape or pass --cache-dir")
+        return False
+    print(f"Comparing parsers on {len(tables)} tables from {len({t for t, _, _ in tables})} cached pages")
+
+    mismatches = 0
+    for team_id, label, table in tables:
+        if parse_squad_table(table, "html") != parse_squad_table(table, "fast"):
+            mismatches += 1
+            print(f"  ✗ {team_id} {label}: outputs differ")
+
+    timings = {}
+    for name, rows_fn in TABLE_PARSERS.items():
+        best = None
+        for _ in range(rounds):
+            start = time.perf_counter()
+            for _, _, table in tables:
+                rows_fn(table)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        timings[name] = best
+        print(f"  {name:4s}: {best * 1000:8.1f} ms (best of {rounds})")
+    if timings.get("fast"):
+        print(f"  speedup: {timings['html'] / timings['fast']:.1f}x")
+
+    if mismatches:
+        print(f"✗ {mismatches} tables differ")
+    else:
+        print("✓ Identical output")
+    return mismatches == 0
+
+
+# ── Watch mode ──────────────────────────────────────────────────────────────
+
+def refresh_interval(team_id, data, now):
+    """Seconds between refreshes of ``team_id`` at time ``now``, or None once it is done.
+
+    The interval shrinks as the team's next kickoff approaches. A team
+    with no fixture naming it is kept at WATCH_IDLE_INTERVAL while any
+    future fixture still has an unresolved side (1A, W73, ...) it might
+    fill, and is done after that.
+    """
+    upcoming = [f.kickoff for f in data.team_fixtures(team_id) if f.kickoff + MATCH_DURATION > now]
+    if upcoming:
+        lead = min(upcoming) - now
+        return min(max(lead / WATCH_LEAD_DIVISOR, WATCH_MIN_INTERVAL), WATCH_MAX_INTERVAL)
+    open_slots = any(
+        f.kickoff + MATCH_DURATION > now and not all(side in data.teams_by_id for side in f.sides)
+        for f in data.fixtures
+    )
+    return WATCH_IDLE_INTERVAL if open_slots else None
+
+
+def format_interval(seconds):
+    if seconds >= 86400:
+        return f"{seconds / 86400:.1f}d"
+    if seconds >= 3600:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 60:.0f}m"
+
+
+def watch(team_ids, exclusions=None, parser="html", index=False, stream=False, output="both"):
+    """Refresh teams from a fixture-ordered priority queue until all are done.
+
+    Each changed squad is written to the ``output`` files straight away, so
+    squads.json and the shards never drift apart. With ``index``, the player
+    search index is updated for each changed team; with ``stream``, pages are
+    read through fetch_squad_tables().
+    """
+    import wcdata  # Sibling module in scripts/
+
+    fixtures_path = os.path.join(DATA_DIR, "fixtures.json")
+    squads = load_squads(output)
+    data = wcdata.Dataset(DATA_DIR)
+    fixtures_mtime = os.path.getmtime(fixtures_path)
+    last_refreshed = {}
+
+    def schedule():
+        now = time.time()
+        queue = []
+        for team_id in team_ids:
+            interval = refresh_interval(team_id, data, now)
+            if team_id in WIKI_PAGES and interval is not None:
+                # Ties (every team at startup) go to the team playing soonest
+                queue.append((last_refreshed.get(team_id, now - interval) + interval, interval, team_id))
+        heapq.heapify(queue)
+        return queue
+
+    queue = schedule()
+    print(f"Watching {len(queue)} teams ({len(team_ids) - len(queue)} already done)")
+    while queue:
+        due, _, team_id = queue[0]
+        now = time.time()
+        if due > now:
+            time.sleep(min(due - now, WATCH_POLL))
+            if os.path.getmtime(fixtures_path) != fixtures_mtime:
+                data = wcdata.Dataset(DATA_DIR)
+                fixtures_mtime = os.path.getmtime(fixtures_path)
+                queue = schedule()
+                print(f"  fixtures.json changed; {len(queue)} teams scheduled")
+            continue
+        heapq.heappop(queue)
+        interval = refresh_interval(team_id, data, now)
+        if interval is None:
+            print(f"  {team_id:4s}: done, no fixtures left")
+            continue
+
+        stamp = time.strftime("%H:%M:%S")
+        try:
+            fetch = fetch_squad_tables if stream else fetch_wiki_page
+            html = fetch(WIKI_PAGES[team_id], max_age=interval)
+            future, _ = parse_team_cached(team_id, html, exclusions=exclusions, parser=parser)
+            players, _ = future.result()
+        except Exception as e:
+            print(f"  {stamp} {team_id:4s}: ✗ {e}; retrying in {format_interval(WATCH_MIN_INTERVAL)}")
+            heapq.heappush(queue, (now + WATCH_MIN_INTERVAL, WATCH_MIN_INTERVAL, team_id))
+            continue
+
+        last_refreshed[team_id] = now
+        if players is None:
+            print(f"  {stamp} {team_id:4s}: ✗ no squad tables found")
+        else:
+            squads[team_id] = squad_entry(team_id, players, squads.get(team_id, {}), date.today().isoformat())
+            written = write_shards(squads) if output in ("shards", "both") else 0
+            if output in ("json", "both"):
+                written += write_squads_json(squads)
+            if written and index:
+                write_index(squads)
+            print(f"  {stamp} {team_id:4s}: {len(players):2d} players, "
+                  f"{'updated' if written else 'unchanged'}; next in {format_interval(interval)}")
+        heapq.heappush(queue, (now + interval, interval, team_id))
+    print("✓ All teams done")
+
+
+# ── Cache maintenance ───────────────────────────────────────────────────────
+
+def format_bytes(n):
+    return f"{n / 1e6:.1f} MB" if n >= 1e6 else f"{n / 1e3:.0f} KB"
+
+
+def gzip_raw_size(path):
+    """Uncompressed size from the gzip trailer, without decompressing."""
+    try:
+        with open(path, "rb") as f:
+            f.seek(-4, os.SEEK_END)
+            return int.from_bytes(f.read(4), "little")
+    except OSError:
+        return 0
+
+
+def cache_stats():
+    """Print what the page store holds and how close it is to the cap."""
+    entries = cache_entries()
+    now = time.time()
+    stored = sum(e["bytes"] for e in entries)
+    raw = sum(gzip_raw_size(e["data"]) for e in entries)
+    pages = sum(1 for e in entries if e["kind"] == "page")
+    legacy = [n for n in os.listdir(CACHE_DIR) if n.endswith((".html", ".meta.json"))] if os.path.isdir(CACHE_DIR) else []
+    parsed_dir = os.path.join(CACHE_DIR, "parsed")
+    parsed = os.listdir(parsed_dir) if os.path.isdir(parsed_dir) else []
+
+    print(f"Page cache in {CACHE_DIR}")
+    print(f"  Entries:   {len(entries)} ({pages} pages, {len(entries) - pages} section fragments)")
+    print(f"  Stored:    {format_bytes(stored)} of {format_bytes(CACHE_MAX_BYTES)} cap "
+          f"({stored / CACHE_MAX_BYTES:.0%})")
+    if raw:
+        print(f"  Raw HTML:  {format_bytes(raw)} ({raw / max(stored, 1):.1f}x compression)")
+    if entries:
+        stale = sum(1 for e in entries if now - e["fetchedAt"] >= CACHE_TTL)
+        oldest = min(e["usedAt"] for e in entries)
+        print(f"  Stale:     {stale} older than {format_interval(CACHE_TTL)} (revalidated on next use)")
+        print(f"  LRU:       least recently used {format_interval(now - oldest)} ago")
+    print(f"  Parsed:    {len(parsed)} team results")
+    if legacy:
+        print(f"  ⚠ {len(legacy)} uncompressed files from the old layout; run 'cache prune' to migrate them")
+
+
+def cache_prune(max_bytes=None):
+    """Migrate old-layout files, drop orphans and evict LRU entries to ``max_bytes``."""
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    migrated = 0
+    for wiki_page in WIKI_PAGES.values():
+        for kind in ("page", "sections"):
+            if os.path.exists(legacy_cache_paths(wiki_page, kind)[0]):
+                adopt_legacy_entry(wiki_page, kind)
+                migrated += 1
+
+    removed = 0
+    pages_dir = os.path.join(CACHE_DIR, "pages")
+    leftovers = [os.path.join(CACHE_DIR, n) for n in os.listdir(CACHE_DIR) if n.endswith((".html", ".meta.json"))]
+    if os.path.isdir(pages_dir):
+        for name in os.listdir(pages_dir):
+            path = os.path.join(pages_dir, name)
+            if name.endswith(".tmp"):
+                leftovers.append(path)
+            elif name.endswith(".meta.json") and not os.path.exists(path[: -len(".meta.json")] + ".html.gz"):
+                leftovers.append(path)
+    parsed_dir = os.path.join(CACHE_DIR, "parsed")
+    if os.path.isdir(parsed_dir):
+        leftovers += [os.path.join(parsed_dir, n) for n in os.listdir(parsed_dir)
+                      if n[: -len(".json")] not in WIKI_PAGES]
+    for path in leftovers:
+        try:
+            os.remove(path)
+            removed += 1
+        except OSError:
+            pass
+
+    evicted, freed = evict_cache(max_bytes)
+    print(f"✓ Migrated {migrated} old-layout entries, removed {removed} stray files, "
+          f"evicted {evicted} entries ({format_bytes(freed)})")
+    cache_stats()
+
+
 # ── Main ────────────────────────────────────────────────────────────────────
 
-def main():
-    args = sys.argv[1:]
-    force = "--force" in args
-    single_team = None
-    if "--team" in args:
-        idx = args.index("--team")
+def get_option(args, name, default=None):
+    """Return the value following ``name`` in ``args``, or ``default``."""
+    if name in args:
+        idx = args.index(name)
         if idx + 1 < len(args):
-            single_team = args[idx + 1]
+            return args[idx + 1]
+    return default
+
+
+def megabytes_option(args, name):
+    """``name``'s value in megabytes as a byte count, or None if it is not given."""
+    value = get_option(args, name)
+    if value is None:
+        return None
+    try:
+        megabytes = float(value)
+    except ValueError:
+        sys.exit(f"{name} expects a size in megabytes, got {value!r}")
+    if not 0 < megabytes < float("inf"):
+        sys.exit(f"{name} must be a positive size in megabytes, got {value!r}")
+    return int(megabytes * 1e6)
+
+
+def write_metrics(path, report):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"  Metrics written to {path}")
+
+
+def run(args):
+    global CACHE_DIR
+    run_started = time.perf_counter()
+    metrics_path = get_option(args, "--metrics")
+    force = "--force" in args
+    single_team = get_option(args, "--team")
+    concurrency = max(1, int(get_option(args, "--concurrency", DEFAULT_CONCURRENCY)))
+    jobs = max(1, int(get_option(args, "--jobs", 1)))
+    incremental = "--incremental" in args
+    stream = "--stream" in args
+    parser = get_option(args, "--parser", "html")
+    if parser not in TABLE_PARSERS:
+        sys.exit(f"Unknown --parser {parser!r} (choose from {', '.join(TABLE_PARSERS)})")
+    CACHE_DIR = os.path.abspath(get_option(args, "--cache-dir", CACHE_DIR))
+    output = get_option(args, "--output", "both")
+    if output not in OUTPUT_MODES:
+        sys.exit(f"Unknown --output {output!r} (choose from {', '.join(OUTPUT_MODES)})")
+    if "--deltas" in args and output == "shards":
+        sys.exit("--deltas chains squads.json snapshots; use --output json or both")
 
     team_ids = [single_team] if single_team else list(WIKI_PAGES.keys())
     today = date.today().isoformat()
 
-    # Load existing squads
-    squads = {}
-    if os.path.exists(SQUADS_PATH):
+    if args[:1] == ["cache"]:
+        command = args[1] if len(args) > 1 else "stats"
+        if command == "stats":
+            cache_stats()
+        elif command == "prune":
+            cache_prune(megabytes_option(args, "--max-mb"))
+        else:
+            sys.exit(f"Unknown cache command {command!r} (choose from stats, prune)")
+        return
+    if "--verify-parallel" in args:
+        ok = verify_parallel(team_ids, load_exclusions(), max(jobs, 2), parser)
+        sys.exit(0 if ok else 1)
+    if "--verify-streaming" in args:
+        sys.exit(0 if verify_streaming(team_ids, load_exclusions(), parser) else 1)
+    if "--compare-parsers" in args:
+        sys.exit(0 if compare_parsers(team_ids) else 1)
+    if "--watch" in args:
+        try:
+            watch(team_ids, load_exclusions(), parser, index="--index" in args, stream="--stream" in args,
+                  output=output)
+        except KeyboardInterrupt:
+            print("\n  Stopped")
+        return
+    if "--reshard" in args:
         with open(SQUADS_PATH) as f:
-            squads = json.load(f)
+            written = write_shards(json.load(f))
+        print(f"✓ {written} shards written to {SHARDS_DIR}")
+        return
+
+    squads = load_squads(output)
+    previous_squads = dict(squads)  # Entries are replaced, never mutated
 
     exclusions = load_exclusions()
 
     print(f"Wikipedia squad scraper — {len(team_ids)} teams")
-    print(f"{'Force mode' if force else 'Using 24h HTML cache'}")
+    print(f"{'Force mode (revalidating every page)' if force else 'Using 24h HTML cache'}, "
+          f"{concurrency} fetch workers, {jobs} parse {'processes' if jobs > 1 else 'process'} ({parser} parser)")
+    if incremental:
+        print(f"Incremental mode via {WIKI_API}")
     if any(exclusions.get(t) for t in team_ids):
         print(f"Exclusions loaded for: {', '.join(t for t in team_ids if exclusions.get(t))}")
     print()
 
     teams_updated = 0
     teams_failed = 0
+    teams_parse_cached = 0
 
-    for i, team_id in enumerate(team_ids):
-        wiki_page = WIKI_PAGES.get(team_id)
-        if not wiki_page:
-            print(f"  ⚠ {team_id}: no Wikipedia page mapping")
+    revisions = {}
+    if incremental:
+        pages = [WIKI_PAGES[t] for t in team_ids if t in WIKI_PAGES]
+        try:
+            revisions = fetch_revisions(pages)
+        except Exception as e:
+            print(f"  ✗ Revision lookup failed ({e}), fetching full pages")
+            incremental = False
+
+    def fetch(wiki_page):
+        started = time.perf_counter()
+        if incremental and wiki_page in revisions:
+            html = fetch_squad_sections(wiki_page, revisions[wiki_page], force=force)
+        elif stream:
+            html = fetch_squad_tables(wiki_page, force=force)
+        else:
+            html = fetch_wiki_page(wiki_page, force=force)
+        return html, time.perf_counter() - started
+
+    # Fetch concurrently; parse as pages arrive; report and merge in WIKI_PAGES order
+    pool = ThreadPoolExecutor(max_workers=concurrency)
+    parse_pool = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 else None
+    pending = {
+        team_id: pool.submit(fetch, WIKI_PAGES[team_id])
+        for team_id in team_ids
+        if team_id in WIKI_PAGES
+    }
+
+    parsing = {}
+    deferred = {}
+    team_metrics = {}
+    for team_id in team_ids:
+        if team_id not in pending:
+            continue
+        wiki_page = WIKI_PAGES[team_id]
+        try:
+            html, fetch_seconds = pending.pop(team_id).result()
+        except Exception as e:
+            parsing[team_id] = (None, False, e)
+            team_metrics[team_id] = {"error": str(e)}
             continue
+        page_stats = fetch_stats.pages.get(wiki_page, {})
+        team_metrics[team_id] = {
+            "fetchSeconds": round(fetch_seconds, 6),
+            "fetch": page_stats.get("outcome"),
+            "cacheHit": page_stats.get("outcome") in ("cached", "revalidated"),
+            "bytesFetched": page_stats.get("bytes", 0),
+            "htmlChars": len(html or ""),
+        }
+        if parse_pool is None:
+            # Parsed inline below, so the parse shows up in parse_wall rather than fetch_wall
+            deferred[team_id] = html
+            parsing[team_id] = (None, False, None)
+            continue
+        future, from_cache = parse_team_cached(team_id, html, exclusions=exclusions, pool=parse_pool, parser=parser)
+        parsing[team_id] = (future, from_cache, None)
+    fetch_wall = time.perf_counter() - run_started
 
-        if i > 0:
-            time.sleep(REQUEST_DELAY)
+    for team_id in team_ids:
+        if team_id not in parsing:
+            print(f"  ⚠ {team_id}: no Wikipedia page mapping")
+            continue
 
         print(f"  {team_id:4s}: ", end="", flush=True)
 
-        players = scrape_team(team_id, wiki_page, exclusions=exclusions, force=force)
+        future, from_cache, error = parsing[team_id]
+        if team_id in deferred:
+            future, from_cache = parse_team_cached(team_id, deferred.pop(team_id), exclusions=exclusions,
+                                                   parser=parser)
+        if error:
+            print(f"    ✗ Failed to fetch: {error}")
+        players, stage_metrics = future.result() if future else (None, {})
+        teams_parse_cached += from_cache
+        team_metrics[team_id].update({
+            "parseCacheHit": from_cache,
+            "stages": {k: round(v, 6) for k, v in stage_metrics.items() if k.endswith("Seconds")},
+            "rowsParsed": stage_metrics.get("rowsParsed", 0),
+            "playersEmitted": len(players) if players is not None else 0,
+        })
 
         if players is not None:
             core_count = sum(1 for p in players if p.get("tier") == "core")
             ext_count = sum(1 for p in players if p.get("tier") == "extended")
 
-            squads[team_id] = {
-                "lastUpdated": today,
-                "status": "preliminary",
-                "manager": MANAGERS.get(team_id, squads.get(team_id, {}).get("manager")),
-                "players": players,
-            }
+            squads[team_id] = squad_entry(team_id, players, squads.get(team_id, {}), today)
             teams_updated += 1
             print(f"{len(players):2d} players (core={core_count}, extended={ext_count})")
         else:
@@ -484,12 +2109,109 @@ def main():
                     "players": [],
                 }
 
+    pool.shutdown()
+    if parse_pool:
+        parse_pool.shutdown()
+    parse_wall = time.perf_counter() - run_started - fetch_wall
+
     # Save
-    with open(SQUADS_PATH, "w") as f:
-        json.dump(squads, f, indent=2, ensure_ascii=False)
+    started = time.perf_counter()
+    payload = serialize_squads(squads) if output != "shards" else ""
+    serialize_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    shards_written = 0
+    if output in ("json", "both"):
+        atomic_write(SQUADS_PATH, payload)
+    if output in ("shards", "both"):
+        shards_written = write_shards(squads)
+    compact_bytes = write_compact(squads) if "--compact" in args else None
+    index_bytes = None
+    if "--index" in args:
+        index_bytes = write_index(squads)
+    delta = None
+    if "--deltas" in args:
+        import squad_delta  # Sibling module in scripts/
+
+        delta = squad_delta.write_delta(previous_squads, squads, today)
+    write_seconds = time.perf_counter() - started
 
     print(f"\n✓ Done. Updated: {teams_updated}, Failed: {teams_failed}")
-    print(f"  Saved to {SQUADS_PATH}")
+    print(f"  Pages: {fetch_stats.summary()}")
+    print(f"  Parsed cache: {teams_parse_cached} of {teams_updated} teams reused")
+    if output in ("json", "both"):
+        print(f"  Saved to {SQUADS_PATH}")
+    if output in ("shards", "both"):
+        print(f"  Shards: {shards_written} rewritten in {SHARDS_DIR}")
+    if compact_bytes is not None:
+        print(f"  Compact: {compact_bytes:,d} bytes in {COMPACT_PATH}")
+    if index_bytes is not None:
+        print(f"  Search index: {index_bytes:,d} bytes in {INDEX_PATH}")
+    if "--deltas" in args:
+        if delta:
+            print(f"  Delta {delta['seq']}: {len(delta['teams'])} teams changed")
+        else:
+            print("  Delta: no changes")
+
+    if metrics_path:
+        def team_total(key):
+            return round(sum(m.get("stages", {}).get(key, 0) for m in team_metrics.values()), 6)
+
+        write_metrics(metrics_path, {
+            "date": today,
+            "options": {
+                "teams": len(team_ids),
+                "force": force,
+                "incremental": incremental,
+                "concurrency": concurrency,
+                "jobs": jobs,
+                "parser": parser,
+            },
+            "wallSeconds": round(time.perf_counter() - run_started, 6),
+            "stages": {
+                "fetch": {
+                    "wallSeconds": round(fetch_wall, 6),
+                    "teamSeconds": round(sum(m.get("fetchSeconds", 0) for m in team_metrics.values()), 6),
+                },
+                "parse": {
+                    "wallSeconds": round(parse_wall, 6),
+                    "extractSeconds": team_total("extractSeconds"),
+                    "tokenizeSeconds": team_total("tokenizeSeconds"),
+                    "buildSeconds": team_total("buildSeconds"),
+                    "mergeSeconds": team_total("mergeSeconds"),
+                },
+                "serialize": {"wallSeconds": round(serialize_seconds, 6), "bytes": len(payload.encode("utf-8"))},
+                "write": {"wallSeconds": round(write_seconds, 6), "output": output, "shardsWritten": shards_written,
+                          "compactBytes": compact_bytes},
+            },
+            "fetch": {
+                "cached": fetch_stats.cached,
+                "revalidated": fetch_stats.revalidated,
+                "downloaded": fetch_stats.downloaded,
+                "apiCalls": fetch_stats.api_calls,
+                "retries": fetch_stats.retries,
+                "bytes": fetch_stats.bytes,
+            },
+            "teamsUpdated": teams_updated,
+            "teamsFailed": teams_failed,
+            "teamsParseCached": teams_parse_cached,
+            "rowsParsed": sum(m.get("rowsParsed", 0) for m in team_metrics.values()),
+            "playersEmitted": sum(m.get("playersEmitted", 0) for m in team_metrics.values()),
+            "teams": team_metrics,
+        })
+
+
+def main():
+    args = sys.argv[1:]
+    if "--profile" not in args:
+        run(args)
+        return
+    # Worker processes (--jobs) are not covered; profile with --jobs 1 for parse detail
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(run, args)
+    finally:
+        profiler.dump_stats(PROFILE_PATH)
+        print(f"  Profile written to {PROFILE_PATH}")
 
 
 if __name__ == "__main__":
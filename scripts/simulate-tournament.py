@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Monte Carlo simulation of the whole tournament, vectorized with NumPy.
+
+Team strength comes from the FIFA ranking in teams.json, turned into an
+Elo-style rating that drops RATING_SLOPE points per place (calibrated so
+the favourite wins roughly 15% of tournaments); each match is two Poisson goal counts whose means depend
+on the rating gap (plus a bonus for host nations playing at home). The
+structure is read from fixtures.json and groups.json: 72 group matches,
+group tables, the 8 best third-placed teams slotted into their R32 pools,
+then the W{n} / L{n} chain through to the final.
+
+Every simulation in a chunk runs at once as rows of NumPy arrays: all group
+matches are drawn in one call, tables come from matrix products, and each
+knockout fixture is one vector operation across the chunk. Chunks run in a
+process pool; each has its own seed spawned from --seed, so results depend
+only on --seed and --sims, never on --jobs.
+
+Completed matches condition the simulation. Put them in a results file
+keyed by match number: group matches as {"home": 2, "away": 1}, knockout
+matches as {"winner": "<team id>"}. The file is checked before anything
+runs. Group scores are imposed directly; a knockout winner is imposed where
+that team plays the match, and every simulated tournament in which it does
+not reach the match is rejected, so the probabilities are conditional on
+all the given results. If no tournament survives, fix the earlier results
+that lead to that match as well.
+
+Group ties are broken on overall points, goal difference, goals scored and
+then lots (head-to-head is not modelled). Third-placed teams are matched to
+their R32 pools by the first valid assignment for each of the 495 possible
+sets of qualifying groups.
+
+Usage:
+  python scripts/simulate-tournament.py                    # 1,000,000 tournaments
+  python scripts/simulate-tournament.py --sims 200000 --seed 7
+  python scripts/simulate-tournament.py --jobs 4           # Worker processes
+  python scripts/simulate-tournament.py --results results.json  # Condition on results
+  python scripts/simulate-tournament.py --out probs.json   # Where to write the table
+"""
+
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import combinations
+
+try:
+    import numpy as np
+except ImportError:
+    sys.exit("simulate-tournament.py needs NumPy: pip install numpy")
+
+import wcdata
+
+# ── Config ──────────────────────────────────────────────────────────────────
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+RESULTS_PATH = os.path.join(PROJECT_DIR, "src", "data", "results.json")  # used if present
+OUT_PATH = os.path.join(PROJECT_DIR, "src", "data", "probabilities.json")
+DEFAULT_SIMS = 1_000_000
+DEFAULT_SEED = 2026
+CHUNK_SIZE = 50_000  # tournaments per worker task; fixes the seed stream
+RATING_TOP = 2100.0  # rating of the world's No. 1
+RATING_SLOPE = 10.0  # rating lost per place down the FIFA ranking
+PLAYOFF_RANKING = 60  # assumed ranking for unresolved play-off places
+BASE_GOALS = 1.3  # mean goals per side between equal teams
+GOAL_SENSITIVITY = 1.3  # log-goal shift per 400 rating points of difference
+HOST_BONUS = 50.0  # rating bonus for a host nation playing in its own country
+HOST_COUNTRIES = {"usa": "USA", "mex": "Mexico", "can": "Canada"}
+ROUNDS = ["r32", "r16", "qf", "sf", "final"]
+
+
+# ── Tournament structure ────────────────────────────────────────────────────
+
+def third_place_table(pools, group_letters):
+    """(4096, len(pools)) array: qualifying-group bitmask -> group index per pool.
+
+    Rows for masks that are not a set of exactly len(pools) groups stay -1.
+    """
+    table = np.full((1 << len(group_letters), len(pools)), -1, dtype=np.int8)
+    for qualified in combinations(range(len(group_letters)), len(pools)):
+        chosen = {}
+
+        def assign(slot):
+            if slot == len(pools):
+                return True
+            for g in sorted(qualified):
+                if g not in chosen.values() and g in pools[slot]:
+                    chosen[slot] = g
+                    if assign(slot + 1):
+                        return True
+                    del chosen[slot]
+            return False
+
+        if not assign(0):
+            letters = "".join(group_letters[g] for g in qualified)
+            raise ValueError(f"No valid third-place assignment when groups {letters} qualify")
+        mask = sum(1 << g for g in qualified)
+        table[mask] = [chosen[s] for s in range(len(pools))]
+    return table
+
+
+def check_results(data, results):
+    """Problems with a results file, as messages (empty if it is usable)."""
+    if not isinstance(results, dict):
+        return ["expected an object keyed by match number"]
+    problems = []
+    fixtures = data.fixtures_by_number
+    team_ids = {t.id for t in data.teams}
+    for key, result in results.items():
+        fixture = fixtures.get(int(key)) if key.isdigit() else None
+        if fixture is None:
+            problems.append(f"{key!r}: no such match number")
+        elif not isinstance(result, dict):
+            problems.append(f"match {key}: expected an object, got {result!r}")
+        elif fixture.round == "group":
+            scores = [result.get(side) for side in ("home", "away")]
+            if set(result) != {"home", "away"} or not all(type(g) is int and g >= 0 for g in scores):
+                problems.append(f'match {key}: group results look like {{"home": 2, "away": 1}}, got {result!r}')
+        elif set(result) != {"winner"}:
+            problems.append(f'match {key}: knockout results look like {{"winner": "<team id>"}}, got {result!r}')
+        elif result["winner"] not in team_ids:
+            problems.append(f"match {key}: unknown team id {result['winner']!r}")
+    return problems
+
+
+def build_structure(data, results):
+    """Compile teams, fixtures and results into plain arrays for the workers."""
+    teams = list(data.teams)
+    team_index = {t.id: i for i, t in enumerate(teams)}
+    ranking = np.array([t.fifa_ranking or PLAYOFF_RANKING for t in teams], dtype=np.float64)
+    rating = RATING_TOP - RATING_SLOPE * (ranking - 1)
+
+    group_letters = sorted(data.groups)
+    groups = np.array([[team_index[t] for t in data.groups[g]] for g in group_letters], dtype=np.int64)
+
+    def host_bonus(venue_id):
+        country = data.venue(venue_id).country
+        bonus = np.zeros(len(teams))
+        for team_id, home in HOST_COUNTRIES.items():
+            if team_id in team_index and home == country:
+                bonus[team_index[team_id]] = HOST_BONUS
+        return bonus
+
+    group_fixtures = sorted(data.round_fixtures("group"), key=lambda f: f.match_number)
+    home = np.array([team_index[f.home_team] for f in group_fixtures])
+    away = np.array([team_index[f.away_team] for f in group_fixtures])
+    bonus = np.array([host_bonus(f.venue)[[h, a]] for f, h, a in zip(group_fixtures, home, away)])
+    diff = (rating[home] + bonus[:, 0] - rating[away] - bonus[:, 1]) / 400
+
+    fixed_cols, fixed_scores = [], []
+    for col, f in enumerate(group_fixtures):
+        result = results.get(str(f.match_number))
+        if result is not None:
+            fixed_cols.append(col)
+            fixed_scores.append((result["home"], result["away"]))
+
+    # Third-place pools in R32 order, e.g. "3ABCDF" -> {A, B, C, D, F}
+    knockout = sorted((f for f in data.fixtures if f.round != "group"), key=lambda f: f.match_number)
+    pools = []
+    for f in knockout:
+        for side in f.sides:
+            if side.startswith("3") and len(side) > 2:
+                pools.append({group_letters.index(g) for g in side[1:]})
+    table = third_place_table(pools, group_letters)
+
+    matches = []
+    pool_slot = 0
+    for f in knockout:
+        refs = []
+        for side in f.sides:
+            if side[0] in "12" and len(side) == 2:
+                refs.append(("place", group_letters.index(side[1]), int(side[0]) - 1))
+            elif side.startswith("3") and len(side) > 2:
+                refs.append(("third", pool_slot))
+                pool_slot += 1
+            elif side[0] in "WL":
+                refs.append((side[0], int(side[1:])))
+            else:
+                refs.append(("team", team_index[side]))
+        winner = results.get(str(f.match_number), {}).get("winner")
+        matches.append({
+            "number": f.match_number,
+            "round": f.round,
+            "refs": refs,
+            "bonus": host_bonus(f.venue),
+            "winner": team_index[winner] if winner else None,
+        })
+
+    return {
+        "team_ids": [t.id for t in teams],
+        "rating": rating,
+        "groups": groups,
+        "group_home": home,
+        "group_away": away,
+        "group_diff": diff,
+        "fixed_cols": np.array(fixed_cols, dtype=np.int64),
+        "fixed_scores": np.array(fixed_scores, dtype=np.int64).reshape(-1, 2),
+        "third_table": table,
+        "matches": matches,
+    }
+
+
+# ── Simulation ──────────────────────────────────────────────────────────────
+
+def goal_means(diff):
+    return BASE_GOALS * np.exp(GOAL_SENSITIVITY * diff), BASE_GOALS * np.exp(-GOAL_SENSITIVITY * diff)
+
+
+def simulate_chunk(structure, n, seed):
+    """Play ``n`` tournaments at once; return (round counts, group-place counts)."""
+    rng = np.random.default_rng(seed)
+    rating = structure["rating"]
+    groups = structure["groups"]
+    num_teams = len(rating)
+    home, away = structure["group_home"], structure["group_away"]
+
+    # Group stage: every match of every tournament in one draw
+    mean_home, mean_away = goal_means(structure["group_diff"])
+    goals_home = rng.poisson(mean_home, size=(n, len(home)))
+    goals_away = rng.poisson(mean_away, size=(n, len(away)))
+    if len(structure["fixed_cols"]):
+        goals_home[:, structure["fixed_cols"]] = structure["fixed_scores"][:, 0]
+        goals_away[:, structure["fixed_cols"]] = structure["fixed_scores"][:, 1]
+
+    at_home = np.zeros((len(home), num_teams), dtype=np.float32)
+    at_home[np.arange(len(home)), home] = 1
+    on_road = np.zeros((len(away), num_teams), dtype=np.float32)
+    on_road[np.arange(len(away)), away] = 1
+    points_home = (3 * (goals_home > goals_away) + (goals_home == goals_away)).astype(np.float32)
+    points_away = (3 * (goals_away > goals_home) + (goals_home == goals_away)).astype(np.float32)
+    gh, ga = goals_home.astype(np.float32), goals_away.astype(np.float32)
+    points = points_home @ at_home + points_away @ on_road
+    scored = gh @ at_home + ga @ on_road
+    conceded = ga @ at_home + gh @ on_road
+    # Points, then goal difference, then goals scored, then a random draw of lots
+    key = points * 1e6 + (scored - conceded + 500) * 1e3 + scored + rng.random((n, num_teams))
+
+    group_keys = key[:, groups]  # (n, groups, 4)
+    order = np.argsort(-group_keys, axis=2)
+    standings = groups[np.arange(len(groups))[None, :, None], order]  # team index by place
+
+    # Best third-placed teams -> R32 pools via the precomputed assignment table
+    thirds = standings[:, :, 2]
+    third_keys = np.take_along_axis(key, thirds, axis=1)
+    pools = structure["third_table"].shape[1]
+    best = np.argsort(-third_keys, axis=1)[:, :pools]
+    mask = np.bitwise_or.reduce(np.left_shift(1, best), axis=1)
+    pool_groups = structure["third_table"][mask].astype(np.int64)  # (n, pools)
+    pool_teams = np.take_along_axis(thirds, pool_groups, axis=1)
+
+    # Knockout rounds, one vector operation per fixture. Tournaments in which
+    # a fixed winner does not reach its match are dropped at the end.
+    winners, losers = {}, {}
+    played = []
+    keep = np.ones(n, dtype=bool)
+
+    def resolve(ref):
+        kind = ref[0]
+        if kind == "place":
+            return standings[:, ref[1], ref[2]]
+        if kind == "third":
+            return pool_teams[:, ref[1]]
+        if kind == "W":
+            return winners[ref[1]]
+        if kind == "L":
+            return losers[ref[1]]
+        return np.full(n, ref[1])
+
+    for match in structure["matches"]:
+        side_home, side_away = resolve(match["refs"][0]), resolve(match["refs"][1])
+        bonus = match["bonus"]
+        diff = (rating[side_home] + bonus[side_home] - rating[side_away] - bonus[side_away]) / 400
+        mean_home, mean_away = goal_means(diff)
+        goals_h = rng.poisson(mean_home)
+        goals_a = rng.poisson(mean_away)
+        shootout = rng.random(n) < 0.5
+        home_wins = (goals_h > goals_a) | ((goals_h == goals_a) & shootout)
+        if match["winner"] is not None:
+            keep &= (side_home == match["winner"]) | (side_away == match["winner"])
+            home_wins = side_home == match["winner"]
+        winner = np.where(home_wins, side_home, side_away)
+        winners[match["number"]] = winner
+        losers[match["number"]] = np.where(home_wins, side_away, side_home)
+        played.append((match["round"], side_home, side_away, winner))
+
+    round_counts = {r: np.zeros(num_teams, dtype=np.int64) for r in ROUNDS + ["champion"]}
+    for round_name, side_home, side_away, winner in played:
+        if round_name in round_counts:
+            round_counts[round_name] += np.bincount(side_home[keep], minlength=num_teams)
+            round_counts[round_name] += np.bincount(side_away[keep], minlength=num_teams)
+        if round_name == "final":
+            round_counts["champion"] += np.bincount(winner[keep], minlength=num_teams)
+    place_counts = np.zeros((num_teams, groups.shape[1]), dtype=np.int64)
+    for place in range(groups.shape[1]):
+        place_counts[:, place] = np.bincount(standings[keep, :, place].ravel(), minlength=num_teams)
+    return round_counts, place_counts, int(keep.sum())
+
+
+def simulate(structure, sims, seed, jobs):
+    """Run ``sims`` tournaments in CHUNK_SIZE pieces across ``jobs`` processes.
+
+    Returns (round counts, group-place counts, tournaments kept).
+    """
+    sizes = [CHUNK_SIZE] * (sims // CHUNK_SIZE) + ([sims % CHUNK_SIZE] if sims % CHUNK_SIZE else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    num_teams = len(structure["rating"])
+    totals = {r: np.zeros(num_teams, dtype=np.int64) for r in ROUNDS + ["champion"]}
+    places = np.zeros((num_teams, structure["groups"].shape[1]), dtype=np.int64)
+    kept = 0
+
+    if jobs > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            chunks = list(pool.map(simulate_chunk, [structure] * len(sizes), sizes, seeds))
+    else:
+        chunks = (simulate_chunk(structure, size, chunk_seed) for size, chunk_seed in zip(sizes, seeds))
+    for round_counts, place_counts, chunk_kept in chunks:
+        for r in totals:
+            totals[r] += round_counts[r]
+        places += place_counts
+        kept += chunk_kept
+    return totals, places, kept
+
+
+# ── Main ────────────────────────────────────────────────────────────────────
+
+def get_option(args, name, default=None):
+    """Return the value following ``name`` in ``args``, or ``default``."""
+    if name in args:
+        idx = args.index(name)
+        if idx + 1 < len(args):
+            return args[idx + 1]
+    return default
+
+
+def int_option(args, name, default, minimum):
+    value = get_option(args, name, default)
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        sys.exit(f"{name} expects a whole number, got {value!r}")
+    if number < minimum:
+        sys.exit(f"{name} must be at least {minimum}, got {number}")
+    return number
+
+
+def main():
+    args = sys.argv[1:]
+    options = ("--sims", "--seed", "--jobs", "--results", "--out")
+    unknown = [a for i, a in enumerate(args) if a not in options and (i == 0 or args[i - 1] not in options)]
+    if unknown or (args and args[-1] in options):
+        sys.exit(__doc__.split("Usage:")[1].rstrip())
+    sims = int_option(args, "--sims", DEFAULT_SIMS, 1)
+    seed = int_option(args, "--seed", DEFAULT_SEED, 0)
+    jobs = int_option(args, "--jobs", os.cpu_count() or 1, 1)
+    results_path = get_option(args, "--results", RESULTS_PATH)
+    out_path = get_option(args, "--out", OUT_PATH)
+
+    results = {}
+    if os.path.exists(results_path):
+        try:
+            with open(results_path) as f:
+                results = json.load(f)
+        except ValueError as e:
+            sys.exit(f"✗ {results_path} is not valid JSON: {e}")
+    elif results_path != RESULTS_PATH:
+        sys.exit(f"✗ No results file at {results_path}")
+
+    data = wcdata.load()
+    problems = check_results(data, results)
+    if problems:
+        sys.exit(f"✗ {results_path}:\n" + "\n".join(f"  {p}" for p in problems))
+    structure = build_structure(data, results)
+    print(f"Simulating {sims:,d} tournaments (seed {seed}, {jobs} "
+          f"{'processes' if jobs > 1 else 'process'}, {len(results)} results fixed)")
+
+    started = time.perf_counter()
+    totals, places, kept = simulate(structure, sims, seed, jobs)
+    elapsed = time.perf_counter() - started
+    print(f"✓ Done in {elapsed:.1f}s ({sims / elapsed:,.0f} tournaments/s)")
+    if not kept:
+        sys.exit("✗ No simulated tournament matches the fixed knockout results; "
+                 "add the results of the matches that lead to them")
+    if kept < sims:
+        print(f"  {kept:,d} tournaments ({kept / sims:.1%}) match the fixed knockout results")
+
+    report = {
+        "generated": date.today().isoformat(),
+        "simulations": sims,
+        "accepted": kept,
+        "seed": seed,
+        "resultsFixed": len(results),
+        "teams": {},
+    }
+    for i, team_id in enumerate(structure["team_ids"]):
+        entry = {"groupPosition": [round(c / kept, 5) for c in places[i]]}
+        for r in totals:
+            entry[r] = round(int(totals[r][i]) / kept, 5)
+        report["teams"][team_id] = entry
+    with open(out_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"  Saved to {out_path}")
+
+    print(f"\n  {'team':12s} {'R32':>6s} {'R16':>6s} {'QF':>6s} {'SF':>6s} {'final':>6s} {'win':>6s}")
+    ranked = sorted(report["teams"].items(), key=lambda kv: -kv[1]["champion"])
+    for team_id, entry in ranked[:10]:
+        cells = " ".join(f"{entry[r] * 100:5.1f}%" for r in ROUNDS + ["champion"])
+        print(f"  {team_id:12s} {cells}")
+
+
+if __name__ == "__main__":
+    main()
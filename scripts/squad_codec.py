@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Compact columnar encoding for squads.json.
+
+squads.json stores every player as a dict that repeats the same nine keys.
+The compact form keeps each team's players column by column instead:
+
+  - position and tier are small integer codes into enum tables
+  - dob is a day offset from DOB_EPOCH
+  - club is an index into one string table shared by every team
+  - number is null where the player has no squad number
+
+decode_squads() rebuilds the exact dict shape (and key order) of
+squads.json, so json.dumps of the decoded data is byte-identical to the
+original file.
+
+Usage:
+  python scripts/squad_codec.py check            # Round-trip, size and parse-time report
+  python scripts/squad_codec.py encode [SRC] [DEST]  # squads.json -> squads.compact.json
+  python scripts/squad_codec.py decode [SRC] [DEST]  # squads.compact.json -> squads.json
+"""
+
+import gzip
+import json
+import os
+import sys
+import time
+from collections import Counter
+from datetime import date
+
+# ── Config ──────────────────────────────────────────────────────────────────
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+SQUADS_PATH = os.path.join(PROJECT_DIR, "src", "data", "squads.json")
+COMPACT_PATH = os.path.join(PROJECT_DIR, "src", "data", "squads.compact.json")
+FORMAT = "squads-columnar"
+FORMAT_VERSION = 1
+DOB_EPOCH = date(1970, 1, 1)
+
+# Player keys in the order scrape-squads.py emits them; "number" is optional
+FIELDS = ("name", "position", "age", "dob", "caps", "goals", "club", "number", "tier")
+OPTIONAL_FIELDS = ("number",)
+
+# Codes for the enum columns; values outside these lists are appended per file
+POSITIONS = ["GK", "DEF", "MID", "FWD"]
+TIERS = ["core", "extended", "potential"]
+
+
+# ── Encoding ────────────────────────────────────────────────────────────────
+
+def dob_offset(dob):
+    """Days since DOB_EPOCH, or the string itself if it is not a real date."""
+    if dob is None:
+        return None
+    try:
+        return (date.fromisoformat(dob) - DOB_EPOCH).days
+    except ValueError:
+        return dob
+
+
+def check_player_keys(team_id, player):
+    keys = [k for k in FIELDS if k in player or k not in OPTIONAL_FIELDS]
+    if list(player) != keys or any(player[k] is None for k in OPTIONAL_FIELDS if k in player):
+        raise ValueError(f"{team_id}: player {player.get('name')!r} has keys {list(player)}, "
+                         f"which the columnar format cannot represent")
+
+
+def encode_squads(squads):
+    """Encode a squads.json dict into the compact columnar structure."""
+    positions = list(POSITIONS)
+    tiers = list(TIERS)
+    club_counts = Counter()
+    for team_id, team in squads.items():
+        for p in team.get("players", []):
+            check_player_keys(team_id, p)
+            if p["club"] is not None:
+                club_counts[p["club"]] += 1
+            if p["position"] not in positions:
+                positions.append(p["position"])
+            if p["tier"] not in tiers:
+                tiers.append(p["tier"])
+
+    # Most common clubs get the shortest indices
+    clubs = sorted(club_counts, key=lambda c: (-club_counts[c], c))
+    club_index = {c: i for i, c in enumerate(clubs)}
+    position_index = {v: i for i, v in enumerate(positions)}
+    tier_index = {v: i for i, v in enumerate(tiers)}
+
+    teams = {}
+    for team_id, team in squads.items():
+        players = team.get("players", [])
+        columns = {
+            "name": [p["name"] for p in players],
+            "position": [position_index[p["position"]] for p in players],
+            "age": [p["age"] for p in players],
+            "dob": [dob_offset(p["dob"]) for p in players],
+            "caps": [p["caps"] for p in players],
+            "goals": [p["goals"] for p in players],
+            "club": [club_index.get(p["club"]) for p in players],
+            "number": [p.get("number") for p in players],
+            "tier": [tier_index[p["tier"]] for p in players],
+        }
+        # Keep the team's own key order so decoding restores it exactly
+        teams[team_id] = {k: (columns if k == "players" else v) for k, v in team.items()}
+
+    return {
+        "format": FORMAT,
+        "version": FORMAT_VERSION,
+        "dobEpoch": DOB_EPOCH.isoformat(),
+        "positions": positions,
+        "tiers": tiers,
+        "clubs": clubs,
+        "teams": teams,
+    }
+
+
+def dumps(squads):
+    """Encode ``squads`` and serialize it as minified JSON."""
+    return json.dumps(encode_squads(squads), ensure_ascii=False, separators=(",", ":"))
+
+
+# ── Decoding ────────────────────────────────────────────────────────────────
+
+def decode_squads(compact):
+    """Rebuild the squads.json dict from the compact structure."""
+    if compact.get("format") != FORMAT or compact.get("version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported format {compact.get('format')!r} v{compact.get('version')}")
+    epoch = date.fromisoformat(compact["dobEpoch"]).toordinal()
+    positions = compact["positions"]
+    tiers = compact["tiers"]
+    clubs = compact["clubs"]
+    dobs = {}  # offset -> ISO date; birthdays repeat across squads
+
+    def dob(value):
+        if value is None or isinstance(value, str):
+            return value
+        iso = dobs.get(value)
+        if iso is None:
+            iso = dobs[value] = date.fromordinal(epoch + value).isoformat()
+        return iso
+
+    squads = {}
+    for team_id, team in compact["teams"].items():
+        entry = {}
+        for key, value in team.items():
+            if key != "players":
+                entry[key] = value
+                continue
+            players = []
+            for name, pos, age, born, caps, goals, club, number, tier in zip(
+                value["name"], value["position"], value["age"], value["dob"], value["caps"],
+                value["goals"], value["club"], value["number"], value["tier"],
+            ):
+                player = {
+                    "name": name,
+                    "position": positions[pos],
+                    "age": age,
+                    "dob": dob(born),
+                    "caps": caps,
+                    "goals": goals,
+                    "club": clubs[club] if club is not None else None,
+                }
+                if number is not None:
+                    player["number"] = number
+                player["tier"] = tiers[tier]
+                players.append(player)
+            entry[key] = players
+        squads[team_id] = entry
+    return squads
+
+
+def loads(text):
+    return decode_squads(json.loads(text))
+
+
+def load(path=COMPACT_PATH):
+    with open(path, encoding="utf-8") as f:
+        return loads(f.read())
+
+
+# ── Check ───────────────────────────────────────────────────────────────────
+
+def best_of(fn, rounds=20):
+    best = float("inf")
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def check(path=SQUADS_PATH):
+    """Round-trip ``path`` through the codec and report size and parse time."""
+    with open(path, encoding="utf-8") as f:
+        original = f.read()
+    squads = json.loads(original)
+    compact = dumps(squads)
+    restored = json.dumps(loads(compact), indent=2, ensure_ascii=False)
+    ok = restored == original
+
+    minified = json.dumps(squads, ensure_ascii=False, separators=(",", ":"))
+    print(f"{'':18s} {'bytes':>10s} {'gzip':>9s}")
+    for label, text in (("squads.json", original), ("minified", minified), ("compact", compact)):
+        data = text.encode("utf-8")
+        print(f"  {label:16s} {len(data):10,d} {len(gzip.compress(data, 9, mtime=0)):9,d}")
+    ratio = len(original.encode("utf-8")) / len(compact.encode("utf-8"))
+    print(f"  size: {ratio:.1f}x smaller than squads.json")
+
+    full_parse = best_of(lambda: json.loads(original))
+    compact_parse = best_of(lambda: json.loads(compact))
+    compact_decode = best_of(lambda: loads(compact))
+    print(f"  parse squads.json:        {full_parse * 1000:7.2f} ms")
+    print(f"  parse compact:            {compact_parse * 1000:7.2f} ms ({full_parse / compact_parse:.1f}x faster)")
+    print(f"  parse + decode compact:   {compact_decode * 1000:7.2f} ms")
+
+    if ok:
+        print("✓ Lossless round trip")
+    else:
+        print("✗ Decoded data differs from the original")
+    return ok
+
+
+# ── Main ────────────────────────────────────────────────────────────────────
+
+def main():
+    args = sys.argv[1:]
+    command = args[0] if args else "check"
+    if command == "check":
+        sys.exit(0 if check(args[1] if len(args) > 1 else SQUADS_PATH) else 1)
+    if command == "encode":
+        src = args[1] if len(args) > 1 else SQUADS_PATH
+        dest = args[2] if len(args) > 2 else COMPACT_PATH
+        with open(src, encoding="utf-8") as f:
+            text = dumps(json.load(f))
+    elif command == "decode":
+        src = args[1] if len(args) > 1 else COMPACT_PATH
+        dest = args[2] if len(args) > 2 else SQUADS_PATH
+        text = json.dumps(load(src), indent=2, ensure_ascii=False)
+    else:
+        sys.exit(f"Unknown command {command!r} (choose from check, encode, decode)")
+    with open(dest, "w", encoding="utf-8") as f:
+        f.write(text)
+    print(f"✓ {src} -> {dest} ({len(text.encode('utf-8')):,d} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+"""
+Version-to-version delta patches for squads.json.
+
+Each refresh that changes the squads writes one numbered delta describing
+how to turn the previous snapshot into the new one, so clients holding an
+older copy can catch up by applying a few small patches instead of
+downloading every squad again.
+
+Players are matched by a stable key of name plus dob. A team's delta lists
+team fields that changed, removed player keys, per-player field changes
+("set" / "unset"), added players, and the new player order when sorting
+moved anyone. Every delta carries the sha256 of the snapshot it applies to
+and of the snapshot it produces; index.json lists the retained chain.
+
+A delta's base must be the previous delta's result. If squads.json changed
+without a delta being written (a run without --deltas, a hand edit), the
+chain cannot be bridged: the retained deltas are dropped and a new epoch
+starts from the current snapshot. Clients whose copy does not match the
+base of any delta in the current epoch refetch squads.json.
+
+Usage:
+  python scripts/squad_delta.py verify BASE.json      # BASE + deltas == squads.json
+  python scripts/squad_delta.py diff OLD.json NEW.json  # Print the delta between two files
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+# ── Config ──────────────────────────────────────────────────────────────────
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+SQUADS_PATH = os.path.join(PROJECT_DIR, "src", "data", "squads.json")
+DELTAS_DIR = os.path.join(PROJECT_DIR, "public", "squad-deltas")
+DELTA_KEEP = 60  # deltas retained in the chain; older clients refetch everything
+FORMAT_VERSION = 1
+
+
+def serialize(squads):
+    """Serialize exactly as scrape-squads.py writes squads.json."""
+    return json.dumps(squads, indent=2, ensure_ascii=False)
+
+
+def snapshot_hash(squads):
+    return hashlib.sha256(serialize(squads).encode("utf-8")).hexdigest()
+
+
+def player_key(player):
+    return f"{player['name']}|{player.get('dob') or ''}"
+
+
+# ── Diff ────────────────────────────────────────────────────────────────────
+
+def diff_player(old, new):
+    """Field-level change from ``old`` to ``new``, or None if they are equal."""
+    if old == new:
+        return None
+    change = {}
+    changed = {k: v for k, v in new.items() if k not in old or old[k] != v}
+    removed = [k for k in old if k not in new]
+    if changed:
+        change["set"] = changed
+    if removed:
+        change["unset"] = removed
+    if list(apply_player(old, change)) != list(new):
+        return {"replace": new}  # Key order moved; send the whole player
+    return change
+
+
+def diff_team(old, new):
+    """Delta turning team entry ``old`` into ``new``, or None if they are equal."""
+    if old == new:
+        return None
+    if old is None or new is None:
+        return {"replace": new}
+    old_players = old.get("players", [])
+    new_players = new.get("players", [])
+    old_by_key = {player_key(p): p for p in old_players}
+    new_by_key = {player_key(p): p for p in new_players}
+    if len(old_by_key) != len(old_players) or len(new_by_key) != len(new_players) or list(old) != list(new):
+        return {"replace": new}  # Ambiguous player keys or reshaped entry
+
+    delta = {}
+    fields = {k: v for k, v in new.items() if k != "players" and old.get(k) != v}
+    if fields:
+        delta["fields"] = fields
+    removed = [k for k in old_by_key if k not in new_by_key]
+    if removed:
+        delta["removed"] = removed
+    changed = {}
+    for key, player in new_by_key.items():
+        if key in old_by_key:
+            change = diff_player(old_by_key[key], player)
+            if change:
+                changed[key] = change
+    if changed:
+        delta["changed"] = changed
+    added = [p for k, p in new_by_key.items() if k not in old_by_key]
+    if added:
+        delta["added"] = added
+    new_order = list(new_by_key)
+    if [k for k in old_by_key if k in new_by_key] + [player_key(p) for p in added] != new_order:
+        delta["order"] = new_order
+    return delta
+
+
+def diff_squads(old, new):
+    """Per-team deltas from snapshot ``old`` to ``new`` (empty dict if equal)."""
+    teams = {}
+    for team_id in list(old) + [t for t in new if t not in old]:
+        change = diff_team(old.get(team_id), new.get(team_id))
+        if change is not None:
+            teams[team_id] = change
+    return teams
+
+
+# ── Apply ───────────────────────────────────────────────────────────────────
+
+def apply_player(player, change):
+    if "replace" in change:
+        return dict(change["replace"])
+    result = {k: v for k, v in player.items() if k not in change.get("unset", ())}
+    result.update(change.get("set", {}))
+    return result
+
+
+def apply_team(team, change):
+    if "replace" in change:
+        return change["replace"]
+    removed = set(change.get("removed", ()))
+    changed = change.get("changed", {})
+    players = [
+        apply_player(p, changed[player_key(p)]) if player_key(p) in changed else p
+        for p in team.get("players", [])
+        if player_key(p) not in removed
+    ]
+    players.extend(change.get("added", ()))
+    if "order" in change:
+        by_key = {player_key(p): p for p in players}
+        players = [by_key[k] for k in change["order"]]
+    result = {}
+    for key, value in team.items():
+        result[key] = players if key == "players" else change.get("fields", {}).get(key, value)
+    return result
+
+
+def apply_delta(squads, delta):
+    """Return a new snapshot with ``delta`` applied to ``squads``."""
+    result = {}
+    for team_id, team in squads.items():
+        change = delta["teams"].get(team_id)
+        if change is None:
+            result[team_id] = team
+        else:
+            team = apply_team(team, change)
+            if team is not None:
+                result[team_id] = team
+    for team_id, change in delta["teams"].items():
+        if team_id not in squads and change.get("replace") is not None:
+            result[team_id] = change["replace"]
+    if "order" in delta:
+        result = {t: result[t] for t in delta["order"]}
+    return result
+
+
+def make_delta(old, new, seq, today, epoch=0):
+    delta = {
+        "version": FORMAT_VERSION,
+        "epoch": epoch,
+        "seq": seq,
+        "date": today,
+        "base": snapshot_hash(old),
+        "result": snapshot_hash(new),
+        "teams": diff_squads(old, new),
+    }
+    if list(apply_delta(old, delta)) != list(new):
+        delta["order"] = list(new)
+    return delta
+
+
+# ── Delta chain ─────────────────────────────────────────────────────────────
+
+def delta_path(seq):
+    return os.path.join(DELTAS_DIR, f"{seq:06d}.json")
+
+
+def load_index():
+    try:
+        with open(os.path.join(DELTAS_DIR, "index.json"), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"version": FORMAT_VERSION, "epoch": 0, "latest": 0, "snapshot": None, "deltas": []}
+
+
+def write_json(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def write_delta(old, new, today):
+    """Append the delta from ``old`` to ``new`` to the chain.
+
+    The delta is applied back onto ``old`` and compared byte for byte with
+    ``new`` before anything is written. When ``old`` is not the snapshot the
+    chain last produced, the chain restarts in a new epoch. Returns the
+    delta, or None when the snapshots are identical.
+    """
+    if serialize(old) == serialize(new):
+        return None
+    index = load_index()
+    seq = index["latest"] + 1
+    epoch = index.get("epoch", 0)
+    entries = index["deltas"]
+    if index["snapshot"] is not None and index["snapshot"] != snapshot_hash(old):
+        print(f"  ⚠ squads.json is not the last delta's result; starting delta epoch {epoch + 1}")
+        epoch += 1
+        for dropped in entries:
+            try:
+                os.remove(delta_path(dropped["seq"]))
+            except OSError:
+                pass
+        entries = []
+    delta = make_delta(old, new, seq, today, epoch)
+    if serialize(apply_delta(old, delta)) != serialize(new):
+        raise RuntimeError(f"delta {seq} does not reproduce the new snapshot")
+
+    os.makedirs(DELTAS_DIR, exist_ok=True)
+    write_json(delta_path(seq), delta)
+    entries = entries + [{
+        "seq": seq,
+        "base": delta["base"],
+        "result": delta["result"],
+        "bytes": os.path.getsize(delta_path(seq)),
+    }]
+    for dropped in entries[:-DELTA_KEEP]:
+        try:
+            os.remove(delta_path(dropped["seq"]))
+        except OSError:
+            pass
+    write_json(os.path.join(DELTAS_DIR, "index.json"), {
+        "version": FORMAT_VERSION,
+        "epoch": epoch,
+        "latest": seq,
+        "snapshot": delta["result"],
+        "deltas": entries[-DELTA_KEEP:],
+    })
+    return delta
+
+
+def replay(base):
+    """Apply every retained delta after ``base`` and return (snapshot, applied)."""
+    current = snapshot_hash(base)
+    applied = 0
+    for entry in load_index()["deltas"]:
+        if entry["base"] != current:
+            if applied:
+                raise RuntimeError(f"delta {entry['seq']} does not follow delta {entry['seq'] - 1}")
+            continue  # Before our base; skip ahead
+        with open(delta_path(entry["seq"]), encoding="utf-8") as f:
+            base = apply_delta(base, json.load(f))
+        current = snapshot_hash(base)
+        if current != entry["result"]:
+            raise RuntimeError(f"delta {entry['seq']} produced {current[:12]}, expected {entry['result'][:12]}")
+        applied += 1
+    return base, applied
+
+
+def verify(base_path, snapshot_path=SQUADS_PATH):
+    """Check that the base snapshot plus the delta chain equals the current snapshot."""
+    with open(base_path, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(snapshot_path, encoding="utf-8") as f:
+        expected = f.read()
+    try:
+        result, applied = replay(base)
+    except (RuntimeError, KeyError, OSError) as e:
+        print(f"✗ {e}")
+        return False
+    if serialize(result) != expected:
+        print(f"✗ {base_path} + {applied} deltas differs from {snapshot_path}")
+        return False
+    print(f"✓ {base_path} + {applied} deltas == {snapshot_path}")
+    return True
+
+
+# ── Main ────────────────────────────────────────────────────────────────────
+
+def main():
+    args = sys.argv[1:]
+    if len(args) >= 2 and args[0] == "verify":
+        sys.exit(0 if verify(args[1]) else 1)
+    if len(args) >= 3 and args[0] == "diff":
+        with open(args[1], encoding="utf-8") as f:
+            old = json.load(f)
+        with open(args[2], encoding="utf-8") as f:
+            new = json.load(f)
+        print(json.dumps(diff_squads(old, new), indent=2, ensure_ascii=False))
+        return
+    sys.exit(__doc__.split("Usage:")[1].rstrip())
+
+
+if __name__ == "__main__":
+    main()
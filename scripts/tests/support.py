@@ -0,0 +1,101 @@
+"""
+Shared fixtures for the scripts/ tests: the scraper module, the frozen
+bench corpus (scripts/bench-corpus.tar.gz) and throwaway output paths.
+
+The tests need no network: pages are seeded straight into a temporary page
+cache, fresh enough that the scraper never revalidates them.
+"""
+
+import importlib.util
+import io
+import os
+import sys
+import tarfile
+import tempfile
+from unittest import mock
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPT_DIR = os.path.dirname(TESTS_DIR)
+CORPUS_PATH = os.path.join(SCRIPT_DIR, "bench-corpus.tar.gz")
+
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)  # squad_codec, squad_delta, wcdata, player_index
+
+
+def load_scraper():
+    """scripts/scrape-squads.py as a module, loaded once per process.
+
+    Worker processes pickle functions by module name, so every test must
+    share the same module object.
+    """
+    if "scrape_squads" in sys.modules:
+        return sys.modules["scrape_squads"]
+    spec = importlib.util.spec_from_file_location("scrape_squads", os.path.join(SCRIPT_DIR, "scrape-squads.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["scrape_squads"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_corpus():
+    """{team_id: html} for every page in the bench corpus, in WIKI_PAGES order."""
+    scraper = load_scraper()
+    files = {}
+    with tarfile.open(CORPUS_PATH, mode="r:gz") as tar:
+        for member in tar.getmembers():
+            if member.isfile() and member.name.endswith(".html"):
+                files[member.name] = tar.extractfile(member).read().decode("utf-8")
+    pages = {}
+    for team_id, wiki_page in scraper.WIKI_PAGES.items():
+        name = os.path.basename(scraper.legacy_cache_paths(wiki_page)[0])
+        if name in files:
+            pages[team_id] = files[name]
+    return pages
+
+
+class ScraperSandbox:
+    """Point every path the scraper writes at a temporary directory.
+
+    Use as a context manager; ``seed(pages)`` fills the page cache with
+    {team_id: html} so runs are served from it without any network.
+    """
+
+    def __init__(self):
+        self.scraper = load_scraper()
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.tmp.name
+        self.cache_dir = os.path.join(root, "cache")
+        self.squads_path = os.path.join(root, "squads.json")
+        self.shards_dir = os.path.join(root, "squads")
+        self.patch = mock.patch.multiple(
+            self.scraper,
+            CACHE_DIR=self.cache_dir,
+            SQUADS_PATH=self.squads_path,
+            SHARDS_DIR=self.shards_dir,
+            MANIFEST_PATH=os.path.join(self.shards_dir, "manifest.json"),
+            COMPACT_PATH=os.path.join(root, "squads.compact.json"),
+            INDEX_PATH=os.path.join(root, "player-index.json"),
+        )
+
+    def __enter__(self):
+        self.patch.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.patch.stop()
+        self.tmp.cleanup()
+
+    def seed(self, pages):
+        for team_id, html in pages.items():
+            self.scraper.write_cached_text(self.scraper.cache_paths(self.scraper.WIKI_PAGES[team_id])[0], html)
+
+    def run(self, *args):
+        """scrape-squads.py ``args`` against this sandbox; returns its stdout."""
+        out = io.StringIO()
+        with mock.patch("sys.stdout", out):
+            self.scraper.run(["--cache-dir", self.cache_dir, *args])
+        return out.getvalue()
+
+    def read(self, path=None):
+        with open(path or self.squads_path, "rb") as f:
+            return f.read()
@@ -0,0 +1,37 @@
+"""cache prune --max-mb must reject sizes it cannot use before touching the cache."""
+
+import io
+import unittest
+from unittest import mock
+
+from support import ScraperSandbox, load_corpus
+
+
+def prune(sandbox, max_mb):
+    out = io.StringIO()
+    with mock.patch("sys.stdout", out):
+        sandbox.scraper.run(["cache", "prune", "--cache-dir", sandbox.cache_dir, "--max-mb", max_mb])
+    return out.getvalue()
+
+
+class CachePruneTest(unittest.TestCase):
+    def test_bad_sizes_exit_with_a_message(self):
+        with ScraperSandbox() as sandbox, mock.patch.object(sandbox.scraper, "cache_prune") as cache_prune:
+            for value in ("abc", "", "0", "-1", "nan", "inf"):
+                with self.subTest(value=value), self.assertRaises(SystemExit) as raised:
+                    prune(sandbox, value)
+                self.assertIn("--max-mb", str(raised.exception.code))
+            cache_prune.assert_not_called()
+
+    def test_prunes_to_the_limit(self):
+        with ScraperSandbox() as sandbox:
+            sandbox.seed(load_corpus())
+            out = prune(sandbox, "0.1")
+            entries = sandbox.scraper.cache_entries()
+        self.assertNotIn("evicted 0 entries", out)
+        self.assertTrue(entries)
+        self.assertLessEqual(sum(e["bytes"] for e in entries), 100_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
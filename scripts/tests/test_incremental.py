@@ -0,0 +1,97 @@
+"""--incremental must run offline against imported recordings and match a full-page run."""
+
+import importlib.util
+import io
+import os
+import tempfile
+import threading
+import unittest
+from http.server import ThreadingHTTPServer
+from unittest import mock
+
+from support import SCRIPT_DIR, ScraperSandbox, load_corpus, load_scraper
+
+scraper = load_scraper()
+
+spec = importlib.util.spec_from_file_location("replay_server", os.path.join(SCRIPT_DIR, "replay-server.py"))
+replay = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(replay)
+
+FALLBACK_TEAM = "eng"
+
+
+def without_heading_ids(html):
+    """Older markup: anchors on a headline span, so prop=sections finds no squad anchor."""
+    for anchor in ("Current_squad", "Recent_call-ups"):
+        title = anchor.replace("_", " ")
+        html = html.replace(f'<h3 id="{anchor}">{title}</h3>',
+                            f'<h3><span class="mw-headline" id="{anchor}">{title}</span></h3>')
+    return html
+
+
+class IncrementalReplayTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        corpus = load_corpus()
+        cls.pages = dict(corpus, **{FALLBACK_TEAM: without_heading_ids(corpus[FALLBACK_TEAM])})
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.store = replay.RecordingStore(cls.tmp.name)
+        with ScraperSandbox() as sandbox, mock.patch("sys.stdout", io.StringIO()):
+            sandbox.seed(cls.pages)
+            replay.import_cache(cls.store, cache_dir=sandbox.cache_dir)
+
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), replay.make_handler(cls.store, replay.Faults()))
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.tmp.cleanup()
+
+    def setUp(self):
+        base = f"http://127.0.0.1:{self.server.server_address[1]}"
+        patcher = mock.patch.multiple(scraper, WIKI_BASE=base, WIKI_API=f"{base}/w/api.php",
+                                      REQUEST_RATE=1000.0, _host_buckets={})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_scraper(self, sandbox, *args):
+        stats = scraper.FetchStats()
+        with mock.patch.object(scraper, "fetch_stats", stats):
+            sandbox.run("--output", "json", *args)
+        return stats
+
+    def test_matches_full_page_run_and_reuses_sections(self):
+        with ScraperSandbox() as sandbox:
+            sandbox.seed(self.pages)
+            sandbox.run("--output", "json")
+            expected = sandbox.read()
+
+        with ScraperSandbox() as sandbox:
+            first = self.run_scraper(sandbox, "--incremental")
+            self.assertEqual(sandbox.read(), expected)
+            self.assertEqual(first.retries, 0)
+            for team_id in self.pages:
+                with self.subTest(team=team_id):
+                    meta = scraper.load_cache_meta(scraper.section_cache_paths(scraper.WIKI_PAGES[team_id])[1])
+                    self.assertEqual(len(meta.get("sections", ())), 0 if team_id == FALLBACK_TEAM else 2)
+                    self.assertIn("revid", meta)
+
+            second = self.run_scraper(sandbox, "--incremental")
+            self.assertEqual(sandbox.read(), expected)
+            self.assertEqual(second.api_calls, 1)  # One batched revision lookup, nothing else
+            self.assertEqual((second.cached, second.downloaded), (len(self.pages), 0))
+
+    def test_single_team(self):
+        with ScraperSandbox() as sandbox:
+            stats = self.run_scraper(sandbox, "--incremental", "--team", "fra")
+            self.assertEqual(stats.pages[scraper.WIKI_PAGES["fra"]]["outcome"], "downloaded")
+            meta = scraper.load_cache_meta(scraper.section_cache_paths(scraper.WIKI_PAGES["fra"])[1])
+            self.assertEqual(len(meta.get("sections", ())), 2)
+            self.assertFalse(os.path.exists(scraper.cache_paths(scraper.WIKI_PAGES["fra"])[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
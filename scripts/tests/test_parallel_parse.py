@@ -0,0 +1,46 @@
+"""--jobs N must write exactly the squads.json a serial run writes."""
+
+import io
+import unittest
+from unittest import mock
+
+from support import ScraperSandbox, load_corpus, load_scraper
+
+JOBS = 4
+
+
+class ParallelParseTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pages = load_corpus()
+
+    def scrape(self, *args):
+        with ScraperSandbox() as sandbox:
+            sandbox.seed(self.pages)
+            sandbox.run("--output", "json", *args)
+            return sandbox.read()
+
+    def test_corpus_covers_every_team(self):
+        self.assertEqual(set(self.pages), set(load_scraper().WIKI_PAGES))
+
+    def test_jobs_output_is_byte_identical(self):
+        serial = self.scrape("--jobs", "1")
+        parallel = self.scrape("--jobs", str(JOBS))
+        self.assertGreater(serial.count(b'"name"'), 1000)
+        self.assertEqual(serial, parallel)
+
+    def test_verify_parallel_passes_on_corpus(self):
+        scraper = load_scraper()
+        with ScraperSandbox() as sandbox, mock.patch("sys.stdout", io.StringIO()):
+            sandbox.seed(self.pages)
+            self.assertTrue(scraper.verify_parallel(list(scraper.WIKI_PAGES), scraper.load_exclusions(), JOBS))
+
+    def test_verify_parallel_fails_without_pages(self):
+        scraper = load_scraper()
+        with ScraperSandbox(), mock.patch("sys.stdout", io.StringIO()) as out:
+            self.assertFalse(scraper.verify_parallel(list(scraper.WIKI_PAGES), {}, JOBS))
+        self.assertIn("No cached pages", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
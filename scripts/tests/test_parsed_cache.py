@@ -0,0 +1,50 @@
+"""The parsed-table cache must survive a change of date and stay exact."""
+
+import datetime
+import os
+import shutil
+import unittest
+from unittest import mock
+
+from support import ScraperSandbox, load_corpus
+
+
+class LaterDate(datetime.date):
+    """date whose today() is a year and a half ahead, past STALE_MONTHS for recent call-ups."""
+
+    @classmethod
+    def today(cls):
+        real = datetime.date.today()
+        return cls(real.year + 1, 12 if real.month > 6 else 6, 1)
+
+
+class ParsedCacheTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pages = load_corpus()
+
+    def test_cache_hits_on_a_later_day(self):
+        with ScraperSandbox() as sandbox:
+            sandbox.seed(self.pages)
+            sandbox.run("--output", "json")
+            today = sandbox.read()
+
+            with mock.patch.object(sandbox.scraper, "date", LaterDate):
+                out = sandbox.run("--output", "json")
+                cached = sandbox.read()
+                self.assertIn(f"Parsed cache: {len(self.pages)} of {len(self.pages)} teams reused", out)
+
+                # Same starting squads.json, nothing cached
+                shutil.rmtree(os.path.join(sandbox.cache_dir, "parsed"))
+                with open(sandbox.squads_path, "wb") as f:
+                    f.write(today)
+                out = sandbox.run("--output", "json")
+                self.assertIn(f"Parsed cache: 0 of {len(self.pages)} teams reused", out)
+                fresh = sandbox.read()
+
+        self.assertEqual(cached, fresh)
+        self.assertNotEqual(cached, today)  # Stale call-ups moved to the "potential" tier
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+"""update_index() must equal a full build, whatever index it starts from."""
+
+import copy
+import unittest
+
+import support  # noqa: F401  (puts scripts/ on sys.path)
+import player_index
+
+
+def squads():
+    return {
+        "eng": {"players": [
+            {"name": "Harry Kane", "club": "Bayern Munich", "position": "FW"},
+            {"name": "Jude Bellingham", "club": "Real Madrid", "position": "MF"},
+        ]},
+        "fra": {"players": [
+            {"name": "Kylian Mbappé (captain)", "club": "Real Madrid", "position": "FW"},
+        ]},
+        "nor": {"players": [
+            {"name": "Martin Ødegaard", "club": "Arsenal", "position": "MF"},
+        ]},
+    }
+
+
+class UpdateIndexTest(unittest.TestCase):
+    def test_unchanged_index_is_reused(self):
+        index = player_index.build_index(squads())
+        self.assertEqual(player_index.update_index(index, squads()), index)
+
+    def test_stale_teams_are_rederived(self):
+        older = squads()
+        older["eng"]["players"][1]["club"] = "Borussia Dortmund"
+        del older["nor"]
+        index = player_index.update_index(player_index.build_index(older), squads())
+        self.assertEqual(index, player_index.build_index(squads()))
+        self.assertEqual([p["club"] for p in player_index.Searcher(index).search("bellingham")], ["Real Madrid"])
+
+    def test_mismatched_hash_is_rederived(self):
+        # Rows whose hash does not match squads.json are not carried over
+        index = player_index.build_index(squads())
+        stale = copy.deepcopy(index)
+        stale["teamHashes"][0] = "0" * 16
+        stale["keys"][0] = "someone else"
+        self.assertEqual(player_index.update_index(stale, squads()), index)
+
+    def test_old_format_is_rebuilt(self):
+        index = dict(player_index.build_index(squads()), version=1)
+        del index["teamHashes"]
+        self.assertEqual(player_index.update_index(index, squads()), player_index.build_index(squads()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+"""Shard output must survive a lost manifest and stay in step with squads.json."""
+
+import json
+import os
+import unittest
+
+from support import ScraperSandbox, load_corpus
+
+
+class ShardsTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pages = load_corpus()
+
+    def setUp(self):
+        self.sandbox = ScraperSandbox().__enter__()
+        self.addCleanup(self.sandbox.__exit__, None, None, None)
+        self.scraper = self.sandbox.scraper
+        self.sandbox.seed(self.pages)
+        self.sandbox.run("--output", "both")
+
+    def shard_ids(self):
+        return sorted(n[:-5] for n in os.listdir(self.sandbox.shards_dir) if n != "manifest.json")
+
+    def test_lost_manifest_keeps_other_shards(self):
+        before = self.shard_ids()
+        os.remove(self.scraper.MANIFEST_PATH)
+        self.assertEqual(sorted(self.scraper.load_shards()), before)
+
+        self.sandbox.run("--output", "shards", "--team", "eng")
+        self.assertEqual(self.shard_ids(), before)
+        self.assertEqual(sorted(self.scraper.load_manifest()["teams"]), before)
+
+    def test_only_listed_shards_are_removed(self):
+        stray = os.path.join(self.sandbox.shards_dir, "notes.json")
+        with open(stray, "w") as f:
+            f.write("{}")
+        squads = self.scraper.load_shards()
+        del squads["eng"]
+        self.scraper.write_shards(squads)
+        self.assertFalse(os.path.exists(self.scraper.shard_path("eng")))
+        self.assertTrue(os.path.exists(stray))
+
+    def test_both_mode_prefers_shards(self):
+        squads = json.loads(self.sandbox.read())
+        edited = dict(squads["eng"], manager="Someone Else")
+        self.scraper.write_shards({**squads, "eng": edited})
+
+        loaded = self.scraper.load_squads("both")
+        self.assertEqual(list(loaded), list(squads))
+        self.assertEqual(loaded["eng"], edited)
+        self.assertEqual(self.scraper.load_squads("json")["eng"], squads["eng"])
+
+
+if __name__ == "__main__":
+    unittest.main()
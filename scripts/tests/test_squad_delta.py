@@ -0,0 +1,65 @@
+"""The delta chain must always replay to squads.json, even after gaps."""
+
+import copy
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import support  # noqa: F401  (puts scripts/ on sys.path)
+import squad_delta
+
+
+def snapshot(caps):
+    return {
+        "eng": {"lastUpdated": "2026-06-01", "status": "final", "players": [
+            {"name": "Harry Kane", "dob": "1993-07-28", "caps": caps},
+            {"name": "Jude Bellingham", "dob": "2003-06-29", "caps": 40},
+        ]},
+        "fra": {"lastUpdated": "2026-06-01", "status": "final", "players": [
+            {"name": "Kylian Mbappé", "dob": "1998-12-20", "caps": 90},
+        ]},
+    }
+
+
+class DeltaChainTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        patcher = mock.patch.object(squad_delta, "DELTAS_DIR", self.tmp.name)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def write(self, old, new):
+        with mock.patch("sys.stdout", io.StringIO()):
+            return squad_delta.write_delta(copy.deepcopy(old), copy.deepcopy(new), "2026-06-02")
+
+    def index(self):
+        with open(os.path.join(self.tmp.name, "index.json"), encoding="utf-8") as f:
+            return json.load(f)
+
+    def test_chain_replays(self):
+        self.write(snapshot(100), snapshot(101))
+        self.write(snapshot(101), snapshot(102))
+        result, applied = squad_delta.replay(snapshot(100))
+        self.assertEqual((result, applied), (snapshot(102), 2))
+        self.assertEqual(self.index()["epoch"], 0)
+
+    def test_gap_starts_a_new_epoch(self):
+        self.write(snapshot(100), snapshot(101))
+        # squads.json went 101 -> 102 without a delta; the next run starts from 102
+        delta = self.write(snapshot(102), snapshot(103))
+        index = self.index()
+        self.assertEqual((delta["epoch"], index["epoch"]), (1, 1))
+        self.assertEqual([d["seq"] for d in index["deltas"]], [2])
+        self.assertFalse(os.path.exists(squad_delta.delta_path(1)))
+        self.assertEqual(index["deltas"][0]["base"], squad_delta.snapshot_hash(snapshot(102)))
+        self.assertEqual(squad_delta.replay(snapshot(102)), (snapshot(103), 1))
+        # A client still on the old chain finds no delta for its copy and refetches
+        self.assertEqual(squad_delta.replay(snapshot(101)), (snapshot(101), 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""SquadTableScanner must find exactly the tables find_squad_tables() finds."""
+
+import io
+import random
+import unittest
+from unittest import mock
+
+from support import ScraperSandbox, load_corpus, load_scraper
+
+scraper = load_scraper()
+
+CHUNK_SIZES = (61, 4096, scraper.CACHE_READ_CHUNK)  # Tiny chunks are covered by the fuzz cases
+FUZZ_CASES = 5000
+
+# Building blocks for synthetic pages: anchors (including repeats and the
+# fallback ids), tables, stray markup that looks like either, and prose.
+PIECES = [
+    *(f'<h2 id="{i}">Squad</h2>' for i in scraper.CURRENT_SECTION_IDS + scraper.RECENT_SECTION_IDS),
+    '<table class="wikitable"><tr><th>Player</th></tr><tr><td>A</td></tr></table>',
+    "<table><tr><td>B</td></tr></table>",
+    "<table>",
+    "</table>",
+    "<tabl",
+    'id="Current_squa',
+    'id="Recent_call-ups',
+    "<p>Prose &amp; <b>markup</b>.</p>",
+    "\n",
+]
+
+
+def chunked(text, sizes):
+    pos = 0
+    for size in sizes:
+        if pos >= len(text):
+            return
+        yield text[pos : pos + size]
+        pos += size
+    if pos < len(text):
+        yield text[pos:]
+
+
+def scan(chunks):
+    scanner = scraper.SquadTableScanner()
+    for chunk in chunks:
+        scanner.feed(chunk)
+        if scanner.done:
+            break
+    return scanner.result()
+
+
+class StreamingScannerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pages = load_corpus()
+
+    def test_corpus_pages(self):
+        for team_id, html in self.pages.items():
+            expected = scraper.find_squad_tables(html)
+            for size in CHUNK_SIZES:
+                with self.subTest(team=team_id, chunk=size):
+                    self.assertEqual(scan(html[i : i + size] for i in range(0, len(html), size)), expected)
+
+    def test_fragment_parses_like_the_page(self):
+        for team_id, html in self.pages.items():
+            with self.subTest(team=team_id):
+                fragment = scraper.scan_text_chunks([html])
+                self.assertEqual(scraper.parse_team_page(team_id, fragment), scraper.parse_team_page(team_id, html))
+
+    def test_fuzz(self):
+        rng = random.Random(2026)
+        for case in range(FUZZ_CASES):
+            page = "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 24)))
+            sizes = [rng.randint(1, 40) for _ in range(len(page))]
+            with self.subTest(case=case, page=page, sizes=sizes[:20]):
+                self.assertEqual(scan(chunked(page, sizes)), scraper.find_squad_tables(page))
+
+    def test_stream_run_matches_full_page_run(self):
+        outputs = []
+        for args in ((), ("--stream",)):
+            with ScraperSandbox() as sandbox:
+                sandbox.seed(self.pages)
+                sandbox.run("--output", "json", *args)
+                outputs.append(sandbox.read())
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_verify_streaming_fails_without_pages(self):
+        with ScraperSandbox(), mock.patch("sys.stdout", io.StringIO()) as out:
+            self.assertFalse(scraper.verify_streaming(list(scraper.WIKI_PAGES), {}))
+        self.assertIn("No cached pages", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
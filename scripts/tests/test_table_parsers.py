@@ -0,0 +1,90 @@
+"""The "fast" table tokenizer must give exactly what WikiTableParser gives."""
+
+import io
+import unittest
+from unittest import mock
+
+from support import ScraperSandbox, load_corpus, load_scraper
+
+scraper = load_scraper()
+
+HEADER = ("<tr><th>No.</th><th>Pos.</th><th>Player</th><th>Date of birth (age)</th>"
+          "<th>Caps</th><th>Goals</th><th>Club</th></tr>")
+
+# (description, row markup, expected (name, dob, caps, goals, club))
+EDGE_CASES = [
+    ("sup footnotes",
+     '<tr><td>10</td><td><a title="Position">FW</a></td>'
+     '<th><a href="/wiki/KM">Kylian Mbappé</a><sup id="cite_ref-1" class="reference">'
+     '<a href="#cite_note-1">&#91;1&#93;</a></sup> (<a href="/wiki/Captain">captain</a>)</th>'
+     '<td>(<span class="bday">1998-12-20</span>)</td><td>90<sup>[a]</sup></td><td>48</td>'
+     '<td><a href="/wiki/RM">Real Madrid</a><sup><sup>nested</sup> note</sup></td></tr>',
+     ("Kylian Mbappé (captain)", "1998-12-20", 90, 48, "Real Madrid")),
+    ("hidden display:none spans",
+     '<tr><td>7</td><td>FW</td>'
+     '<th><span style="display:none"><b>Dembele, Ousmane</b></span>Ousmane Dembélé</th>'
+     '<td><span style="display:none"> (<span class="bday">1997-05-15</span>)</span>15 May 1997'
+     '<span class="noprint ForceAgeToShow"> (age&nbsp;29)</span></td>'
+     '<td><span style="display: none">0099</span>57</td><td>6</td><td>Paris Saint-Germain</td></tr>',
+     ("Ousmane Dembélé", "1997-05-15", 57, 6, "Paris Saint-Germain")),
+    ("nested tags",
+     '<tr><td>8</td><td><a title="Position"><abbr title="Midfielder">MF</abbr></a></td>'
+     '<th scope="row"><span data-sort-value="Ødegaard, Martin"><a href="/wiki/MO"><b><i>Martin</i> '
+     'Ødegaard</b></a></span></th><td>(<span class="bday">1998-12-17</span>)</td><td>70</td><td>4</td>'
+     '<td><span class="flagicon"><span class="mw-image-border"><a href="/wiki/England">'
+     '<img alt="" src="//upload.example/flag.png" width="23" height="15" /></a></span></span>'
+     '&nbsp;<a href="/wiki/Arsenal"><b>Arsenal</b></a></td></tr>',
+     ("Martin Ødegaard", "1998-12-17", 70, 4, "Arsenal")),
+    ("entities",
+     '<tr><td>13</td><td>MF</td><th>N&#39;Golo Kant&eacute; &amp; Co&#x2E;</th>'
+     '<td>(<span class="bday">1991&#45;03&#45;29</span>)</td><td>1&#44;053</td><td>&#50;</td>'
+     '<td>Brighton &amp; Hove Albion&nbsp;</td></tr>',
+     ("N'Golo Kanté & Co.", "1991-03-29", 1053, 2, "Brighton & Hove Albion")),
+]
+
+
+def fixture_table(rows):
+    return f'<table class="wikitable">{HEADER}{"".join(rows)}</table>'
+
+
+class TableParsersTest(unittest.TestCase):
+    def assert_parsers_agree(self, table):
+        self.assertEqual(scraper.html_table_rows(table), scraper.fast_table_rows(table))
+        html = scraper.parse_squad_table(table, parser="html")
+        self.assertEqual(html, scraper.parse_squad_table(table, parser="fast"))
+        return html
+
+    def test_edge_cases(self):
+        for description, row, expected in EDGE_CASES:
+            with self.subTest(description):
+                players = self.assert_parsers_agree(fixture_table([row]))
+                self.assertEqual(len(players), 1)
+                p = players[0]
+                self.assertEqual((p["name"], p["dob"], p["caps"], p["goals"], p["club"]), expected)
+
+    def test_edge_cases_together(self):
+        players = self.assert_parsers_agree(fixture_table([row for _, row, _ in EDGE_CASES]))
+        self.assertEqual([p["name"] for p in players], [expected[0] for _, _, expected in EDGE_CASES])
+
+    def test_corpus_tables(self):
+        pages = load_corpus()
+        self.assertTrue(pages, "bench corpus is empty")
+        tables = players = 0
+        for team_id, html in pages.items():
+            for label, table in zip(("current", "recent"), scraper.find_squad_tables(html)):
+                if not table:
+                    continue
+                tables += 1
+                with self.subTest(team=team_id, table=label):
+                    players += len(self.assert_parsers_agree(table))
+        self.assertGreaterEqual(tables, len(pages))
+        self.assertGreater(players, 1000)
+
+    def test_compare_parsers_fails_without_pages(self):
+        with ScraperSandbox(), mock.patch("sys.stdout", io.StringIO()) as out:
+            self.assertFalse(scraper.compare_parsers(list(scraper.WIKI_PAGES), rounds=1))
+        self.assertIn("No cached squad tables", out.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+"""Dataset.squads must read the shards the app ships, like load_shards()."""
+
+import json
+import os
+import tempfile
+import unittest
+
+import support  # noqa: F401  (puts scripts/ on sys.path)
+import wcdata
+
+
+def entry(*names):
+    return {"lastUpdated": "2026-06-01", "status": "final",
+            "players": [{"name": n, "position": "FW", "club": "Arsenal"} for n in names]}
+
+
+class DatasetSquadsTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.write("squads.json", {"eng": entry("Stale Player"), "fra": entry("Kylian Mbappé")})
+
+    def write(self, name, payload):
+        path = os.path.join(self.tmp.name, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+
+    def names(self):
+        return {t: [p.name for p in s.players] for t, s in wcdata.Dataset(self.tmp.name).squads.items()}
+
+    def test_squads_json_without_shards(self):
+        self.assertEqual(self.names(), {"eng": ["Stale Player"], "fra": ["Kylian Mbappé"]})
+
+    def test_shards_win(self):
+        self.write("squads/eng.json", entry("Harry Kane"))
+        self.write("squads/manifest.json", {"teams": {"eng": "0"}})
+        self.assertEqual(self.names(), {"eng": ["Harry Kane"]})
+
+    def test_lost_manifest(self):
+        self.write("squads/eng.json", entry("Harry Kane"))
+        self.write("squads/bra.json", entry("Vinícius Júnior"))
+        self.assertEqual(self.names(), {"bra": ["Vinícius Júnior"], "eng": ["Harry Kane"]})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Indexed, read-only access to the site data in src/data/*.json.
+
+Each JSON file is read at most once, on first use, into compact __slots__
+records. Lookups the site does with fixtures.filter(...) scans are
+precomputed into dict indexes so every query below is a single dict lookup:
+
+  data = wcdata.load()
+  data.team("eng")               data.venue("metlife")
+  data.match(73)                 data.group_teams("A")
+  data.team_fixtures("eng")      data.venue_fixtures("metlife")
+  data.group_fixtures("L")       data.round_fixtures("r32")
+  data.date_fixtures("2026-06-11")
+  data.squad("eng")              data.team_players("eng")
+  data.club_players("Arsenal")   data.position_players("GK")
+
+Index results are tuples in file order, and the records are shared
+between indexes rather than copied. Squads come from the per-team shards in
+src/data/squads/ (what the app bundles), read the way scrape-squads.py's
+load_shards() reads them; squads.json is only used when there are none.
+
+Usage:
+  python scripts/wcdata.py bench             # Indexed lookups vs linear scans
+  python scripts/wcdata.py bench --repeat 50
+"""
+
+import importlib.util
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+from functools import cached_property
+
+# ── Config ──────────────────────────────────────────────────────────────────
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.dirname(SCRIPT_DIR)
+DATA_DIR = os.path.join(PROJECT_DIR, "src", "data")
+
+
+# ── Records ─────────────────────────────────────────────────────────────────
+
+class Record:
+    """Base for the slotted record types. FIELDS maps attribute -> JSON key."""
+
+    __slots__ = ()
+    FIELDS = {}
+
+    @classmethod
+    def from_json(cls, obj, **extra):
+        record = cls.__new__(cls)
+        for attr, key in cls.FIELDS.items():
+            setattr(record, attr, obj.get(key))
+        for attr, value in extra.items():
+            setattr(record, attr, value)
+        return record
+
+    def to_json(self):
+        return {key: getattr(self, attr) for attr, key in self.FIELDS.items()}
+
+    def __repr__(self):
+        first = next(iter(self.FIELDS))
+        return f"{type(self).__name__}({getattr(self, first)!r})"
+
+
+class Team(Record):
+    __slots__ = ("id", "name", "short_name", "group", "confederation", "fifa_ranking", "flag_url", "qualified")
+    FIELDS = {
+        "id": "id", "name": "name", "short_name": "shortName", "group": "group",
+        "confederation": "confederation", "fifa_ranking": "fifaRanking",
+        "flag_url": "flagUrl", "qualified": "qualified",
+    }
+
+
+class Venue(Record):
+    __slots__ = ("id", "name", "city", "display_city", "country", "lat", "lng", "capacity",
+                 "timezone", "hosts_rounds")
+    FIELDS = {
+        "id": "id", "name": "name", "city": "city", "display_city": "displayCity",
+        "country": "country", "lat": "lat", "lng": "lng", "capacity": "capacity",
+        "timezone": "timezone", "hosts_rounds": "hostsRounds",
+    }
+
+
+class Fixture(Record):
+    __slots__ = ("match_number", "date", "time_utc", "venue", "home_team", "away_team", "group",
+                 "round", "matchday", "kickoff")
+    FIELDS = {
+        "match_number": "matchNumber", "date": "date", "time_utc": "timeUTC", "venue": "venue",
+        "home_team": "homeTeam", "away_team": "awayTeam", "group": "group",
+        "round": "round", "matchday": "matchday",
+    }
+
+    @classmethod
+    def from_json(cls, obj, **extra):
+        started = datetime.strptime(f"{obj['date']} {obj['timeUTC']}", "%Y-%m-%d %H:%M")
+        # Kickoff as a UTC Unix timestamp, computed once at load
+        return super().from_json(obj, kickoff=started.replace(tzinfo=timezone.utc).timestamp(), **extra)
+
+    @property
+    def sides(self):
+        return (self.home_team, self.away_team)
+
+
+class Player(Record):
+    __slots__ = ("name", "position", "age", "dob", "caps", "goals", "club", "number", "tier", "team_id")
+    FIELDS = {
+        "name": "name", "position": "position", "age": "age", "dob": "dob", "caps": "caps",
+        "goals": "goals", "club": "club", "number": "number", "tier": "tier",
+    }
+
+    def to_json(self):
+        obj = super().to_json()
+        if obj["number"] is None:
+            del obj["number"]  # squads.json omits it rather than storing null
+        return obj
+
+
+class Squad(Record):
+    __slots__ = ("team_id", "last_updated", "status", "manager", "players")
+    FIELDS = {"last_updated": "lastUpdated", "status": "status", "manager": "manager"}
+
+    def __repr__(self):
+        return f"Squad({self.team_id!r}, {len(self.players)} players)"
+
+
+def index_by(records, key):
+    """Group ``records`` into {key(record): tuple} preserving order."""
+    groups = {}
+    for record in records:
+        for k in key(record):
+            groups.setdefault(k, []).append(record)
+    return {k: tuple(v) for k, v in groups.items()}
+
+
+# ── Dataset ─────────────────────────────────────────────────────────────────
+
+class Dataset:
+    """Lazily loaded, indexed view of one src/data directory."""
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+
+    def read(self, name):
+        with open(os.path.join(self.data_dir, name), encoding="utf-8") as f:
+            return json.load(f)
+
+    # Raw record lists, loaded on first use
+
+    @cached_property
+    def teams(self):
+        return tuple(Team.from_json(t) for t in self.read("teams.json"))
+
+    @cached_property
+    def venues(self):
+        return tuple(Venue.from_json(v) for v in self.read("venues.json"))
+
+    @cached_property
+    def fixtures(self):
+        return tuple(Fixture.from_json(f) for f in self.read("fixtures.json"))
+
+    @cached_property
+    def groups(self):
+        return {g: tuple(ids) for g, ids in self.read("groups.json").items()}
+
+    def read_squads(self):
+        """Raw {team_id: entry} from the shards, or from squads.json without any.
+
+        Mirrors load_shards() in scrape-squads.py: the manifest lists the
+        teams, and without a readable manifest every shard is loaded.
+        """
+        try:
+            team_ids = list(self.read(os.path.join("squads", "manifest.json"))["teams"])
+        except (OSError, ValueError, KeyError, TypeError):
+            try:
+                names = os.listdir(os.path.join(self.data_dir, "squads"))
+            except OSError:
+                names = []
+            team_ids = sorted(n[: -len(".json")] for n in names if n.endswith(".json") and n != "manifest.json")
+        raw = {}
+        for team_id in team_ids:
+            try:
+                raw[team_id] = self.read(os.path.join("squads", f"{team_id}.json"))
+            except (OSError, ValueError):
+                continue
+        return raw or self.read("squads.json")
+
+    @cached_property
+    def squads(self):
+        """{team_id: Squad}, see read_squads()."""
+        raw = self.read_squads()
+        return {
+            team_id: Squad.from_json(entry, team_id=team_id, players=tuple(
+                Player.from_json(p, team_id=team_id) for p in entry.get("players", [])
+            ))
+            for team_id, entry in raw.items()
+        }
+
+    @cached_property
+    def players(self):
+        return tuple(p for squad in self.squads.values() for p in squad.players)
+
+    # Indexes, each built on first use
+
+    @cached_property
+    def teams_by_id(self):
+        return {t.id: t for t in self.teams}
+
+    @cached_property
+    def venues_by_id(self):
+        return {v.id: v for v in self.venues}
+
+    @cached_property
+    def fixtures_by_number(self):
+        return {f.match_number: f for f in self.fixtures}
+
+    @cached_property
+    def fixtures_by_team(self):
+        # Knockout placeholders (1A, W73, ...) are indexed too
+        return index_by(self.fixtures, lambda f: {f.home_team, f.away_team})
+
+    @cached_property
+    def fixtures_by_venue(self):
+        return index_by(self.fixtures, lambda f: (f.venue,))
+
+    @cached_property
+    def fixtures_by_group(self):
+        return index_by(self.fixtures, lambda f: (f.group,) if f.group else ())
+
+    @cached_property
+    def fixtures_by_round(self):
+        return index_by(self.fixtures, lambda f: (f.round,))
+
+    @cached_property
+    def fixtures_by_date(self):
+        return index_by(self.fixtures, lambda f: (f.date,))
+
+    @cached_property
+    def players_by_club(self):
+        return index_by(self.players, lambda p: (p.club,) if p.club else ())
+
+    @cached_property
+    def players_by_position(self):
+        return index_by(self.players, lambda p: (p.position,))
+
+    # Lookups
+
+    def team(self, team_id):
+        return self.teams_by_id.get(team_id)
+
+    def venue(self, venue_id):
+        return self.venues_by_id.get(venue_id)
+
+    def match(self, match_number):
+        return self.fixtures_by_number.get(match_number)
+
+    def group_teams(self, group):
+        return tuple(self.teams_by_id[t] for t in self.groups.get(group, ()) if t in self.teams_by_id)
+
+    def team_fixtures(self, team_id):
+        return self.fixtures_by_team.get(team_id, ())
+
+    def venue_fixtures(self, venue_id):
+        return self.fixtures_by_venue.get(venue_id, ())
+
+    def group_fixtures(self, group):
+        return self.fixtures_by_group.get(group, ())
+
+    def round_fixtures(self, round_name):
+        return self.fixtures_by_round.get(round_name, ())
+
+    def date_fixtures(self, day):
+        return self.fixtures_by_date.get(day, ())
+
+    def squad(self, team_id):
+        return self.squads.get(team_id)
+
+    def team_players(self, team_id):
+        squad = self.squads.get(team_id)
+        return squad.players if squad else ()
+
+    def club_players(self, club):
+        return self.players_by_club.get(club, ())
+
+    def position_players(self, position):
+        return self.players_by_position.get(position, ())
+
+
+_loaded = {}
+
+
+def load(data_dir=DATA_DIR):
+    """Shared Dataset for ``data_dir``; nothing is read until first access."""
+    data_dir = os.path.abspath(data_dir)
+    if data_dir not in _loaded:
+        _loaded[data_dir] = Dataset(data_dir)
+    return _loaded[data_dir]
+
+
+# ── Benchmark ───────────────────────────────────────────────────────────────
+
+def best_of(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def load_scraper():
+    """Import scripts/scrape-squads.py for its shard loader."""
+    if "scrape_squads" in sys.modules:
+        return sys.modules["scrape_squads"]
+    spec = importlib.util.spec_from_file_location("scrape_squads", os.path.join(SCRIPT_DIR, "scrape-squads.py"))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules["scrape_squads"] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def bench(repeat=20):
+    """Time every index against the equivalent linear scan of the raw JSON.
+
+    Squads are scanned as the scraper's load_shards() returns them (the
+    data the app ships), and Dataset.squads must agree with it.
+    """
+    data = Dataset()
+    started = time.perf_counter()
+    for name in ("teams", "venues", "fixtures", "squads", "players", "teams_by_id", "venues_by_id",
+                 "fixtures_by_team", "fixtures_by_venue", "fixtures_by_group", "fixtures_by_round",
+                 "fixtures_by_date", "players_by_club", "players_by_position"):
+        getattr(data, name)
+    print(f"Load + index everything: {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    raw_teams = data.read("teams.json")
+    raw_venues = data.read("venues.json")
+    raw_fixtures = data.read("fixtures.json")
+    scraper = load_scraper()
+    raw_squads = scraper.load_shards()
+    source = f"{len(raw_squads)} shards in {os.path.relpath(scraper.SHARDS_DIR, PROJECT_DIR)}"
+    if not raw_squads:
+        raw_squads = data.read("squads.json")
+        source = f"{len(raw_squads)} teams in squads.json (no shards)"
+    if list(raw_squads) != list(data.squads):
+        print(f"✗ Dataset squads and load_shards() disagree on teams ({len(data.squads)} vs {source})")
+        return False
+    print(f"Squads: {source}")
+    raw_players = [p for s in raw_squads.values() for p in s["players"]]
+    team_ids = [t["id"] for t in raw_teams]
+    venue_ids = [v["id"] for v in raw_venues]
+    groups = sorted(data.groups)
+    rounds = sorted({f["round"] for f in raw_fixtures})
+    dates = sorted({f["date"] for f in raw_fixtures})
+    clubs = sorted({p["club"] for p in raw_players if p["club"]})
+    positions = sorted({p["position"] for p in raw_players})
+
+    cases = [
+        ("team by id", team_ids,
+         lambda k: next((t for t in raw_teams if t["id"] == k), None), data.team),
+        ("venue by id", venue_ids,
+         lambda k: next((v for v in raw_venues if v["id"] == k), None), data.venue),
+        ("fixtures by team", team_ids,
+         lambda k: [f for f in raw_fixtures if f["homeTeam"] == k or f["awayTeam"] == k], data.team_fixtures),
+        ("fixtures by venue", venue_ids,
+         lambda k: [f for f in raw_fixtures if f["venue"] == k], data.venue_fixtures),
+        ("fixtures by group", groups,
+         lambda k: [f for f in raw_fixtures if f["group"] == k], data.group_fixtures),
+        ("fixtures by round", rounds,
+         lambda k: [f for f in raw_fixtures if f["round"] == k], data.round_fixtures),
+        ("fixtures by date", dates,
+         lambda k: [f for f in raw_fixtures if f["date"] == k], data.date_fixtures),
+        ("players by club", clubs,
+         lambda k: [p for p in raw_players if p["club"] == k], data.club_players),
+        ("players by position", positions,
+         lambda k: [p for p in raw_players if p["position"] == k], data.position_players),
+    ]
+
+    print(f"\n{'query':22s} {'keys':>5s} {'scan µs':>9s} {'index µs':>9s} {'speedup':>8s}")
+    for label, keys, scan, lookup in cases:
+        for k in keys:
+            expected = scan(k)
+            got = lookup(k)
+            if not isinstance(expected, list):
+                expected, got = [expected], [got]
+            same = len(got) == len(expected) and all(
+                Record.to_json(r) == {key: e.get(key) for key in type(r).FIELDS.values()}
+                for r, e in zip(got, expected)
+            )
+            if not same:
+                print(f"✗ {label} {k!r}: index and scan disagree")
+                return False
+        scan_time = best_of(lambda: [scan(k) for k in keys], repeat) / len(keys)
+        index_time = best_of(lambda: [lookup(k) for k in keys], repeat) / len(keys)
+        print(f"  {label:20s} {len(keys):5d} {scan_time * 1e6:9.2f} {index_time * 1e6:9.3f} "
+              f"{scan_time / index_time:7.0f}x")
+    print("✓ Indexes match linear scans")
+    return True
+
+
+# ── Main ────────────────────────────────────────────────────────────────────
+
+def get_option(args, name, default=None):
+    """Return the value following ``name`` in ``args``, or ``default``."""
+    if name in args:
+        idx = args.index(name)
+        if idx + 1 < len(args):
+            return args[idx + 1]
+    return default
+
+
+def main():
+    args = sys.argv[1:]
+    if args[:1] == ["bench"]:
+        sys.exit(0 if bench(int(get_option(args, "--repeat", 20))) else 1)
+    sys.exit(__doc__.split("Usage:")[1].rstrip())
+
+
+if __name__ == "__main__":
+    main()
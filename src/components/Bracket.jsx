@@ -1,6 +1,7 @@
 import { useMemo } from 'react';
 import { Link } from 'react-router-dom';
 import { getAllFixtures, getVenueById, getTeamName, getTeamFlag, getTeamById } from '../utils/fixtures';
+import { getFeederMatches, getRoundMatchNumbers, getSemiFinalNumbers } from '../utils/knockout';
 import { formatMatchTime, formatMatchDate } from '../utils/timezone';
 import { useTimezone } from '../hooks/useTimezone';
 import { useMetaTags } from '../hooks/useMetaTags';
@@ -70,12 +71,8 @@ function BracketNode({ matchNumber, fixtureMap, timezone, isVenueLocal, side = '
   const fixture = fixtureMap.get(matchNumber);
   if (!fixture) return null;
 
-  // Find feeder matches (W73 → match 73)
-  const feeders = [];
-  for (const ref of [fixture.homeTeam, fixture.awayTeam]) {
-    const m = /^W(\d+)$/.exec(ref);
-    if (m) feeders.push(parseInt(m[1], 10));
-  }
+  // Feeder matches (W73 → match 73), precomputed in knockout.json
+  const feeders = getFeederMatches(matchNumber);
 
   const card = (
     <div style={{ width: '138px' }} className="shrink-0">
@@ -177,12 +174,6 @@ function BracketNode({ matchNumber, fixtureMap, timezone, isVenueLocal, side = '
   );
 }
 
-// ── Sort helper ─────────────────────────────────────────────────────────────
-
-function sortByMatch(arr) {
-  return [...arr].sort((a, b) => a.matchNumber - b.matchNumber);
-}
-
 // ── Main component ──────────────────────────────────────────────────────────
 
 export default function Bracket() {
@@ -197,32 +188,22 @@ export default function Bracket() {
     return map;
   }, [allFixtures]);
 
-  const knockoutFixtures = useMemo(() => allFixtures.filter(f => f.round !== 'group'), [allFixtures]);
-  const finalMatch = knockoutFixtures.find(f => f.round === 'final');
-  const thirdPlace = knockoutFixtures.find(f => f.round === '3rd');
-
-  // Get the two SF match numbers that feed into the final
-  const leftSfNum = useMemo(() => {
-    if (!finalMatch) return null;
-    const m = /^W(\d+)$/.exec(finalMatch.homeTeam);
-    return m ? parseInt(m[1], 10) : null;
-  }, [finalMatch]);
+  const roundFixtures = (round) => getRoundMatchNumbers(round).map(n => fixtureMap.get(n)).filter(Boolean);
+  const finalMatch = roundFixtures('final')[0];
+  const thirdPlace = roundFixtures('3rd')[0];
 
-  const rightSfNum = useMemo(() => {
-    if (!finalMatch) return null;
-    const m = /^W(\d+)$/.exec(finalMatch.awayTeam);
-    return m ? parseInt(m[1], 10) : null;
-  }, [finalMatch]);
+  // The two SF match numbers that feed into the final
+  const [leftSfNum, rightSfNum] = getSemiFinalNumbers();
 
   // Mobile: round-by-round
-  const rounds = useMemo(() => [
-    { key: 'r32', label: 'Round of 32', fixtures: sortByMatch(knockoutFixtures.filter(f => f.round === 'r32')) },
-    { key: 'r16', label: 'Round of 16', fixtures: sortByMatch(knockoutFixtures.filter(f => f.round === 'r16')) },
-    { key: 'qf', label: 'Quarter-finals', fixtures: sortByMatch(knockoutFixtures.filter(f => f.round === 'qf')) },
-    { key: 'sf', label: 'Semi-finals', fixtures: sortByMatch(knockoutFixtures.filter(f => f.round === 'sf')) },
-    { key: '3rd', label: 'Third Place', fixtures: knockoutFixtures.filter(f => f.round === '3rd') },
-    { key: 'final', label: 'Final', fixtures: knockoutFixtures.filter(f => f.round === 'final') },
-  ], [knockoutFixtures]);
+  const rounds = [
+    { key: 'r32', label: 'Round of 32', fixtures: roundFixtures('r32') },
+    { key: 'r16', label: 'Round of 16', fixtures: roundFixtures('r16') },
+    { key: 'qf', label: 'Quarter-finals', fixtures: roundFixtures('qf') },
+    { key: 'sf', label: 'Semi-finals', fixtures: roundFixtures('sf') },
+    { key: '3rd', label: 'Third Place', fixtures: roundFixtures('3rd') },
+    { key: 'final', label: 'Final', fixtures: roundFixtures('final') },
+  ];
 
   return (
     <div className="mx-auto px-2 py-4" style={{ maxWidth: '1800px' }}>
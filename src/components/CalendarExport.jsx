@@ -24,6 +24,12 @@ export default function CalendarExport({ fixtures, teamId }) {
     setOpen(false);
   };
 
+  const handleSubscribe = () => {
+    // Static feed built by scripts/build-calendars.py; updates as fixtures change
+    window.location.href = `webcal://${window.location.host}/calendars/team/${teamId}.ics`;
+    setOpen(false);
+  };
+
   const handleGoogle = () => {
     for (const fixture of fixtures) {
       window.open(generateGoogleCalendarUrl(fixture), '_blank', 'noopener');
@@ -72,6 +78,15 @@ export default function CalendarExport({ fixtures, teamId }) {
             <span className="text-base">📄</span>
             Apple / ICS File
           </button>
+          <button
+            onClick={handleSubscribe}
+            className="w-full text-left px-4 py-2.5 text-sm flex items-center gap-3
+                       text-slate-900 dark:text-white
+                       hover:bg-slate-200/60 dark:hover:bg-slate-700/60 transition-colors cursor-pointer"
+          >
+            <span className="text-base">🔄</span>
+            Subscribe (auto-updates)
+          </button>
           <button
             onClick={handleGoogle}
             className="w-full text-left px-4 py-2.5 text-sm flex items-center gap-3
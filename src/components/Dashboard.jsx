@@ -8,6 +8,7 @@ import FixtureMap from './FixtureMap';
 import GroupTable from './GroupTable';
 import CalendarExport from './CalendarExport';
 import KnockoutPath from './KnockoutPath';
+import { getTeamTravel } from '../utils/travel';
 
 export default function Dashboard({ isDark }) {
   const { teamId } = useParams();
@@ -29,6 +30,9 @@ export default function Dashboard({ isDark }) {
 
   const fixtures = getTeamFixtures(teamId);
   const groupFixtures = fixtures.filter(f => f.round === 'group');
+  const groupTravel = getTeamTravel(teamId)?.group || [];
+  const groupKm = groupTravel.length ? groupTravel[groupTravel.length - 1].cumKm : 0;
+  const maxShift = Math.max(0, ...groupTravel.map(leg => Math.abs(leg.tzShift)));
 
   return (
     <div className="max-w-6xl mx-auto px-4 py-6">
@@ -75,6 +79,12 @@ export default function Dashboard({ isDark }) {
         <div className="space-y-6 lg:sticky lg:top-4 lg:self-start">
           <div>
             <h2 className="text-lg font-semibold mb-3">Venues</h2>
+            {groupKm > 0 && (
+              <p className="text-sm text-slate-500 dark:text-slate-400 mb-2">
+                Group-stage travel: {groupKm.toLocaleString()} km
+                {maxShift > 0 && ` · up to ${maxShift}h time change`}
+              </p>
+            )}
             <FixtureMap
               fixtures={groupFixtures}
               teamId={teamId}
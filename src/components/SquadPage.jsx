@@ -2,7 +2,7 @@ import { useState } from 'react';
 import { useParams, Link, useOutletContext } from 'react-router-dom';
 import { getTeamById } from '../utils/fixtures';
 import { useMetaTags } from '../hooks/useMetaTags';
-import squads from '../data/squads.json';
+import { useSquad } from '../hooks/useSquad';
 
 const POSITION_ORDER = ['GK', 'DEF', 'MID', 'FWD'];
 const POSITION_LABELS = {
@@ -177,9 +177,10 @@ export default function SquadPage() {
   const { teamId } = useParams();
   const { isDark } = useOutletContext();
   const team = getTeamById(teamId);
+  const { squad, loading } = useSquad(teamId);
   useMetaTags(team ? {
     title: team.name + ' Squad',
-    description: `${team.name} World Cup 2026 squad list — players, positions, clubs, caps, and goals. Manager: ${squads[teamId]?.manager || 'TBA'}.`,
+    description: `${team.name} World Cup 2026 squad list — players, positions, clubs, caps, and goals. Manager: ${squad?.manager || 'TBA'}.`,
   } : { title: 'Squad Not Found' });
 
   if (!team) {
@@ -191,7 +192,6 @@ export default function SquadPage() {
     );
   }
 
-  const squad = squads[teamId];
   const players = squad?.players || [];
   const manager = squad?.manager || null;
   const status = squad?.status || null;
@@ -244,13 +244,13 @@ export default function SquadPage() {
               </span>
             )}
             {lastUpdated && <span>Updated: {lastUpdated}</span>}
-            <span>{players.length} player{players.length !== 1 ? 's' : ''} tracked</span>
+            {!loading && <span>{players.length} player{players.length !== 1 ? 's' : ''} tracked</span>}
           </div>
         </div>
       </div>
 
       {/* Squad content */}
-      {players.length === 0 ? (
+      {loading ? null : players.length === 0 ? (
         <div className="bg-slate-50 dark:bg-slate-800/50 border border-slate-200 dark:border-slate-700 rounded-xl p-8 text-center">
           <p className="text-lg font-medium text-slate-700 dark:text-slate-300 mb-2">
             Squad not yet announced
@@ -1,10 +1,12 @@
 import { useState } from 'react';
 import { useNavigate } from 'react-router-dom';
-import { getAllTeams } from '../utils/fixtures';
+import { getAllTeams, getTeamById } from '../utils/fixtures';
+import { loadPlayerSearch } from '../utils/playerSearch';
 import { useMetaTags } from '../hooks/useMetaTags';
 
 export default function TeamSelector() {
   const [search, setSearch] = useState('');
+  const [playerSearch, setPlayerSearch] = useState(null);
   const navigate = useNavigate();
   const teams = getAllTeams();
   useMetaTags({ title: 'Pick Your Team', description: 'Choose from all 48 teams in the 2026 World Cup. Get personalised fixtures, kick-off times in your timezone, squad info, and an interactive venue map.' });
@@ -17,6 +19,14 @@ export default function TeamSelector() {
       t.shortName.toLowerCase().includes(search.toLowerCase())
   );
 
+  // Player matches come from the prebuilt index, loaded on the first real query
+  const players = playerSearch && search.trim().length >= 3 ? playerSearch.search(search, 8) : [];
+
+  const handleSearch = (value) => {
+    setSearch(value);
+    if (!playerSearch && value.trim().length >= 3) loadPlayerSearch().then(setPlayerSearch);
+  };
+
   const handleSelect = (teamId) => {
     localStorage.setItem('wc2026-team', teamId);
     navigate(`/team/${teamId}`);
@@ -46,14 +56,33 @@ export default function TeamSelector() {
       <div className="max-w-md mx-auto mb-8">
         <input
           type="text"
-          placeholder="Search teams..."
+          placeholder="Search teams or players..."
           value={search}
-          onChange={(e) => setSearch(e.target.value)}
+          onChange={(e) => handleSearch(e.target.value)}
           className="w-full px-4 py-3 bg-white border border-slate-300 rounded-lg text-slate-900
                      dark:bg-slate-800 dark:border-slate-700 dark:text-white
                      placeholder-slate-500 focus:outline-none focus:ring-2 focus:ring-teal-500
                      focus:border-transparent"
         />
+        {players.length > 0 && (
+          <ul className="mt-2 bg-white border border-slate-200 rounded-lg divide-y divide-slate-200
+                         dark:bg-slate-800 dark:border-slate-700 dark:divide-slate-700">
+            {players.map((p) => (
+              <li key={`${p.teamId}-${p.name}`}>
+                <button
+                  onClick={() => navigate(`/team/${p.teamId}/squad`)}
+                  className="w-full flex items-center justify-between gap-3 px-4 py-2 text-left text-sm
+                             hover:bg-slate-100 dark:hover:bg-slate-700/50 transition-colors cursor-pointer"
+                >
+                  <span className="font-medium">{p.name}</span>
+                  <span className="text-xs text-slate-500 truncate">
+                    {[getTeamById(p.teamId)?.name || p.teamId, p.club].filter(Boolean).join(' · ')}
+                  </span>
+                </button>
+              </li>
+            ))}
+          </ul>
+        )}
       </div>
 
       <div className="grid grid-cols-2 sm:grid-cols-3 md:grid-cols-4 lg:grid-cols-6 gap-3">
@@ -91,7 +120,7 @@ export default function TeamSelector() {
         ))}
       </div>
 
-      {filtered.length === 0 && (
+      {filtered.length === 0 && players.length === 0 && (
         <p className="text-center text-slate-500 mt-8">No teams match your search.</p>
       )}
     </div>
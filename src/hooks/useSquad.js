@@ -0,0 +1,33 @@
+import { useEffect, useState } from 'react';
+
+// One lazy chunk per team; Vite content-hashes each file name, so a squad
+// refresh only invalidates the chunk for the team that changed.
+const SQUAD_LOADERS = import.meta.glob(['../data/squads/*.json', '!../data/squads/manifest.json'], {
+  import: 'default',
+});
+
+/**
+ * Load a single team's squad shard on demand.
+ *
+ * @param {string} teamId
+ * @returns {{ squad: Object|null, loading: boolean }}
+ */
+export function useSquad(teamId) {
+  const load = SQUAD_LOADERS[`../data/squads/${teamId}.json`];
+  const [loaded, setLoaded] = useState({ teamId: null, squad: null });
+
+  useEffect(() => {
+    if (!load) return;
+    let cancelled = false;
+    load().then(squad => {
+      if (!cancelled) setLoaded({ teamId, squad });
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [teamId, load]);
+
+  if (!load) return { squad: null, loading: false };
+  if (loaded.teamId !== teamId) return { squad: null, loading: true };
+  return { squad: loaded.squad, loading: false };
+}
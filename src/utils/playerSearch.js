@@ -0,0 +1,90 @@
+// Player search over src/data/player-index.json, built by scripts/player_index.py.
+// The index is loaded on first use so it stays out of the main bundle.
+let searcherPromise = null;
+
+// Letters NFKD leaves alone; mirrors FOLD_LETTERS in player_index.py
+const FOLD_LETTERS = {
+  ø: 'o', đ: 'd', ð: 'd', ł: 'l', ħ: 'h', ı: 'i', æ: 'ae', œ: 'oe', þ: 'th', ß: 'ss',
+};
+const MAX_RESULTS = 20;
+
+/** Accent-folded search key, matching name_key() in scripts/player_index.py. */
+export function nameKey(name) {
+  return name
+    .replace(/\([^)]*\)/g, ' ')
+    .toLowerCase()
+    .replace(/[øđðłħıæœþß]/g, c => FOLD_LETTERS[c])
+    .normalize('NFKD')
+    .replace(/\p{M}/gu, '')
+    .replace(/['’`ʼ.]/g, '')
+    .replace(/[^a-z0-9]+/g, ' ')
+    .trim();
+}
+
+function ungaps(encoded) {
+  let total = 0;
+  return encoded.map(step => (total += step));
+}
+
+function trigrams(key) {
+  const grams = new Set();
+  for (let i = 0; i + 3 <= key.length; i++) grams.add(key.slice(i, i + 3));
+  return [...grams];
+}
+
+function createSearcher(index) {
+  const postings = new Map(Object.entries(index.trigrams).map(([g, ids]) => [g, ungaps(ids)]));
+  const clubKeys = index.clubs.map(nameKey);
+  const clubPlayers = index.clubPlayers.map(ungaps);
+  const { keys } = index;
+
+  function player(id) {
+    const [name, team, club, position] = index.players[id];
+    return {
+      name,
+      teamId: index.teams[team],
+      club: club === null ? null : index.clubs[club],
+      position: position === null ? null : index.positions[position],
+    };
+  }
+
+  const isWordPrefix = (key, q) => key.startsWith(q) || key.includes(` ${q}`);
+
+  function search(query, limit = MAX_RESULTS) {
+    const q = nameKey(query);
+    if (!q) return [];
+    let hits;
+    if (q.length < 3) {
+      hits = keys.flatMap((key, id) => (isWordPrefix(key, q) ? [id] : []));
+    } else {
+      const lists = trigrams(q).map(g => postings.get(g) || []).sort((a, b) => a.length - b.length);
+      let candidates = lists[0];
+      for (const ids of lists.slice(1)) {
+        const set = new Set(ids);
+        candidates = candidates.filter(id => set.has(id));
+        if (candidates.length === 0) break;
+      }
+      hits = candidates.filter(id => keys[id].includes(q));
+    }
+    // Word-prefix matches first, then any substring match
+    const prefix = hits.filter(id => isWordPrefix(keys[id], q));
+    const rest = hits.filter(id => !isWordPrefix(keys[id], q));
+    return [...prefix, ...rest].slice(0, limit).map(player);
+  }
+
+  function clubSearch(query) {
+    const q = nameKey(query);
+    if (!q) return [];
+    return clubKeys.flatMap((key, c) => (key.includes(q) ? clubPlayers[c] : [])).map(player);
+  }
+
+  return { search, clubSearch };
+}
+
+/** Resolves to { search(query, limit), clubSearch(query) } once the index is loaded. */
+export function loadPlayerSearch() {
+  if (!searcherPromise) {
+    searcherPromise = import('../data/player-index.json').then(m => createSearcher(m.default));
+  }
+  return searcherPromise;
+}
@@ -0,0 +1,35 @@
+import travel from '../data/travel.json';
+
+// Distances and itineraries are precomputed by scripts/build-travel.py;
+// legs are stored as arrays (see travel.legFields) and expanded here.
+const venueIndex = new Map(travel.venues.map((id, i) => [id, i]));
+
+function toLeg(row) {
+  const [matchNumber, km, cumKm, tzShift, restDays] = row;
+  return { matchNumber, km, cumKm, tzShift, restDays };
+}
+
+/** Great-circle distance in km between two venues, or null if either is unknown. */
+export function getVenueDistance(fromId, toId) {
+  const a = venueIndex.get(fromId);
+  const b = venueIndex.get(toId);
+  if (a === undefined || b === undefined) return null;
+  return travel.distanceKm[a][b];
+}
+
+/**
+ * Get a team's travel itinerary.
+ * Returns { group, first, second, third } where group/first/second are
+ * lists of legs and third is [{ r32Match, legs }]; knockout legs carry on
+ * the group-stage totals.
+ */
+export function getTeamTravel(teamId) {
+  const entry = travel.teams[teamId];
+  if (!entry) return null;
+  return {
+    group: entry.group.map(toLeg),
+    first: entry.first ? entry.first.map(toLeg) : null,
+    second: entry.second ? entry.second.map(toLeg) : null,
+    third: (entry.third || []).map(s => ({ r32Match: s.r32Match, legs: s.legs.map(toLeg) })),
+  };
+}